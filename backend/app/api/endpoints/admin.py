@@ -0,0 +1,39 @@
+# backend/app/api/endpoints/admin.py
+from fastapi import APIRouter
+from app.db.repositories import mapping_repository, system_model_repository, job_repository, lookup_table_repository
+from app.services.lookup_service import lookup_index, load_lookup_tables
+import logging
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter()
+
+@router.get("/indexes")
+async def get_index_status():
+    """Report the state of the indexes backing repository lookups"""
+    return [
+        await system_model_repository.index_status(),
+        await mapping_repository.index_status(),
+        await job_repository.index_status(),
+        await lookup_table_repository.index_status(),
+        await lookup_table_repository.entries.index_status()
+    ]
+
+@router.post("/indexes")
+async def ensure_indexes():
+    """Create any missing repository indexes (admin only)"""
+    logger.info("Ensuring repository indexes")
+    for repository in (system_model_repository, mapping_repository, job_repository, lookup_table_repository):
+        await repository.ensure_indexes()
+    return await get_index_status()
+
+@router.get("/lookup-index")
+async def get_lookup_index():
+    """Report the lookup tables loaded into this process"""
+    return lookup_index.stats()
+
+@router.post("/lookup-index/reload")
+async def reload_lookup_index():
+    """Reload lookup tables whose stored revision changed (admin only)"""
+    loaded = await load_lookup_tables()
+    return {"loaded": loaded, "tables": lookup_index.stats()}
@@ -0,0 +1,57 @@
+# backend/app/api/endpoints/diagnostics.py
+from fastapi import APIRouter, HTTPException
+from app.db.repositories import mapping_repository, system_model_repository
+from app.services.transform_service import diagnostics
+from app.services.memo_service import transform_memo
+import logging
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter()
+
+@router.get("/transforms")
+async def get_transform_diagnostics():
+    """Get transformation outcome counters and sampled errors"""
+    return diagnostics.snapshot()
+
+@router.put("/transforms")
+async def update_transform_diagnostics(settings: dict):
+    """Enable or disable detailed transformation diagnostics"""
+    enabled = settings.get("enabled")
+    if not isinstance(enabled, bool):
+        raise HTTPException(status_code=400, detail="'enabled' must be a boolean")
+    logger.info(f"Setting transform diagnostics enabled={enabled}")
+    diagnostics.enabled = enabled
+    return diagnostics.snapshot()
+
+@router.delete("/transforms")
+async def reset_transform_diagnostics():
+    """Reset transformation counters and samples"""
+    diagnostics.reset()
+    return {"message": "Transform diagnostics reset"}
+
+@router.get("/cache")
+async def get_repository_cache_stats():
+    """Get hit/miss statistics for the repository caches"""
+    return {
+        "mapping_configs": mapping_repository.cache.stats(),
+        "system_models": system_model_repository.cache.stats()
+    }
+
+@router.delete("/cache")
+async def clear_repository_caches():
+    """Drop every cached mapping configuration and system model"""
+    mapping_repository.cache.clear()
+    system_model_repository.cache.clear()
+    return {"message": "Repository caches cleared"}
+
+@router.get("/memo")
+async def get_transform_memo_stats():
+    """Get hit rate and memory use of the transform memo"""
+    return transform_memo.stats()
+
+@router.delete("/memo")
+async def clear_transform_memo():
+    """Drop every memoized transform result"""
+    transform_memo.clear()
+    return {"message": "Transform memo cleared"}
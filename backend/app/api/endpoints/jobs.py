@@ -0,0 +1,113 @@
+# backend/app/api/endpoints/jobs.py
+from fastapi import APIRouter, HTTPException, UploadFile, File, Form, Query
+from fastapi.responses import StreamingResponse
+from typing import List, Optional
+import os
+from app.models.job import TransformJob, JobStatus, FINISHED_JOB_STATUSES
+from app.api.responses import FastJSONResponse
+from app.db.repositories import mapping_repository, system_model_repository
+from app.services.file_transform_service import OUTPUT_MEDIA_TYPES
+from app.services.record_readers import detect_input_format, input_formats, compile_fixed_width_layout
+from app.services.job_service import job_manager
+import logging
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter()
+
+@router.post("/", response_model=TransformJob, status_code=202)
+async def submit_job(
+    config_id: str = Form(...),
+    file: UploadFile = File(...),
+    input_format: Optional[str] = Query(None, description="csv, ndjson, fix or fixed_width; guessed from the extension when omitted"),
+    output_format: str = Query("ndjson", description="Output format: csv or ndjson"),
+    delimiter: str = Query(",", min_length=1, max_length=1),
+    encoding: str = Query("utf-8")
+):
+    """Queue a file for transformation in the background; poll the returned job for progress"""
+    input_format = input_format or detect_input_format(file.filename)
+    if input_format not in input_formats():
+        raise HTTPException(status_code=400, detail="Unsupported file format")
+    if output_format not in OUTPUT_MEDIA_TYPES:
+        raise HTTPException(status_code=400, detail=f"Unsupported output format: {output_format}")
+
+    config = await mapping_repository.get_by_id(config_id)
+    if not config:
+        raise HTTPException(status_code=404, detail="Mapping configuration not found")
+
+    system_model = await system_model_repository.get_by_id(config.system_model_id)
+    if not system_model:
+        raise HTTPException(status_code=500, detail="Referenced system model not found")
+
+    # Reject a bad layout now rather than as a failed job
+    if input_format == "fixed_width":
+        try:
+            compile_fixed_width_layout(config.source_fields)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+    return await job_manager.submit(
+        config, system_model, file.file, file.filename,
+        input_format=input_format, output_format=output_format, encoding=encoding, delimiter=delimiter
+    )
+
+@router.get("/", response_model=List[TransformJob])
+async def list_jobs(
+    limit: int = Query(50, ge=1, le=500),
+    status: Optional[JobStatus] = None
+):
+    """List the most recent jobs"""
+    return FastJSONResponse(await job_manager.list(limit=limit, status=status.value if status else None))
+
+@router.get("/{job_id}", response_model=TransformJob)
+async def get_job(job_id: str):
+    """Get a job's status and progress"""
+    job = await job_manager.get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+@router.post("/{job_id}/cancel", response_model=TransformJob)
+async def cancel_job(job_id: str):
+    """Stop a queued or running job; rows already written are discarded"""
+    job = job_manager.cancel(job_id)
+    if job:
+        return job
+
+    job = await job_manager.get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    raise HTTPException(status_code=409, detail=f"Job is already {job.status}")
+
+@router.get("/{job_id}/result")
+async def download_job_result(job_id: str):
+    """Download the output of a completed job"""
+    job = await job_manager.get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    if job.status != JobStatus.COMPLETED or not job.result_location:
+        raise HTTPException(status_code=409, detail=f"Job has no result (status: {job.status})")
+
+    try:
+        chunks = await job_manager.open_result(job)
+    except Exception as e:
+        logger.error(f"Failed to open result of job {job_id}: {str(e)}")
+        raise HTTPException(status_code=410, detail="Job result is no longer available")
+
+    filename = f"{os.path.splitext(job.filename)[0] or job.id}-transformed.{job.output_format}"
+    headers = {"Content-Disposition": f'attachment; filename="{filename}"'}
+    if job.result_size is not None:
+        headers["Content-Length"] = str(job.result_size)
+    return StreamingResponse(chunks, media_type=OUTPUT_MEDIA_TYPES[job.output_format], headers=headers)
+
+@router.delete("/{job_id}")
+async def delete_job(job_id: str):
+    """Delete a finished job and its stored result"""
+    job = await job_manager.get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    if job.status not in FINISHED_JOB_STATUSES or job_manager.is_active(job_id):
+        raise HTTPException(status_code=409, detail="Cancel the job before deleting it")
+
+    await job_manager.delete(job)
+    return {"message": "Job deleted successfully"}
@@ -0,0 +1,98 @@
+# backend/app/api/endpoints/lookup_tables.py
+from fastapi import APIRouter, HTTPException
+from pymongo.errors import DuplicateKeyError
+from typing import List
+from app.models.lookup_table import LookupTable, LookupTableSummary
+from app.api.responses import FastJSONResponse
+from app.db.errors import ConflictError
+from app.db.repositories import lookup_table_repository, mapping_repository
+from app.services.lookup_service import lookup_index, load_lookup_tables, referenced_lookup_tables
+import logging
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter()
+
+@router.get("/", response_model=List[LookupTableSummary])
+async def list_lookup_tables():
+    """List lookup tables (without their entries)"""
+    return await lookup_table_repository.get_all()
+
+@router.get("/{table_id}", response_model=LookupTable)
+async def get_lookup_table(table_id: str):
+    """Get a lookup table with all of its entries"""
+    table = await lookup_table_repository.get_by_id(table_id)
+    if not table:
+        raise HTTPException(status_code=404, detail="Lookup table not found")
+    return FastJSONResponse(table)
+
+@router.post("/", response_model=LookupTableSummary)
+async def create_lookup_table(table: dict):
+    """Create a lookup table; entries may be an object or a list of [key, value] pairs"""
+    try:
+        created = await lookup_table_repository.create(table)
+    except DuplicateKeyError:
+        raise HTTPException(status_code=409, detail=f"Lookup table {table.get('id')} already exists")
+    lookup_index.install(created.id, created.revision, created.entries)
+    return _summary(created)
+
+@router.put("/{table_id}", response_model=LookupTableSummary)
+async def update_lookup_table(table_id: str, table: dict):
+    """Replace a lookup table's entries; configurations referencing it pick them up without changes.
+
+    The payload must carry the revision it was based on.
+    """
+    # Without a revision, a stale editor would silently overwrite newer changes
+    if table.get("revision") is None:
+        raise HTTPException(status_code=428, detail="Include the revision of the lookup table being updated")
+    try:
+        updated = await lookup_table_repository.update(table_id, table)
+    except ConflictError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    if not updated:
+        raise HTTPException(status_code=404, detail="Lookup table not found")
+    lookup_index.install(updated.id, updated.revision, updated.entries)
+    return _summary(updated)
+
+@router.patch("/{table_id}/entries", response_model=LookupTableSummary)
+async def update_lookup_table_entries(table_id: str, changes: dict):
+    """Add, change ('set') or remove ('remove') individual entries; only those entries are written"""
+    set_entries = {str(key): value for key, value in (changes.get("set") or {}).items()}
+    remove_keys = [str(key) for key in changes.get("remove") or []]
+    try:
+        updated = await lookup_table_repository.update_entries(table_id, set_entries, remove_keys, changes.get("revision"))
+    except ConflictError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    if not updated:
+        raise HTTPException(status_code=404, detail="Lookup table not found")
+    # Every write moves the revision on by one, so the changes apply on top of the previous one
+    if not lookup_index.apply_changes(updated.id, updated.revision - 1, updated.revision, set_entries, remove_keys):
+        await load_lookup_tables([updated.id])
+    return updated
+
+@router.delete("/{table_id}")
+async def delete_lookup_table(table_id: str):
+    """Delete a lookup table that no mapping configuration references"""
+    # Only the field mappings are read, not whole configurations
+    referencing = [
+        config_id for config_id, mappings in (await mapping_repository.get_field_mappings()).items()
+        if table_id in referenced_lookup_tables(mappings)
+    ]
+    if referencing:
+        raise HTTPException(status_code=409, detail=f"Lookup table is used by mapping configurations: {', '.join(referencing)}")
+
+    success = await lookup_table_repository.delete(table_id)
+    if not success:
+        raise HTTPException(status_code=404, detail="Lookup table not found")
+    lookup_index.drop(table_id)
+    return {"message": "Lookup table deleted"}
+
+def _summary(table: LookupTable) -> LookupTableSummary:
+    return LookupTableSummary(
+        id=table.id,
+        name=table.name,
+        description=table.description,
+        entry_count=len(table.entries),
+        updated_at=table.updated_at,
+        revision=table.revision
+    )
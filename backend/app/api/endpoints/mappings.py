@@ -1,11 +1,23 @@
-from fastapi import APIRouter, HTTPException, UploadFile, File
-from typing import List, Dict, Any
-import csv
-import io
-from app.models.mapping import MappingConfig, FieldMapping
-from app.models.system_model import FieldDefinition
-from app.db.repositories import mapping_repository, system_model_repository
-from app.services.transform_service import transform_data
+from fastapi import APIRouter, HTTPException, UploadFile, File, Request, Query
+from fastapi.responses import StreamingResponse
+from starlette.concurrency import run_in_threadpool
+from typing import List, Dict, Any, Optional
+import json
+import time
+from app.models.mapping import MappingConfig, FieldMapping, MappingTestRequest
+from app.api.responses import FastJSONResponse
+from app.db.errors import ConflictError
+from app.db.repositories import mapping_repository, system_model_repository, lookup_table_repository
+from app.services.transform_service import get_compiled_mapping
+from app.services.columnar_service import transform_records
+from app.services.file_transform_service import stream_transformed_records, OUTPUT_MEDIA_TYPES
+from app.services.record_readers import detect_input_format, input_formats, open_record_reader
+from app.services.schema_inference_service import infer_schema, infer_record_schema
+from app.services.executor_service import run_batch_transform
+from app.services.metrics_service import observe_transform
+from app.services.fanout_service import load_configs, run_fanout_test
+from app.services.lookup_service import referenced_lookup_tables
+from app.services.regex_service import invalid_regex_rules
 import logging
 
 logger = logging.getLogger(__name__)
@@ -13,9 +25,24 @@ logger = logging.getLogger(__name__)
 router = APIRouter()
 
 @router.get("/", response_model=List[MappingConfig])
-async def list_mapping_configs():
+async def list_mapping_configs(bank_id: Optional[str] = None, system_model_id: Optional[str] = None):
     """List all mapping configurations"""
-    return await mapping_repository.get_all()
+    # Configs come back validated from the repository; encode them without re-validating
+    return FastJSONResponse(await mapping_repository.get_all(bank_id=bank_id, system_model_id=system_model_id))
+
+@router.get("/page")
+async def list_mapping_configs_page(
+    limit: int = Query(50, ge=1, le=500),
+    cursor: Optional[str] = None,
+    bank_id: Optional[str] = None,
+    system_model_id: Optional[str] = None,
+    summary: bool = True
+):
+    """List mapping configurations one page at a time (summaries by default)"""
+    items, next_cursor = await mapping_repository.get_page(
+        limit, cursor=cursor, bank_id=bank_id, system_model_id=system_model_id, summary=summary
+    )
+    return FastJSONResponse({"items": items, "next_cursor": next_cursor})
 
 @router.get("/{config_id}", response_model=MappingConfig)
 async def get_mapping_config_endpoint(config_id: str):
@@ -23,7 +50,7 @@ async def get_mapping_config_endpoint(config_id: str):
     config = await mapping_repository.get_by_id(config_id)
     if not config:
         raise HTTPException(status_code=404, detail="Mapping configuration not found")
-    return config
+    return FastJSONResponse(config)
 
 @router.post("/", response_model=MappingConfig)
 async def create_mapping_config_endpoint(config: dict):
@@ -42,13 +69,19 @@ async def create_mapping_config_endpoint(config: dict):
                 status_code=400, 
                 detail=f"Target field {mapping['target_field']} not found in system model"
             )
+
+    _check_regex_rules(config.get("mappings", []))
+    await _check_lookup_tables(config.get("mappings", []))
     
-    return await mapping_repository.create(config)
+    return FastJSONResponse(await mapping_repository.create(config))
 
 @router.put("/{config_id}", response_model=MappingConfig)
 async def update_mapping_config_endpoint(config_id: str, config: dict):
-    """Update a mapping configuration"""
+    """Update a mapping configuration; the payload must carry the revision it was based on"""
     logger.info(f"Updating mapping configuration: {config}")
+    # Without a revision, a stale editor would silently overwrite newer changes
+    if config.get("revision") is None:
+        raise HTTPException(status_code=428, detail="Include the revision of the configuration being updated")
     # Validate that the system model exists
     system_model = await system_model_repository.get_by_id(config.get("system_model_id"))
     if not system_model:
@@ -63,11 +96,33 @@ async def update_mapping_config_endpoint(config_id: str, config: dict):
                 status_code=400, 
                 detail=f"Target field {mapping['target_field']} not found in system model"
             )
+
+    _check_regex_rules(config.get("mappings", []))
+    await _check_lookup_tables(config.get("mappings", []))
     
-    updated_config = await mapping_repository.update(config_id, config)
+    try:
+        updated_config = await mapping_repository.update(config_id, config)
+    except ConflictError as e:
+        raise HTTPException(status_code=409, detail=str(e))
     if not updated_config:
         raise HTTPException(status_code=404, detail="Mapping configuration not found")
-    return updated_config
+    return FastJSONResponse(updated_config)
+
+def _check_regex_rules(mappings: List[Any]) -> None:
+    """Reject regex transformations whose pattern, group or template is invalid"""
+    problems = invalid_regex_rules(mappings)
+    if problems:
+        raise HTTPException(status_code=400, detail=f"Invalid regex: {'; '.join(problems)}")
+
+async def _check_lookup_tables(mappings: List[Any]) -> None:
+    """Reject mappings that reference lookup tables which do not exist"""
+    table_ids = referenced_lookup_tables(mappings)
+    if not table_ids:
+        return
+    existing = await lookup_table_repository.get_revisions(list(table_ids))
+    unknown = sorted(table_ids - set(existing))
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Lookup table not found: {', '.join(unknown)}")
 
 @router.delete("/{config_id}")
 async def delete_mapping_config_endpoint(config_id: str):
@@ -78,34 +133,56 @@ async def delete_mapping_config_endpoint(config_id: str):
     return {"message": "Mapping configuration deleted"}
 
 @router.post("/upload-sample")
-async def upload_sample_file(file: UploadFile = File(...)):
-    """Upload a sample file and extract field definitions"""
+async def upload_sample_file(
+    file: UploadFile = File(...),
+    input_format: Optional[str] = Query(None, description="csv, ndjson or fix; guessed from the extension when omitted"),
+    delimiter: Optional[str] = Query(None, min_length=1, max_length=1, description="Detected when omitted"),
+    encoding: Optional[str] = Query(None, description="Detected when omitted")
+):
+    """Upload a sample file and infer field definitions from its first records"""
+    input_format = input_format or detect_input_format(file.filename)
+    if input_format == "fixed_width":
+        raise HTTPException(status_code=400, detail="Fixed-width files have no field names; define the source fields and their lengths instead")
+    if input_format not in input_formats():
+        raise HTTPException(status_code=400, detail="Unsupported file format")
+
     try:
-        contents = await file.read()
-        
-        if file.filename.endswith('.csv'):
-            # Parse CSV
-            csv_text = contents.decode('utf-8')
-            csv_reader = csv.reader(io.StringIO(csv_text))
-            headers = next(csv_reader)
-            
-            # Create field definitions
-            fields = [
-                FieldDefinition(
-                    name=field_name.strip(),
-                    data_type="string",  # Default to string
-                    required=False
-                )
-                for field_name in headers
-            ]
-            
-            return {"fields": fields}
-        else:
-            raise HTTPException(status_code=400, detail="Unsupported file format")
-    
+        # Only a bounded prefix of the upload is read, whatever its size
+        if input_format == "csv":
+            return await run_in_threadpool(infer_schema, file.file, encoding=encoding, delimiter=delimiter)
+        return await run_in_threadpool(infer_record_schema, file.file, input_format, encoding=encoding)
+    except (ValueError, LookupError) as e:
+        # Undecodable sample, unknown encoding or empty file
+        raise HTTPException(status_code=400, detail=f"Error processing file: {str(e)}")
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error processing file: {str(e)}")
 
+@router.post("/test")
+async def test_mappings(request: MappingTestRequest):
+    """Test one sample payload against every configuration of a bank (or a list of configurations) at once"""
+    if (request.bank_id is None) == (request.config_ids is None):
+        raise HTTPException(status_code=400, detail="Provide either bank_id or config_ids")
+
+    start = time.perf_counter()
+    loaded = await load_configs(bank_id=request.bank_id, config_ids=request.config_ids)
+    loaded_at = time.perf_counter()
+    if not loaded["configs"]:
+        raise HTTPException(status_code=404, detail="No mapping configurations found")
+
+    report = run_fanout_test(request.payload, loaded["configs"], loaded["system_models"])
+    finished_at = time.perf_counter()
+
+    report.update({
+        "bank_id": request.bank_id,
+        "missing_config_ids": loaded["missing_config_ids"],
+        "timings": {
+            "load_ms": (loaded_at - start) * 1000,
+            "transform_ms": (finished_at - loaded_at) * 1000,
+            "total_ms": (finished_at - start) * 1000
+        }
+    })
+    return FastJSONResponse(report)
+
 @router.post("/{config_id}/test")
 async def test_mapping(config_id: str, test_data: Dict[str, Any]):
     """Test a mapping configuration with sample data"""
@@ -117,11 +194,103 @@ async def test_mapping(config_id: str, test_data: Dict[str, Any]):
     if not system_model:
         raise HTTPException(status_code=500, detail="Referenced system model not found")
     
+    start = time.perf_counter()
+    # Through the batch engine, so repeated test records are served from the transform memo
+    result = transform_records(get_compiled_mapping(config, system_model), [test_data])[0]
+    if result["error"] is not None:
+        observe_transform(config.id, config.bank_id, "test", time.perf_counter() - start, 0, 1)
+        raise HTTPException(status_code=500, detail=f"Error applying mapping: {result['error']}")
+    observe_transform(config.id, config.bank_id, "test", time.perf_counter() - start, 1)
+    return {
+        "input": test_data,
+        "output": result["output"]
+    }
+
+def _parse_batch_body(body: bytes, content_type: str) -> List[Any]:
+    """Parse a batch request body given as a JSON array or NDJSON"""
     try:
-        result = transform_data(test_data, config, system_model)
-        return {
-            "input": test_data,
-            "output": result
-        }
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error applying mapping: {str(e)}")
\ No newline at end of file
+        text = body.decode('utf-8')
+    except UnicodeDecodeError:
+        raise HTTPException(status_code=400, detail="Request body must be UTF-8 encoded")
+
+    if "ndjson" in content_type or "jsonl" in content_type or not text.lstrip().startswith("["):
+        records = []
+        for line_number, line in enumerate(text.splitlines(), start=1):
+            if not line.strip():
+                continue
+            try:
+                records.append(json.loads(line))
+            except ValueError as e:
+                raise HTTPException(status_code=400, detail=f"Invalid JSON on line {line_number}: {str(e)}")
+        return records
+
+    try:
+        records = json.loads(text)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid JSON: {str(e)}")
+    if not isinstance(records, list):
+        raise HTTPException(status_code=400, detail="Request body must be a JSON array or NDJSON")
+    return records
+
+@router.post("/{config_id}/transform")
+async def transform_batch_endpoint(config_id: str, request: Request):
+    """Transform a batch of records (JSON array or NDJSON) with a mapping configuration"""
+    records = _parse_batch_body(await request.body(), request.headers.get("content-type", ""))
+
+    config = await mapping_repository.get_by_id(config_id)
+    if not config:
+        raise HTTPException(status_code=404, detail="Mapping configuration not found")
+
+    system_model = await system_model_repository.get_by_id(config.system_model_id)
+    if not system_model:
+        raise HTTPException(status_code=500, detail="Referenced system model not found")
+
+    results = await run_batch_transform(config, system_model, records)
+    failed = sum(1 for result in results if result["error"] is not None)
+    # Large result lists are the bulk of this response; encode them in one pass
+    return FastJSONResponse({
+        "config_id": config_id,
+        "total": len(results),
+        "succeeded": len(results) - failed,
+        "failed": failed,
+        "results": results
+    })
+
+@router.post("/{config_id}/transform-file")
+async def transform_file_endpoint(
+    config_id: str,
+    file: UploadFile = File(...),
+    input_format: Optional[str] = Query(None, description="csv, ndjson, fix or fixed_width; guessed from the extension when omitted"),
+    output_format: str = Query("ndjson", description="Output format: csv or ndjson"),
+    delimiter: str = Query(",", min_length=1, max_length=1),
+    encoding: str = Query("utf-8")
+):
+    """Stream a full file through a mapping configuration"""
+    input_format = input_format or detect_input_format(file.filename)
+    if input_format not in input_formats():
+        raise HTTPException(status_code=400, detail="Unsupported file format")
+    if output_format not in OUTPUT_MEDIA_TYPES:
+        raise HTTPException(status_code=400, detail=f"Unsupported output format: {output_format}")
+
+    config = await mapping_repository.get_by_id(config_id)
+    if not config:
+        raise HTTPException(status_code=404, detail="Mapping configuration not found")
+
+    system_model = await system_model_repository.get_by_id(config.system_model_id)
+    if not system_model:
+        raise HTTPException(status_code=500, detail="Referenced system model not found")
+
+    # The upload is spooled to disk by the server; records are read and transformed lazily.
+    # Fixed-width layouts come from the configuration's source fields.
+    try:
+        records = open_record_reader(
+            input_format, file.file, encoding=encoding, delimiter=delimiter, source_fields=config.source_fields
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    compiled = get_compiled_mapping(config, system_model)
+    return StreamingResponse(
+        stream_transformed_records(records, compiled, output_format),
+        media_type=OUTPUT_MEDIA_TYPES[output_format]
+    )
@@ -0,0 +1,20 @@
+# backend/app/api/endpoints/metrics.py
+from fastapi import APIRouter
+from fastapi.responses import Response
+from app.services.metrics_service import metrics, CONTENT_TYPE
+import logging
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter()
+
+@router.get("/metrics")
+async def get_metrics():
+    """Expose service metrics in the Prometheus text format"""
+    return Response(content=metrics.render(), media_type=CONTENT_TYPE)
+
+@router.delete("/metrics")
+async def reset_metrics():
+    """Reset every recorded metric value"""
+    metrics.reset()
+    return {"message": "Metrics reset"}
@@ -1,7 +1,9 @@
 # backend/app/api/endpoints/system_models.py
-from fastapi import APIRouter, HTTPException
-from typing import List
+from fastapi import APIRouter, HTTPException, Query
+from typing import List, Optional
 from app.models.system_model import SystemModel
+from app.api.responses import FastJSONResponse
+from app.db.errors import ConflictError
 from app.db.repositories import system_model_repository
 import logging
 
@@ -12,7 +14,18 @@ router = APIRouter()
 @router.get("/", response_model=List[SystemModel])
 async def list_system_models():
     """List all system models"""
-    return await system_model_repository.get_all()
+    # Models come back validated from the repository; encode them without re-validating
+    return FastJSONResponse(await system_model_repository.get_all())
+
+@router.get("/page")
+async def list_system_models_page(
+    limit: int = Query(50, ge=1, le=500),
+    cursor: Optional[str] = None,
+    summary: bool = True
+):
+    """List system models one page at a time (summaries by default)"""
+    items, next_cursor = await system_model_repository.get_page(limit, cursor=cursor, summary=summary)
+    return FastJSONResponse({"items": items, "next_cursor": next_cursor})
 
 @router.get("/{model_id}", response_model=SystemModel)
 async def get_system_model_endpoint(model_id: str):
@@ -20,21 +33,27 @@ async def get_system_model_endpoint(model_id: str):
     model = await system_model_repository.get_by_id(model_id)
     if not model:
         raise HTTPException(status_code=404, detail="System model not found")
-    return model
+    return FastJSONResponse(model)
 
 @router.post("/", response_model=SystemModel)
 async def create_system_model_endpoint(model: dict):
     """Create a new system model (admin only)"""
-    return await system_model_repository.create(model)
+    return FastJSONResponse(await system_model_repository.create(model))
 
 @router.put("/{model_id}", response_model=SystemModel)
 async def update_system_model_endpoint(model_id: str, model: dict):
+    """Update a system model (admin only); the payload must carry the revision it was based on"""
     logger.info(f"Updating system model with ID: {model_id}")
-    """Update a system model (admin only)"""
-    updated_model = await system_model_repository.update(model_id, model)
+    # Without a revision, a stale editor would silently overwrite newer changes
+    if model.get("revision") is None:
+        raise HTTPException(status_code=428, detail="Include the revision of the system model being updated")
+    try:
+        updated_model = await system_model_repository.update(model_id, model)
+    except ConflictError as e:
+        raise HTTPException(status_code=409, detail=str(e))
     if not updated_model:
         raise HTTPException(status_code=404, detail="System model not found")
-    return updated_model
+    return FastJSONResponse(updated_model)
 
 @router.delete("/{model_id}")
 async def delete_system_model_endpoint(model_id: str):
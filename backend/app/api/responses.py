@@ -0,0 +1,66 @@
+# backend/app/api/responses.py
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+from typing import Any
+from datetime import date, datetime, time
+from decimal import Decimal
+import enum
+import json
+import math
+
+try:
+    import orjson
+except ImportError:  # Falls back to the standard library encoder
+    orjson = None
+
+def _default(value: Any) -> Any:
+    """Encode the types the JSON encoders do not handle themselves"""
+    if isinstance(value, BaseModel):
+        return value.dict()
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    if isinstance(value, (datetime, date, time)):
+        return value.isoformat()
+    if isinstance(value, enum.Enum):
+        return value.value
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+def _finite(value: Any) -> Any:
+    """Copy of value with NaN and infinities replaced by None, as orjson encodes them"""
+    if isinstance(value, float):
+        return value if math.isfinite(value) else None
+    if isinstance(value, dict):
+        return {key: _finite(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_finite(item) for item in value]
+    return value
+
+def _json_default(value: Any) -> Any:
+    return _finite(_default(value))
+
+def dumps(content: Any) -> bytes:
+    """Encode content as JSON bytes, with orjson when it is installed.
+
+    NaN and infinities are encoded as null either way. Content orjson cannot
+    encode, such as integers beyond 64 bits, goes through the standard library.
+    """
+    if orjson is not None:
+        try:
+            return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS)
+        except (orjson.JSONEncodeError, TypeError):
+            pass
+    return json.dumps(_finite(content), default=_json_default, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode("utf-8")
+
+class FastJSONResponse(JSONResponse):
+    """JSON response that encodes its content directly.
+
+    Returning one from an endpoint skips FastAPI's response_model validation and
+    jsonable_encoder pass, so use it for models the repositories have already
+    validated and for plain dicts of JSON-compatible values. The endpoint's
+    response_model still documents the schema.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
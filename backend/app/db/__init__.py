@@ -1,2 +1,2 @@
 # Import database modules for easier access
-from app.db.database import db, connect_to_mongo, close_mongo_connection
\ No newline at end of file
+from app.db.database import db, connect_to_database, close_database_connection, connect_to_mongo, close_mongo_connection
\ No newline at end of file
@@ -0,0 +1,17 @@
+from app.db.backends.base import StorageBackend
+
+STORAGE_BACKENDS = ("mongodb", "memory", "sqlite")
+
+def create_backend(name: str, mongodb_uri: str = None, mongodb_db_name: str = None, sqlite_path: str = None) -> StorageBackend:
+    """Create the storage backend selected by configuration"""
+    # Backends are imported lazily so Motor is only needed when it is used
+    if name == "mongodb":
+        from app.db.backends.motor_backend import MotorBackend
+        return MotorBackend(mongodb_uri, mongodb_db_name)
+    if name == "memory":
+        from app.db.backends.memory_backend import MemoryBackend
+        return MemoryBackend()
+    if name == "sqlite":
+        from app.db.backends.sqlite_backend import SqliteBackend
+        return SqliteBackend(sqlite_path)
+    raise ValueError(f"Unknown storage backend '{name}', expected one of {', '.join(STORAGE_BACKENDS)}")
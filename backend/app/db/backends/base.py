@@ -0,0 +1,171 @@
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Iterable, List, Optional
+import copy
+
+class StorageBackend(ABC):
+    """A document store exposing collections with the async Motor collection API subset
+    the repositories use (find, find_one, insert_one, insert_many, replace_one, delete_one,
+    delete_many, find_one_and_update, count_documents, create_indexes, index_information)"""
+
+    name: str = ""
+
+    @abstractmethod
+    async def connect(self) -> None:
+        """Open the store"""
+
+    @abstractmethod
+    async def close(self) -> None:
+        """Release the store"""
+
+    @property
+    def database(self):
+        """Object whose [collection_name] lookup returns a collection"""
+        return self
+
+    @abstractmethod
+    def __getitem__(self, collection_name: str):
+        """Get a collection by name"""
+
+class InsertOneResult:
+    def __init__(self, inserted_id: Any):
+        self.inserted_id = inserted_id
+
+class InsertManyResult:
+    def __init__(self, inserted_ids: List[Any]):
+        self.inserted_ids = inserted_ids
+
+class UpdateResult:
+    def __init__(self, matched_count: int, modified_count: int):
+        self.matched_count = matched_count
+        self.modified_count = modified_count
+
+class DeleteResult:
+    def __init__(self, deleted_count: int):
+        self.deleted_count = deleted_count
+
+class DocumentCursor:
+    """Cursor over documents already loaded in memory, with Motor's sort/limit/to_list chain"""
+
+    def __init__(self, documents: List[Dict[str, Any]], projection: Optional[Dict[str, Any]] = None):
+        self._documents = documents
+        self._projection = projection
+        self._limit = 0
+
+    def sort(self, key, direction: int = 1) -> "DocumentCursor":
+        keys = [(key, direction)] if isinstance(key, str) else list(key)
+        # Apply the least significant key first; Python's sort is stable
+        for field, field_direction in reversed(keys):
+            self._documents.sort(key=lambda document: _sort_key(document.get(field)), reverse=field_direction < 0)
+        return self
+
+    def limit(self, limit: int) -> "DocumentCursor":
+        self._limit = limit
+        return self
+
+    async def to_list(self, length: Optional[int] = None) -> List[Dict[str, Any]]:
+        documents = self._documents
+        for bound in (self._limit, length):
+            if bound:
+                documents = documents[:bound]
+        return [project(document, self._projection) for document in documents]
+
+def _sort_key(value: Any):
+    # Missing/None sort first, as in MongoDB
+    return (value is not None, value if value is not None else 0)
+
+# Query, projection and update helpers for backends that evaluate queries in Python.
+# They cover the operators the repositories use.
+
+def matches(document: Dict[str, Any], query: Optional[Dict[str, Any]]) -> bool:
+    """Check a document against a MongoDB-style query"""
+    if not query:
+        return True
+    for key, condition in query.items():
+        if key == "$or":
+            if not any(matches(document, sub_query) for sub_query in condition):
+                return False
+            continue
+        if key == "$and":
+            if not all(matches(document, sub_query) for sub_query in condition):
+                return False
+            continue
+
+        present = key in document
+        value = document.get(key)
+        if isinstance(condition, dict) and any(op.startswith("$") for op in condition):
+            for op, operand in condition.items():
+                if not _match_operator(op, operand, value, present):
+                    return False
+        elif value != condition:
+            return False
+    return True
+
+def _match_operator(op: str, operand: Any, value: Any, present: bool) -> bool:
+    if op == "$eq":
+        return value == operand
+    if op == "$ne":
+        return value != operand
+    if op == "$in":
+        return value in operand
+    if op == "$nin":
+        return value not in operand
+    if op == "$exists":
+        return present == bool(operand)
+    if value is None:
+        return False
+    try:
+        if op == "$gt":
+            return value > operand
+        if op == "$gte":
+            return value >= operand
+        if op == "$lt":
+            return value < operand
+        if op == "$lte":
+            return value <= operand
+    except TypeError:
+        return False
+    raise ValueError(f"Unsupported query operator: {op}")
+
+def project(document: Dict[str, Any], projection: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """Return a copy of a document restricted by a MongoDB-style projection"""
+    document = copy.deepcopy(document)
+    if not projection:
+        return document
+
+    included = [field for field, flag in projection.items() if flag and field != "_id"]
+    if included:
+        projected = {field: document[field] for field in included if field in document}
+        if projection.get("_id", 1) and "_id" in document:
+            projected["_id"] = document["_id"]
+        return projected
+
+    for field, flag in projection.items():
+        if not flag:
+            document.pop(field, None)
+    return document
+
+def apply_update(document: Dict[str, Any], update: Dict[str, Any]) -> None:
+    """Apply $set / $inc / $unset to a document in place"""
+    for op, fields in update.items():
+        if op == "$set":
+            document.update(copy.deepcopy(fields))
+        elif op == "$inc":
+            for field, amount in fields.items():
+                document[field] = (document.get(field) or 0) + amount
+        elif op == "$unset":
+            for field in fields:
+                document.pop(field, None)
+        else:
+            raise ValueError(f"Unsupported update operator: {op}")
+
+def index_document(index) -> Dict[str, Any]:
+    """Normalise a pymongo IndexModel into {'name', 'key', 'unique'}"""
+    document = index.document
+    return {
+        "name": document["name"],
+        "key": list(document["key"].items()),
+        "unique": document.get("unique", False)
+    }
+
+def unique_fields(indexes: Iterable[Dict[str, Any]]) -> List[List[str]]:
+    return [[field for field, _ in index["key"]] for index in indexes if index["unique"]]
@@ -0,0 +1,128 @@
+from typing import Any, Dict, List, Optional
+import copy
+import logging
+from pymongo.errors import DuplicateKeyError
+from app.db.backends.base import (
+    StorageBackend, DocumentCursor, InsertOneResult, InsertManyResult, UpdateResult, DeleteResult,
+    matches, project, apply_update, index_document, unique_fields
+)
+
+logger = logging.getLogger(__name__)
+
+class MemoryCollection:
+    """A collection held in process memory; documents are copied on every read and write"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self._documents: List[Dict[str, Any]] = []
+        self._indexes: Dict[str, Dict[str, Any]] = {}
+
+    def _find(self, query: Optional[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        return [document for document in self._documents if matches(document, query)]
+
+    def _check_unique(self, document: Dict[str, Any], ignore: Optional[Dict[str, Any]] = None) -> None:
+        for fields in unique_fields(self._indexes.values()):
+            key = [document.get(field) for field in fields]
+            for existing in self._documents:
+                if existing is not ignore and [existing.get(field) for field in fields] == key:
+                    raise DuplicateKeyError(f"Duplicate key {fields}={key} in {self.name}")
+
+    def find(self, query: Optional[Dict[str, Any]] = None, projection: Optional[Dict[str, Any]] = None) -> DocumentCursor:
+        return DocumentCursor(self._find(query), projection)
+
+    async def find_one(self, query: Optional[Dict[str, Any]] = None, projection: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
+        for document in self._documents:
+            if matches(document, query):
+                return project(document, projection)
+        return None
+
+    async def insert_one(self, document: Dict[str, Any]) -> InsertOneResult:
+        document = copy.deepcopy(document)
+        self._check_unique(document)
+        self._documents.append(document)
+        return InsertOneResult(document.get("id"))
+
+    async def insert_many(self, documents: List[Dict[str, Any]]) -> InsertManyResult:
+        documents = copy.deepcopy(documents)
+        # One pass over the stored documents per unique index, rather than one per new document
+        for fields in unique_fields(self._indexes.values()):
+            seen = {tuple(existing.get(field) for field in fields) for existing in self._documents}
+            for document in documents:
+                key = tuple(document.get(field) for field in fields)
+                if key in seen:
+                    raise DuplicateKeyError(f"Duplicate key {fields}={list(key)} in {self.name}")
+                seen.add(key)
+        self._documents.extend(documents)
+        return InsertManyResult([document.get("id") for document in documents])
+
+    async def replace_one(self, query: Dict[str, Any], replacement: Dict[str, Any]) -> UpdateResult:
+        for position, document in enumerate(self._documents):
+            if matches(document, query):
+                replacement = copy.deepcopy(replacement)
+                self._check_unique(replacement, ignore=document)
+                self._documents[position] = replacement
+                return UpdateResult(1, 1)
+        return UpdateResult(0, 0)
+
+    async def delete_one(self, query: Dict[str, Any]) -> DeleteResult:
+        for position, document in enumerate(self._documents):
+            if matches(document, query):
+                del self._documents[position]
+                return DeleteResult(1)
+        return DeleteResult(0)
+
+    async def delete_many(self, query: Dict[str, Any]) -> DeleteResult:
+        kept = [document for document in self._documents if not matches(document, query)]
+        deleted = len(self._documents) - len(kept)
+        self._documents = kept
+        return DeleteResult(deleted)
+
+    async def find_one_and_update(self, query: Dict[str, Any], update: Dict[str, Any],
+                                  projection: Optional[Dict[str, Any]] = None, return_document: bool = False) -> Optional[Dict[str, Any]]:
+        for document in self._documents:
+            if matches(document, query):
+                before = project(document, projection)
+                updated = copy.deepcopy(document)
+                apply_update(updated, update)
+                self._check_unique(updated, ignore=document)
+                document.clear()
+                document.update(updated)
+                return project(document, projection) if return_document else before
+        return None
+
+    async def count_documents(self, query: Dict[str, Any], limit: int = 0) -> int:
+        count = len(self._find(query))
+        return min(count, limit) if limit else count
+
+    async def create_indexes(self, indexes) -> List[str]:
+        names = []
+        for index in indexes:
+            info = index_document(index)
+            self._indexes[info["name"]] = info
+            names.append(info["name"])
+        return names
+
+    async def index_information(self) -> Dict[str, Dict[str, Any]]:
+        information = {"_id_": {"key": [("_id", 1)]}}
+        for name, info in self._indexes.items():
+            information[name] = {"key": info["key"], "unique": info["unique"]}
+        return information
+
+class MemoryBackend(StorageBackend):
+    """Process-local storage for offline runs, tests and benchmarks; nothing is persisted"""
+
+    name = "memory"
+
+    def __init__(self):
+        self._collections: Dict[str, MemoryCollection] = {}
+
+    async def connect(self) -> None:
+        logger.info("Using in-memory storage backend")
+
+    async def close(self) -> None:
+        self._collections.clear()
+
+    def __getitem__(self, collection_name: str) -> MemoryCollection:
+        if collection_name not in self._collections:
+            self._collections[collection_name] = MemoryCollection(collection_name)
+        return self._collections[collection_name]
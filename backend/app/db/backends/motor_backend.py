@@ -0,0 +1,52 @@
+from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo.server_api import ServerApi
+import logging
+from app.db.backends.base import StorageBackend
+
+logger = logging.getLogger(__name__)
+
+class MotorBackend(StorageBackend):
+    """MongoDB (Atlas) through Motor; collections are native Motor collections"""
+
+    name = "mongodb"
+
+    def __init__(self, uri: str, db_name: str):
+        self.uri = uri
+        self.db_name = db_name
+        self.client = None
+        self._database = None
+
+    async def connect(self) -> None:
+        """Create connection to MongoDB Atlas."""
+        logger.info("Connecting to MongoDB Atlas")
+        logger.info(f"MONGODB_DB_NAME from env: {self.db_name}")
+
+        if not self.uri:
+            error_msg = "MONGODB_URI environment variable not found"
+            logger.error(error_msg)
+            raise ValueError(error_msg)
+
+        self.client = AsyncIOMotorClient(
+            self.uri,
+            server_api=ServerApi('1')
+        )
+        self._database = self.client[self.db_name]
+
+        # Verify connection
+        try:
+            await self.client.admin.command('ping')
+            logger.info("Successfully connected to MongoDB Atlas")
+        except Exception as e:
+            logger.error(f"Failed to connect to MongoDB Atlas: {e}")
+            raise
+
+    async def close(self) -> None:
+        if self.client:
+            self.client.close()
+
+    @property
+    def database(self):
+        return self._database
+
+    def __getitem__(self, collection_name: str):
+        return self._database[collection_name]
@@ -0,0 +1,242 @@
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+import json
+import logging
+import sqlite3
+import threading
+from pymongo.errors import DuplicateKeyError
+from app.db.backends.base import (
+    StorageBackend, DocumentCursor, InsertOneResult, InsertManyResult, UpdateResult, DeleteResult,
+    matches, project, apply_update, index_document, unique_fields
+)
+
+logger = logging.getLogger(__name__)
+
+# Bound parameters per statement, below SQLite's default limit of 999
+_MAX_PARAMETERS = 900
+
+def _encode(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return {"$date": value.isoformat()}
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+def _decode(value: Dict[str, Any]) -> Any:
+    if len(value) == 1 and "$date" in value:
+        return datetime.fromisoformat(value["$date"])
+    return value
+
+def _dumps(document: Dict[str, Any]) -> str:
+    return json.dumps(document, default=_encode)
+
+def _loads(body: str) -> Dict[str, Any]:
+    return json.loads(body, object_hook=_decode)
+
+class SqliteCollection:
+    """A collection stored as JSON documents in a SQLite table.
+
+    Lookups by 'id' (or 'id' $in a list) use an indexed column; other queries are
+    evaluated in Python over the collection, which suits the small configuration
+    collections kept here. Statements run synchronously on the calling thread.
+    """
+
+    def __init__(self, backend: "SqliteBackend", name: str):
+        self._backend = backend
+        self.name = name
+
+    def _execute(self, sql: str, parameters: Tuple = ()) -> List[tuple]:
+        return self._backend.execute(sql, parameters)
+
+    def _rows(self, query: Optional[Dict[str, Any]]) -> List[Tuple[int, Dict[str, Any]]]:
+        """(seq, document) pairs matching a query, in insertion order"""
+        document_id = (query or {}).get("id")
+        if isinstance(document_id, str):
+            rows = self._execute(
+                "SELECT seq, body FROM documents WHERE collection = ? AND doc_id = ? ORDER BY seq",
+                (self.name, document_id)
+            )
+        elif isinstance(document_id, dict) and list(document_id) == ["$in"]:
+            document_ids = list(document_id["$in"])
+            rows = []
+            # Stay within SQLite's limit on bound parameters
+            for start in range(0, len(document_ids), _MAX_PARAMETERS):
+                chunk = document_ids[start:start + _MAX_PARAMETERS]
+                rows.extend(self._execute(
+                    f"SELECT seq, body FROM documents WHERE collection = ? AND doc_id IN ({', '.join('?' * len(chunk))})",
+                    (self.name, *chunk)
+                ))
+            rows.sort()
+        else:
+            rows = self._execute("SELECT seq, body FROM documents WHERE collection = ? ORDER BY seq", (self.name,))
+        documents = [(seq, _loads(body)) for seq, body in rows]
+        return [(seq, document) for seq, document in documents if matches(document, query)]
+
+    def _check_unique(self, document: Dict[str, Any], ignore_seq: Optional[int] = None) -> None:
+        indexes = [_loads(body) for (body,) in self._execute(
+            "SELECT body FROM indexes WHERE collection = ?", (self.name,)
+        )]
+        for fields in unique_fields(indexes):
+            query = {field: document.get(field) for field in fields}
+            for seq, _ in self._rows(query):
+                if seq != ignore_seq:
+                    raise DuplicateKeyError(f"Duplicate key {query} in {self.name}")
+
+    def find(self, query: Optional[Dict[str, Any]] = None, projection: Optional[Dict[str, Any]] = None) -> DocumentCursor:
+        return DocumentCursor([document for _, document in self._rows(query)], projection)
+
+    async def find_one(self, query: Optional[Dict[str, Any]] = None, projection: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
+        rows = self._rows(query)
+        return project(rows[0][1], projection) if rows else None
+
+    async def insert_one(self, document: Dict[str, Any]) -> InsertOneResult:
+        with self._backend.transaction():
+            self._check_unique(document)
+            self._execute(
+                "INSERT INTO documents (collection, doc_id, body) VALUES (?, ?, ?)",
+                (self.name, document.get("id"), _dumps(document))
+            )
+        return InsertOneResult(document.get("id"))
+
+    async def insert_many(self, documents: List[Dict[str, Any]]) -> InsertManyResult:
+        with self._backend.transaction():
+            for document in documents:
+                self._check_unique(document)
+                self._execute(
+                    "INSERT INTO documents (collection, doc_id, body) VALUES (?, ?, ?)",
+                    (self.name, document.get("id"), _dumps(document))
+                )
+        return InsertManyResult([document.get("id") for document in documents])
+
+    async def replace_one(self, query: Dict[str, Any], replacement: Dict[str, Any]) -> UpdateResult:
+        with self._backend.transaction():
+            rows = self._rows(query)
+            if not rows:
+                return UpdateResult(0, 0)
+            seq = rows[0][0]
+            self._check_unique(replacement, ignore_seq=seq)
+            self._execute(
+                "UPDATE documents SET doc_id = ?, body = ? WHERE seq = ?",
+                (replacement.get("id"), _dumps(replacement), seq)
+            )
+        return UpdateResult(1, 1)
+
+    async def delete_one(self, query: Dict[str, Any]) -> DeleteResult:
+        with self._backend.transaction():
+            rows = self._rows(query)
+            if not rows:
+                return DeleteResult(0)
+            self._execute("DELETE FROM documents WHERE seq = ?", (rows[0][0],))
+        return DeleteResult(1)
+
+    async def delete_many(self, query: Dict[str, Any]) -> DeleteResult:
+        with self._backend.transaction():
+            seqs = [seq for seq, _ in self._rows(query)]
+            for start in range(0, len(seqs), _MAX_PARAMETERS):
+                chunk = seqs[start:start + _MAX_PARAMETERS]
+                self._execute(f"DELETE FROM documents WHERE seq IN ({', '.join('?' * len(chunk))})", tuple(chunk))
+        return DeleteResult(len(seqs))
+
+    async def find_one_and_update(self, query: Dict[str, Any], update: Dict[str, Any],
+                                  projection: Optional[Dict[str, Any]] = None, return_document: bool = False) -> Optional[Dict[str, Any]]:
+        with self._backend.transaction():
+            rows = self._rows(query)
+            if not rows:
+                return None
+            seq, document = rows[0]
+            before = project(document, projection)
+            apply_update(document, update)
+            self._check_unique(document, ignore_seq=seq)
+            self._execute(
+                "UPDATE documents SET doc_id = ?, body = ? WHERE seq = ?",
+                (document.get("id"), _dumps(document), seq)
+            )
+        return project(document, projection) if return_document else before
+
+    async def count_documents(self, query: Dict[str, Any], limit: int = 0) -> int:
+        count = len(self._rows(query))
+        return min(count, limit) if limit else count
+
+    async def create_indexes(self, indexes) -> List[str]:
+        names = []
+        with self._backend.transaction():
+            for index in indexes:
+                info = index_document(index)
+                self._execute(
+                    "INSERT OR REPLACE INTO indexes (collection, name, body) VALUES (?, ?, ?)",
+                    (self.name, info["name"], _dumps(info))
+                )
+                names.append(info["name"])
+        return names
+
+    async def index_information(self) -> Dict[str, Dict[str, Any]]:
+        information = {"_id_": {"key": [("_id", 1)]}}
+        for name, body in self._execute("SELECT name, body FROM indexes WHERE collection = ?", (self.name,)):
+            info = _loads(body)
+            information[name] = {"key": info["key"], "unique": info["unique"]}
+        return information
+
+class SqliteBackend(StorageBackend):
+    """Single-file storage for offline runs without a MongoDB cluster"""
+
+    name = "sqlite"
+
+    def __init__(self, path: str):
+        self.path = path
+        self._connection: Optional[sqlite3.Connection] = None
+        self._lock = threading.RLock()
+
+    async def connect(self) -> None:
+        logger.info(f"Using SQLite storage backend at {self.path}")
+        self._connection = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        self._connection.executescript("""
+            CREATE TABLE IF NOT EXISTS documents (
+                seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                collection TEXT NOT NULL,
+                doc_id TEXT,
+                body TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS documents_collection_doc_id ON documents (collection, doc_id);
+            CREATE TABLE IF NOT EXISTS indexes (
+                collection TEXT NOT NULL,
+                name TEXT NOT NULL,
+                body TEXT NOT NULL,
+                PRIMARY KEY (collection, name)
+            );
+        """)
+
+    async def close(self) -> None:
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+    def execute(self, sql: str, parameters: Tuple = ()) -> List[tuple]:
+        with self._lock:
+            return self._connection.execute(sql, parameters).fetchall()
+
+    def transaction(self):
+        return _Transaction(self)
+
+    def __getitem__(self, collection_name: str) -> SqliteCollection:
+        return SqliteCollection(self, collection_name)
+
+class _Transaction:
+    """Holds the backend lock for a read-modify-write sequence and commits it atomically"""
+
+    def __init__(self, backend: SqliteBackend):
+        self._backend = backend
+
+    def __enter__(self):
+        self._backend._lock.acquire()
+        try:
+            self._backend._connection.execute("BEGIN IMMEDIATE")
+        except BaseException:
+            # e.g. the database is locked by another process; __exit__ will not run
+            self._backend._lock.release()
+            raise
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        try:
+            self._backend._connection.execute("ROLLBACK" if exc_type else "COMMIT")
+        finally:
+            self._backend._lock.release()
+        return False
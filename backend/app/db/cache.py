@@ -0,0 +1,103 @@
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional
+import logging
+import os
+import time
+
+logger = logging.getLogger(__name__)
+
+# Cache settings shared by the repositories
+REPOSITORY_CACHE_MAX_SIZE = int(os.environ.get("REPOSITORY_CACHE_MAX_SIZE", "1024"))
+REPOSITORY_CACHE_TTL_SECONDS = float(os.environ.get("REPOSITORY_CACHE_TTL_SECONDS", "60"))
+
+class RepositoryCache:
+    """In-process LRU cache with a time-to-live, used in front of repository reads"""
+
+    def __init__(self, name: str, max_size: int = REPOSITORY_CACHE_MAX_SIZE, ttl_seconds: float = REPOSITORY_CACHE_TTL_SECONDS):
+        self.name = name
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        # Generation at which each key was last invalidated, for the most recent keys;
+        # keys no longer tracked count as invalidated at _floor
+        self._generation = 0
+        self._invalidated: "OrderedDict[Hashable, int]" = OrderedDict()
+        self._floor = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_size > 0 and self.ttl_seconds > 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Return the cached value for a key, or None if missing or expired"""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def generation(self) -> int:
+        """Take before reading a value from the database, and pass to set() with it"""
+        return self._generation
+
+    def set(self, key: Hashable, value: Any, generation: Optional[int] = None) -> None:
+        """Store a value, evicting the least recently used entries when full.
+
+        A value read at a generation before the key was last invalidated may be
+        stale (the write landed while it was read), so it is not stored.
+        """
+        if not self.enabled:
+            return
+        if generation is not None and self._invalidated.get(key, self._floor) > generation:
+            return
+        self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self, key: Hashable) -> None:
+        """Drop a single key"""
+        self._generation += 1
+        self._invalidated[key] = self._generation
+        self._invalidated.move_to_end(key)
+        while len(self._invalidated) > max(self.max_size, 1):
+            _, self._floor = self._invalidated.popitem(last=False)
+        if self._entries.pop(key, None) is not None:
+            self.invalidations += 1
+
+    def clear(self) -> None:
+        """Drop every entry"""
+        self._generation += 1
+        self._invalidated.clear()
+        self._floor = self._generation
+        self.invalidations += len(self._entries)
+        self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss statistics for monitoring"""
+        lookups = self.hits + self.misses
+        return {
+            "name": self.name,
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations
+        }
@@ -0,0 +1,7 @@
+class ConflictError(Exception):
+    """Raised when a write is based on a stale revision of a document"""
+
+    def __init__(self, document_id: str, expected_revision: int):
+        self.document_id = document_id
+        self.expected_revision = expected_revision
+        super().__init__(f"Document {document_id} was modified since revision {expected_revision}")
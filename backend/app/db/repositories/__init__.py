@@ -1,6 +1,10 @@
 from app.db.repositories.system_model_repository import SystemModelRepository
 from app.db.repositories.mapping_repository import MappingRepository
+from app.db.repositories.job_repository import JobRepository
+from app.db.repositories.lookup_table_repository import LookupTableRepository
 
 # Singleton instances
 system_model_repository = SystemModelRepository()
-mapping_repository = MappingRepository()
\ No newline at end of file
+mapping_repository = MappingRepository()
+job_repository = JobRepository()
+lookup_table_repository = LookupTableRepository()
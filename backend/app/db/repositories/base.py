@@ -0,0 +1,39 @@
+from app.db.database import db
+from pymongo import IndexModel
+from typing import Any, Dict, List
+
+# Fields the server sets itself; they are never taken from a payload
+SERVER_MANAGED_FIELDS = ("id", "created_at", "updated_at", "revision")
+
+def client_fields(data: Dict[str, Any]) -> Dict[str, Any]:
+    """A payload without its server-managed fields"""
+    return {key: value for key, value in data.items() if key not in SERVER_MANAGED_FIELDS}
+
+class Repository:
+    """Collection access and index management shared by the repositories"""
+    collection_name: str
+
+    # Indexes backing the repository's lookup paths
+    indexes: List[IndexModel] = []
+
+    @property
+    def collection(self):
+        return db.db[self.collection_name]
+
+    async def ensure_indexes(self) -> None:
+        """Create the indexes used by repository lookups, if they are missing"""
+        await self.collection.create_indexes(self.indexes)
+
+    async def index_status(self) -> dict:
+        """Report which of the expected indexes exist on the collection"""
+        existing = await self.collection.index_information()
+        expected = [index.document["name"] for index in self.indexes]
+        return {
+            "collection": self.collection_name,
+            "expected": expected,
+            "missing": [name for name in expected if name not in existing],
+            "indexes": {
+                name: {"key": info["key"], "unique": info.get("unique", False)}
+                for name, info in existing.items()
+            }
+        }
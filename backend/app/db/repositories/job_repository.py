@@ -0,0 +1,53 @@
+from app.db.repositories.base import Repository
+from app.services.metrics_service import repository_operation_duration
+from pymongo import ASCENDING, DESCENDING, IndexModel
+from app.models.job import TransformJob, JobStatus
+from typing import List, Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+class JobRepository(Repository):
+    collection_name = "transform_jobs"
+
+    # Indexes backing the lookup paths below
+    indexes = [
+        IndexModel([("id", ASCENDING)], name="id_unique", unique=True),
+        IndexModel([("status", ASCENDING), ("created_at", DESCENDING)], name="status_created_at"),
+    ]
+
+    async def get_recent(self, limit: int = 50, status: Optional[str] = None) -> List[TransformJob]:
+        """Get the most recently created jobs, optionally with one status"""
+        query = {"status": status} if status is not None else {}
+        with repository_operation_duration.time(self.collection_name, "find_page"):
+            documents = await self.collection.find(query, {"_id": 0}).sort("created_at", DESCENDING).limit(limit).to_list(length=limit)
+        return [TransformJob(**document) for document in documents]
+
+    async def get_by_id(self, job_id: str) -> Optional[TransformJob]:
+        """Get a job by ID"""
+        with repository_operation_duration.time(self.collection_name, "find_one"):
+            document = await self.collection.find_one({"id": job_id}, {"_id": 0})
+        return TransformJob(**document) if document else None
+
+    async def create(self, job: TransformJob) -> TransformJob:
+        """Store a new job"""
+        with repository_operation_duration.time(self.collection_name, "insert_one"):
+            await self.collection.insert_one(job.dict())
+        return job
+
+    async def save(self, job: TransformJob) -> None:
+        """Overwrite the stored state of a job"""
+        with repository_operation_duration.time(self.collection_name, "replace_one"):
+            await self.collection.replace_one({"id": job.id}, job.dict())
+
+    async def delete(self, job_id: str) -> bool:
+        """Delete a job record"""
+        with repository_operation_duration.time(self.collection_name, "delete_one"):
+            result = await self.collection.delete_one({"id": job_id})
+        return result.deleted_count > 0
+
+    async def get_unfinished(self) -> List[TransformJob]:
+        """Jobs still queued or running according to the database"""
+        query = {"status": {"$in": [JobStatus.QUEUED.value, JobStatus.RUNNING.value]}}
+        documents = await self.collection.find(query, {"_id": 0}).to_list(length=None)
+        return [TransformJob(**document) for document in documents]
@@ -0,0 +1,279 @@
+from app.db.repositories.base import Repository, client_fields
+from app.db.errors import ConflictError
+from app.services.metrics_service import repository_operation_duration
+from pymongo import ASCENDING, IndexModel, ReturnDocument
+from app.models.documents import from_document, to_document
+from app.models.lookup_table import LookupTable, LookupTableSummary
+from typing import Any, Dict, Iterable, List, Optional
+import asyncio
+import json
+import logging
+from datetime import datetime, timedelta
+import uuid
+
+logger = logging.getLogger(__name__)
+
+# How long a writer holds a table while it rewrites entries; a crashed writer's hold expires
+LOOKUP_WRITE_LEASE_SECONDS = 60
+# Entries per insert or delete statement
+ENTRY_WRITE_BATCH = 1000
+# Reads that find a table being written wait and retry this many times
+CONSISTENT_READ_ATTEMPTS = 20
+CONSISTENT_READ_DELAY_SECONDS = 0.05
+
+_MISSING = object()
+
+class LookupEntryRepository(Repository):
+    """Stores lookup table entries, one document per (table ID, key).
+
+    The document ID is built from the table ID and the key, so any string
+    (including ones with '.' or a leading '$') can be a key, and changing one entry
+    writes one document however large the table is.
+    """
+    collection_name = "lookup_table_entries"
+
+    # Indexes backing the lookup paths below
+    indexes = [
+        IndexModel([("id", ASCENDING)], name="id_unique", unique=True),
+        IndexModel([("table_id", ASCENDING)], name="table_id"),
+    ]
+
+    @staticmethod
+    def entry_id(table_id: str, key: str) -> str:
+        return json.dumps([table_id, key], ensure_ascii=False)
+
+    async def get_entries(self, table_id: str) -> Dict[str, Any]:
+        """Every entry of a table"""
+        with repository_operation_duration.time(self.collection_name, "find"):
+            documents = await self.collection.find({"table_id": table_id}, {"_id": 0, "key": 1, "value": 1}).to_list(length=None)
+        return {document["key"]: document.get("value") for document in documents}
+
+    async def count(self, table_id: str) -> int:
+        with repository_operation_duration.time(self.collection_name, "count_documents"):
+            return await self.collection.count_documents({"table_id": table_id})
+
+    async def write(self, table_id: str, set_entries: Dict[str, Any], remove_keys: Iterable[str] = ()) -> None:
+        """Store the given entries and remove the given keys; other entries are not touched.
+
+        Callers hold the table's write lease, so no other writer changes these keys meanwhile.
+        """
+        entry_ids = [self.entry_id(table_id, key) for key in set_entries]
+        entry_ids.extend(self.entry_id(table_id, key) for key in remove_keys if key not in set_entries)
+        for start in range(0, len(entry_ids), ENTRY_WRITE_BATCH):
+            with repository_operation_duration.time(self.collection_name, "delete_many"):
+                await self.collection.delete_many({"id": {"$in": entry_ids[start:start + ENTRY_WRITE_BATCH]}})
+
+        documents = [
+            {"id": entry_id, "table_id": table_id, "key": key, "value": value}
+            for entry_id, (key, value) in zip(entry_ids, set_entries.items())
+        ]
+        for start in range(0, len(documents), ENTRY_WRITE_BATCH):
+            with repository_operation_duration.time(self.collection_name, "insert_many"):
+                await self.collection.insert_many(documents[start:start + ENTRY_WRITE_BATCH])
+
+    async def delete_table(self, table_id: str) -> int:
+        """Remove every entry of a table"""
+        with repository_operation_duration.time(self.collection_name, "delete_many"):
+            result = await self.collection.delete_many({"table_id": table_id})
+        return result.deleted_count
+
+class LookupTableRepository(Repository):
+    """Stores lookup tables: one header document per table, entries in LookupEntryRepository.
+
+    Entries are written under a short write lease on the header, and the header's
+    revision moves on once they are all written, so readers see either the old or
+    the new revision's entries (a reader that finds a write in progress waits for it).
+    """
+    collection_name = "lookup_tables"
+
+    # Indexes backing the lookup paths below
+    indexes = [
+        IndexModel([("id", ASCENDING)], name="id_unique", unique=True),
+    ]
+
+    def __init__(self):
+        self.entries = LookupEntryRepository()
+
+    async def ensure_indexes(self) -> None:
+        """Create the header and entry indexes, if they are missing"""
+        await super().ensure_indexes()
+        await self.entries.ensure_indexes()
+
+    async def get_all(self) -> List[LookupTableSummary]:
+        """Get a summary of every lookup table, without entries"""
+        with repository_operation_duration.time(self.collection_name, "find"):
+            documents = await self.collection.find({}, LookupTableSummary.projection).sort("id", 1).to_list(length=None)
+        return [LookupTableSummary(**document) for document in documents]
+
+    async def get_revisions(self, table_ids: Optional[List[str]] = None) -> Dict[str, int]:
+        """Current revision of each lookup table (or of the given ones that exist)"""
+        query = {"id": {"$in": list(table_ids)}} if table_ids is not None else {}
+        with repository_operation_duration.time(self.collection_name, "find_revisions"):
+            documents = await self.collection.find(query, {"_id": 0, "id": 1, "revision": 1}).to_list(length=None)
+        return {document["id"]: document.get("revision") or 0 for document in documents}
+
+    async def get_by_id(self, table_id: str) -> Optional[LookupTable]:
+        """Get a lookup table with its entries, as of a single revision"""
+        for _ in range(CONSISTENT_READ_ATTEMPTS):
+            with repository_operation_duration.time(self.collection_name, "find_one"):
+                header = await self.collection.find_one({"id": table_id}, {"_id": 0})
+            if header is None:
+                return None
+            if "entries" in header:
+                # Written before entries had their own collection
+                return self._load(header, dict(header["entries"] or ()))
+            if not self._being_written(header):
+                entries = await self.entries.get_entries(table_id)
+                with repository_operation_duration.time(self.collection_name, "find_revisions"):
+                    check = await self.collection.find_one({"id": table_id}, {"_id": 0, "revision": 1, "writing_until": 1})
+                if check is not None and check.get("revision") == header.get("revision") and not self._being_written(check):
+                    return self._load(header, entries)
+            await asyncio.sleep(CONSISTENT_READ_DELAY_SECONDS)
+
+        logger.warning(f"Lookup table {table_id} kept changing while being read; returning entries that may mix revisions")
+        return self._load(header, await self.entries.get_entries(table_id))
+
+    async def create(self, table_data: dict) -> LookupTable:
+        """Create a new lookup table"""
+        now = datetime.now()
+
+        table_copy = client_fields(table_data)
+        table = LookupTable(
+            id=table_data.get("id") or str(uuid.uuid4()),
+            created_at=now,
+            updated_at=now,
+            **table_copy
+        )
+
+        # The header goes first, held until the entries are in, so a duplicate ID fails before any entry is written
+        header = self._header(table)
+        header["writing_until"] = now + timedelta(seconds=LOOKUP_WRITE_LEASE_SECONDS)
+        with repository_operation_duration.time(self.collection_name, "insert_one"):
+            await self.collection.insert_one(header)
+        # Entries left behind by a table of the same ID whose deletion was interrupted
+        await self.entries.delete_table(table.id)
+        await self.entries.write(table.id, table.entries)
+        with repository_operation_duration.time(self.collection_name, "find_one_and_update"):
+            await self.collection.find_one_and_update({"id": table.id}, {"$unset": {"writing_until": ""}})
+        return table
+
+    async def update(self, table_id: str, table_data: dict, expected_revision: Optional[int] = None) -> Optional[LookupTable]:
+        """Replace a lookup table's name, description and entries.
+
+        Only entries that changed are written. When an expected revision is given (or
+        the payload carries a 'revision'), the update only applies if the stored table
+        is still at that revision; otherwise ConflictError is raised.
+        """
+        if expected_revision is None:
+            expected_revision = table_data.get("revision")
+
+        table_copy = client_fields(table_data)
+
+        # Validate the payload; created_at is a placeholder that is not written
+        now = datetime.now()
+        table = LookupTable(id=table_id, created_at=now, updated_at=now, **table_copy)
+
+        header = await self._acquire(table_id, expected_revision)
+        if header is None:
+            return None
+        # Tables stored before entries had their own collection have none there yet, so all are written
+        stored = await self.entries.get_entries(table_id)
+        set_entries = {key: value for key, value in table.entries.items() if stored.get(key, _MISSING) != value}
+        remove_keys = [key for key in stored if key not in table.entries]
+        await self.entries.write(table_id, set_entries, remove_keys)
+
+        updated = await self._release(table_id, header, {"name": table.name, "description": table.description})
+        return self._load(updated, table.entries)
+
+    async def update_entries(self, table_id: str, set_entries: Dict[str, Any], remove_keys: Iterable[str],
+                             expected_revision: Optional[int] = None) -> Optional[LookupTableSummary]:
+        """Add, change and remove individual entries, writing only those entries.
+
+        Raises ConflictError if an expected revision is given and the table has moved on.
+        """
+        set_entries = {str(key): value for key, value in set_entries.items()}
+        remove_keys = [str(key) for key in remove_keys if str(key) not in set_entries]
+
+        header = await self._acquire(table_id, expected_revision)
+        if header is None:
+            return None
+        if "entries" in header:
+            # Move the embedded entries out, with the changes applied
+            entries = dict(header["entries"] or ())
+            entries.update(set_entries)
+            for key in remove_keys:
+                entries.pop(key, None)
+            await self.entries.write(table_id, entries)
+        else:
+            await self.entries.write(table_id, set_entries, remove_keys)
+
+        updated = await self._release(table_id, header, {})
+        return LookupTableSummary(**updated)
+
+    async def delete(self, table_id: str) -> bool:
+        """Delete a lookup table"""
+        with repository_operation_duration.time(self.collection_name, "delete_one"):
+            result = await self.collection.delete_one({"id": table_id})
+        if result.deleted_count:
+            await self.entries.delete_table(table_id)
+        return result.deleted_count > 0
+
+    async def _acquire(self, table_id: str, expected_revision: Optional[int]) -> Optional[dict]:
+        """Take the write lease on a table's header, waiting for a writer that holds it.
+
+        Returns the header as it was, or None if the table does not exist.
+        """
+        for _ in range(CONSISTENT_READ_ATTEMPTS):
+            now = datetime.now()
+            query = {"id": table_id, "$or": [{"writing_until": {"$exists": False}}, {"writing_until": {"$lt": now}}]}
+            if expected_revision is not None:
+                query["revision"] = expected_revision
+            with repository_operation_duration.time(self.collection_name, "find_one_and_update"):
+                header = await self.collection.find_one_and_update(
+                    query,
+                    {"$set": {"writing_until": now + timedelta(seconds=LOOKUP_WRITE_LEASE_SECONDS)}},
+                    projection={"_id": 0},
+                    return_document=ReturnDocument.AFTER
+                )
+            if header is not None:
+                return header
+
+            current = await self.collection.find_one({"id": table_id}, {"_id": 0, "revision": 1, "writing_until": 1})
+            if current is None:
+                return None
+            if expected_revision is not None and current.get("revision") != expected_revision:
+                raise ConflictError(table_id, expected_revision)
+            await asyncio.sleep(CONSISTENT_READ_DELAY_SECONDS)
+        raise ConflictError(table_id, expected_revision if expected_revision is not None else -1)
+
+    async def _release(self, table_id: str, header: dict, changes: dict) -> dict:
+        """Publish the written entries as the table's next revision and give up the lease"""
+        changes = dict(changes, updated_at=datetime.now(), entry_count=await self.entries.count(table_id))
+        with repository_operation_duration.time(self.collection_name, "find_one_and_update"):
+            updated = await self.collection.find_one_and_update(
+                {"id": table_id, "writing_until": header["writing_until"]},
+                {"$set": changes, "$inc": {"revision": 1}, "$unset": {"writing_until": "", "entries": ""}},
+                projection={"_id": 0},
+                return_document=ReturnDocument.AFTER
+            )
+        if updated is None:
+            # The lease expired and another writer took the table over
+            raise ConflictError(table_id, header.get("revision") or 0)
+        return updated
+
+    @staticmethod
+    def _being_written(header: dict) -> bool:
+        writing_until = header.get("writing_until")
+        return writing_until is not None and writing_until > datetime.now()
+
+    @staticmethod
+    def _header(table: LookupTable) -> dict:
+        document = to_document(table, exclude={"entries"})
+        document["entry_count"] = len(table.entries)
+        return document
+
+    @staticmethod
+    def _load(header: dict, entries: Dict[str, Any]) -> LookupTable:
+        header = {key: value for key, value in header.items() if key not in ("writing_until", "entry_count")}
+        header["entries"] = entries
+        return from_document(LookupTable, header)
@@ -1,79 +1,184 @@
-from app.db.database import db
-from app.models.mapping import MappingConfig
-from typing import List, Optional
+from app.db.repositories.base import Repository, client_fields
+from app.db.cache import RepositoryCache
+from app.db.errors import ConflictError
+from app.services.metrics_service import repository_operation_duration
+from pymongo import ASCENDING, IndexModel, ReturnDocument
+from app.models.documents import from_document, to_document
+from app.models.mapping import MappingConfig, MappingConfigSummary
+from typing import Dict, List, Optional, Tuple, Union
 import logging
 from datetime import datetime
 import uuid
 
 logger = logging.getLogger(__name__)
 
-class MappingRepository:
+class MappingRepository(Repository):
     collection_name = "mapping_configs"
 
-    @property
-    def collection(self):
-        return db.db[self.collection_name]
+    # Indexes backing the lookup paths below
+    indexes = [
+        IndexModel([("id", ASCENDING)], name="id_unique", unique=True),
+        IndexModel([("bank_id", ASCENDING), ("id", ASCENDING)], name="bank_id_id"),
+        IndexModel([("system_model_id", ASCENDING), ("id", ASCENDING)], name="system_model_id_id"),
+    ]
 
-    async def get_all(self) -> List[MappingConfig]:
-        """Get all mapping configurations"""
-        cursor = self.collection.find()
-        configs = await cursor.to_list(length=100)  # Limit to 100 configs for now
-        return [MappingConfig(**config) for config in configs]
+    def __init__(self):
+        self.cache = RepositoryCache(self.collection_name)
+
+    async def get_all(self, bank_id: Optional[str] = None, system_model_id: Optional[str] = None) -> List[MappingConfig]:
+        """Get all mapping configurations, optionally filtered"""
+        cursor = self.collection.find(self._filters(bank_id, system_model_id))
+        with repository_operation_duration.time(self.collection_name, "find"):
+            configs = await cursor.to_list(length=None)
+        return [from_document(MappingConfig, config) for config in configs]
+
+    async def get_field_mappings(self) -> Dict[str, List[dict]]:
+        """The field mappings of every configuration by ID, as stored and without the rest of each document"""
+        cursor = self.collection.find({}, {"_id": 0, "id": 1, "mappings": 1})
+        with repository_operation_duration.time(self.collection_name, "find_mappings"):
+            documents = await cursor.to_list(length=None)
+        return {document["id"]: document.get("mappings") or [] for document in documents}
+
+    async def get_page(
+        self,
+        limit: int,
+        cursor: Optional[str] = None,
+        bank_id: Optional[str] = None,
+        system_model_id: Optional[str] = None,
+        summary: bool = True
+    ) -> Tuple[List[Union[MappingConfig, MappingConfigSummary]], Optional[str]]:
+        """Get one page of mapping configurations ordered by ID, plus the cursor for the next page"""
+        query = self._filters(bank_id, system_model_id)
+        if cursor:
+            query["id"] = {"$gt": cursor}
+
+        projection = MappingConfigSummary.projection if summary else None
+
+        # Fetch one extra document to know whether another page follows
+        with repository_operation_duration.time(self.collection_name, "find_page"):
+            documents = await self.collection.find(query, projection).sort("id", 1).limit(limit + 1).to_list(length=limit + 1)
+        if summary:
+            items = [MappingConfigSummary(**document) for document in documents[:limit]]
+        else:
+            items = [from_document(MappingConfig, document) for document in documents[:limit]]
+        next_cursor = items[-1].id if len(documents) > limit else None
+        return items, next_cursor
+
+    @staticmethod
+    def _filters(bank_id: Optional[str], system_model_id: Optional[str]) -> dict:
+        query = {}
+        if bank_id is not None:
+            query["bank_id"] = bank_id
+        if system_model_id is not None:
+            query["system_model_id"] = system_model_id
+        return query
 
     async def get_by_id(self, config_id: str) -> Optional[MappingConfig]:
         """Get a mapping configuration by ID"""
-        config = await self.collection.find_one({"id": config_id})
+        cached = self.cache.get(config_id)
+        if cached is not None:
+            return cached
+
+        # An update landing while this read is in flight must not leave its old version cached
+        generation = self.cache.generation()
+        with repository_operation_duration.time(self.collection_name, "find_one"):
+            config = await self.collection.find_one({"id": config_id})
         if config:
-            return MappingConfig(**config)
+            config = from_document(MappingConfig, config)
+            self.cache.set(config_id, config, generation)
+            return config
         return None
 
+    async def get_many(self, config_ids: List[str]) -> Dict[str, MappingConfig]:
+        """Get several mapping configurations by ID, serving cached ones and fetching the rest in one query"""
+        found = {}
+        missing = []
+        for config_id in dict.fromkeys(config_ids):
+            cached = self.cache.get(config_id)
+            if cached is not None:
+                found[config_id] = cached
+            else:
+                missing.append(config_id)
+
+        if missing:
+            generation = self.cache.generation()
+            with repository_operation_duration.time(self.collection_name, "find_many"):
+                documents = await self.collection.find({"id": {"$in": missing}}).to_list(length=None)
+            for document in documents:
+                config = from_document(MappingConfig, document)
+                self.cache.set(config.id, config, generation)
+                found[config.id] = config
+        return found
+
     async def create(self, config_data: dict) -> MappingConfig:
         """Create a new mapping configuration"""
         config_id = str(uuid.uuid4())
         now = datetime.now()
         
         # Create the config
+        config_copy = client_fields(config_data)
         mapping_config = MappingConfig(
             id=config_id,
             created_at=now,
             updated_at=now,
-            **config_data
+            **config_copy
         )
         
         # Store it in MongoDB
-        await self.collection.insert_one(mapping_config.dict())
+        with repository_operation_duration.time(self.collection_name, "insert_one"):
+            await self.collection.insert_one(to_document(mapping_config))
+        self.cache.invalidate(config_id)
         
         return mapping_config
 
-    async def update(self, config_id: str, config_data: dict) -> Optional[MappingConfig]:
-        """Update an existing mapping configuration"""
-        # Get the existing config
-        existing = await self.get_by_id(config_id)
-        if not existing:
-            return None
-        
-        # Preserve creation date
-        created_at = existing.created_at
-        
-        # Create a copy of the config data without the 'id' field
-        config_copy = config_data.copy()
-        if 'id' in config_copy:
-            del config_copy['id']  # Remove the id to avoid duplicate parameter
-        
-        # Update the config
+    async def update(self, config_id: str, config_data: dict, expected_revision: Optional[int] = None) -> Optional[MappingConfig]:
+        """Atomically update an existing mapping configuration.
+
+        When an expected revision is given (or the payload carries a 'revision'),
+        the update only applies if the stored document is still at that revision;
+        otherwise ConflictError is raised. The creation date is preserved server-side.
+        """
+        if expected_revision is None:
+            expected_revision = config_data.get("revision")
+
+        config_copy = client_fields(config_data)
+
+        # Validate the payload; created_at is a placeholder that is not written
+        now = datetime.now()
         mapping_config = MappingConfig(
             id=config_id,
-            created_at=created_at,
-            updated_at=datetime.now(),
+            created_at=now,
+            updated_at=now,
             **config_copy
         )
-        
-        # Update in MongoDB
-        await self.collection.replace_one({"id": config_id}, mapping_config.dict())
-        
-        return mapping_config
+        changes = to_document(mapping_config, exclude={"id", "created_at", "revision"})
+
+        query = {"id": config_id}
+        if expected_revision is not None:
+            # Documents written before revisions existed count as revision 0
+            query["revision"] = {"$in": [0, None]} if expected_revision == 0 else expected_revision
+
+        # Update in MongoDB in a single round trip
+        with repository_operation_duration.time(self.collection_name, "find_one_and_update"):
+            updated = await self.collection.find_one_and_update(
+                query,
+                {"$set": changes, "$inc": {"revision": 1}},
+                projection={"_id": 0},
+                return_document=ReturnDocument.AFTER
+            )
+        self.cache.invalidate(config_id)
+
+        if updated is None:
+            if expected_revision is not None and await self.collection.count_documents({"id": config_id}, limit=1):
+                raise ConflictError(config_id, expected_revision)
+            return None
+
+        # Validated in full: the document may predate schema versions and now carries the current one
+        return MappingConfig(**updated)
 
     async def delete(self, config_id: str) -> bool:
         """Delete a mapping configuration"""
-        result = await self.collection.delete_one({"id": config_id})
+        with repository_operation_duration.time(self.collection_name, "delete_one"):
+            result = await self.collection.delete_one({"id": config_id})
+        self.cache.invalidate(config_id)
         return result.deleted_count > 0
\ No newline at end of file
@@ -1,30 +1,72 @@
-from app.db.database import db
-from app.models.system_model import SystemModel
-from typing import List, Optional
+from app.db.repositories.base import Repository, client_fields
+from app.db.cache import RepositoryCache
+from app.db.errors import ConflictError
+from app.services.metrics_service import repository_operation_duration
+from pymongo import ASCENDING, IndexModel, ReturnDocument
+from app.models.documents import from_document, to_document
+from app.models.system_model import SystemModel, SystemModelSummary
+from typing import List, Optional, Tuple, Union
 import logging
 from datetime import datetime
 import uuid
 
 logger = logging.getLogger(__name__)
 
-class SystemModelRepository:
+class SystemModelRepository(Repository):
     collection_name = "system_models"
 
-    @property
-    def collection(self):
-        return db.db[self.collection_name]
+    # Indexes backing the lookup paths below
+    indexes = [
+        IndexModel([("id", ASCENDING)], name="id_unique", unique=True),
+    ]
+
+    def __init__(self):
+        self.cache = RepositoryCache(self.collection_name)
 
     async def get_all(self) -> List[SystemModel]:
         """Get all system models"""
         cursor = self.collection.find()
-        models = await cursor.to_list(length=100)  # Limit to 100 models for now
-        return [SystemModel(**model) for model in models]
+        with repository_operation_duration.time(self.collection_name, "find"):
+            models = await cursor.to_list(length=None)
+        return [from_document(SystemModel, model) for model in models]
+
+    async def get_page(
+        self,
+        limit: int,
+        cursor: Optional[str] = None,
+        summary: bool = True
+    ) -> Tuple[List[Union[SystemModel, SystemModelSummary]], Optional[str]]:
+        """Get one page of system models ordered by ID, plus the cursor for the next page"""
+        query = {}
+        if cursor:
+            query["id"] = {"$gt": cursor}
+
+        projection = SystemModelSummary.projection if summary else None
+
+        # Fetch one extra document to know whether another page follows
+        with repository_operation_duration.time(self.collection_name, "find_page"):
+            documents = await self.collection.find(query, projection).sort("id", 1).limit(limit + 1).to_list(length=limit + 1)
+        if summary:
+            items = [SystemModelSummary(**document) for document in documents[:limit]]
+        else:
+            items = [from_document(SystemModel, document) for document in documents[:limit]]
+        next_cursor = items[-1].id if len(documents) > limit else None
+        return items, next_cursor
 
     async def get_by_id(self, model_id: str) -> Optional[SystemModel]:
         """Get a system model by ID"""
-        model = await self.collection.find_one({"id": model_id})
+        cached = self.cache.get(model_id)
+        if cached is not None:
+            return cached
+
+        # An update landing while this read is in flight must not leave its old version cached
+        generation = self.cache.generation()
+        with repository_operation_duration.time(self.collection_name, "find_one"):
+            model = await self.collection.find_one({"id": model_id})
         if model:
-            return SystemModel(**model)
+            model = from_document(SystemModel, model)
+            self.cache.set(model_id, model, generation)
+            return model
         return None
 
     async def create(self, model_data: dict) -> SystemModel:
@@ -33,49 +75,71 @@ class SystemModelRepository:
         now = datetime.now()
         
         # Create the model
+        model_copy = client_fields(model_data)
         system_model = SystemModel(
             id=model_id,
             created_at=now,
             updated_at=now,
-            **model_data
+            **model_copy
         )
         
         # Store it in MongoDB
-        await self.collection.insert_one(system_model.dict())
+        with repository_operation_duration.time(self.collection_name, "insert_one"):
+            await self.collection.insert_one(to_document(system_model))
+        self.cache.invalidate(model_id)
         
         return system_model
 
-    async def update(self, model_id: str, model_data: dict) -> Optional[SystemModel]:
-        """Update an existing system model"""
-        # Get the existing model
-        existing = await self.get_by_id(model_id)
-        if not existing:
-            return None
-        
-        # Preserve creation date
-        created_at = existing.created_at
-        
-        # Create a copy of the model data without the 'id' field
-        model_copy = model_data.copy()
-        if 'id' in model_copy:
-            del model_copy['id']  # Remove the id to avoid duplicate parameter
-        
-        # Update the model
+    async def update(self, model_id: str, model_data: dict, expected_revision: Optional[int] = None) -> Optional[SystemModel]:
+        """Atomically update an existing system model.
+
+        When an expected revision is given (or the payload carries a 'revision'),
+        the update only applies if the stored document is still at that revision;
+        otherwise ConflictError is raised. The creation date is preserved server-side.
+        """
+        if expected_revision is None:
+            expected_revision = model_data.get("revision")
+
+        model_copy = client_fields(model_data)
+
+        # Validate the payload; created_at is a placeholder that is not written
+        now = datetime.now()
         system_model = SystemModel(
             id=model_id,
-            created_at=created_at,
-            updated_at=datetime.now(),
+            created_at=now,
+            updated_at=now,
             **model_copy
         )
-        
-        # Update in MongoDB
-        await self.collection.replace_one({"id": model_id}, system_model.dict())
-        
-        return system_model
+        changes = to_document(system_model, exclude={"id", "created_at", "revision"})
+
+        query = {"id": model_id}
+        if expected_revision is not None:
+            # Documents written before revisions existed count as revision 0
+            query["revision"] = {"$in": [0, None]} if expected_revision == 0 else expected_revision
+
+        # Update in MongoDB in a single round trip
+        with repository_operation_duration.time(self.collection_name, "find_one_and_update"):
+            updated = await self.collection.find_one_and_update(
+                query,
+                {"$set": changes, "$inc": {"revision": 1}},
+                projection={"_id": 0},
+                return_document=ReturnDocument.AFTER
+            )
+        self.cache.invalidate(model_id)
+
+        if updated is None:
+            if expected_revision is not None and await self.collection.count_documents({"id": model_id}, limit=1):
+                raise ConflictError(model_id, expected_revision)
+            return None
+
+        # Validated in full: the document may predate schema versions and now carries the current one
+        return SystemModel(**updated)
 
     async def delete(self, model_id: str) -> bool:
         """Delete a system model"""
-        result = await self.collection.delete_one({"id": model_id})
+        with repository_operation_duration.time(self.collection_name, "delete_one"):
+            result = await self.collection.delete_one({"id": model_id})
+        self.cache.invalidate(model_id)
         return result.deleted_count > 0
 
     async def init_default_models(self):
@@ -1,11 +1,17 @@
 # backend/app/main.py
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from app.api.endpoints import system_models, mappings
+from app.api.endpoints import system_models, mappings, diagnostics, admin, metrics, jobs, lookup_tables
+import asyncio
 import logging
 import os
+import time
 from dotenv import load_dotenv
-from app.db.database import connect_to_mongo, close_mongo_connection
+from app.db.database import connect_to_database, close_database_connection
+from app.services.executor_service import shutdown_executor
+from app.services.job_service import job_manager
+from app.services.lookup_service import load_lookup_tables, refresh_lookup_tables_periodically
+from app.services.metrics_service import http_request_duration, register_cache_metrics
 
 # Load environment variables from .env file
 load_dotenv()
@@ -35,23 +41,89 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Connect to MongoDB on startup and initialize data
+class RequestMetricsMiddleware:
+    """Record request latency per route template (not per concrete path, to keep label values bounded).
+
+    Requests are timed until the last chunk of the response body is sent, so
+    streamed responses count their whole body, not just the time to headers.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        status = 500
+
+        async def send_and_record_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_and_record_status)
+        finally:
+            # The router records the matched route in the request scope
+            route = scope.get("route")
+            http_request_duration.observe(
+                time.perf_counter() - start,
+                scope["method"], route.path if route is not None else "unmatched", status
+            )
+
+app.add_middleware(RequestMetricsMiddleware)
+
+# Connect to the database on startup and initialize data
 @app.on_event("startup")
 async def startup_db_client():
-    await connect_to_mongo()
+    await connect_to_database()
     
     # Initialize default system models if needed
-    from app.db.repositories import system_model_repository
+    from app.db.repositories import system_model_repository, mapping_repository, job_repository, lookup_table_repository
     await system_model_repository.init_default_models()
 
-# Close MongoDB connection on shutdown
+    # Make sure repository lookups are backed by indexes
+    for repository in (system_model_repository, mapping_repository, job_repository, lookup_table_repository):
+        try:
+            await repository.ensure_indexes()
+        except Exception as e:
+            logger.error(f"Failed to create indexes on {repository.collection_name}: {e}")
+
+    # Jobs that were running when the server stopped will not resume
+    await job_manager.recover()
+
+    # Load shared lookup tables into memory, and keep up with changes made by other processes
+    await load_lookup_tables()
+    app.state.lookup_refresh = asyncio.create_task(refresh_lookup_tables_periodically())
+
+# Close the database connection on shutdown
 @app.on_event("shutdown")
 async def shutdown_db_client():
-    await close_mongo_connection()
+    lookup_refresh = getattr(app.state, "lookup_refresh", None)
+    if lookup_refresh is not None:
+        lookup_refresh.cancel()
+    job_manager.shutdown()
+    await close_database_connection()
+    shutdown_executor()
 
 # Include API routes
 app.include_router(system_models.router, prefix="/api/system-models", tags=["system-models"])
 app.include_router(mappings.router, prefix="/api/mappings", tags=["mappings"])
+app.include_router(diagnostics.router, prefix="/api/diagnostics", tags=["diagnostics"])
+app.include_router(admin.router, prefix="/api/admin", tags=["admin"])
+app.include_router(jobs.router, prefix="/api/jobs", tags=["jobs"])
+app.include_router(lookup_tables.router, prefix="/api/lookup-tables", tags=["lookup-tables"])
+app.include_router(metrics.router, tags=["metrics"])
+
+def _repository_caches():
+    from app.db.repositories import system_model_repository, mapping_repository
+    return (system_model_repository.cache, mapping_repository.cache)
+
+register_cache_metrics(_repository_caches)
 
 @app.get("/")
 async def root():
@@ -0,0 +1,68 @@
+# backend/app/models/documents.py
+from pydantic import BaseModel
+from pydantic.fields import ModelField, SHAPE_LIST, SHAPE_SINGLETON
+from typing import Dict, Any, Optional, Tuple, Type, TypeVar
+from functools import lru_cache
+
+Model = TypeVar("Model", bound=BaseModel)
+
+# Stored next to every document the repositories write. A document carrying the
+# current version was built from a validated model and can be loaded without
+# validating it again; bump the version whenever a stored model changes shape.
+SCHEMA_VERSION_KEY = "schema_version"
+SCHEMA_VERSION = 1
+
+def to_document(model: BaseModel, **exclude_kwargs) -> Dict[str, Any]:
+    """The stored form of a validated model, marked as written by this schema version"""
+    document = model.dict(**exclude_kwargs)
+    document[SCHEMA_VERSION_KEY] = SCHEMA_VERSION
+    return document
+
+def from_document(model: Type[Model], document: Dict[str, Any]) -> Model:
+    """Load a model from a stored document.
+
+    Documents written by the repositories at the current schema version are
+    constructed without validation; anything else (older documents, imports,
+    hand edits) is validated as before.
+    """
+    if document.get(SCHEMA_VERSION_KEY) == SCHEMA_VERSION:
+        return construct_trusted(model, document)
+    return model(**document)
+
+def construct_trusted(model: Type[Model], values: Dict[str, Any]) -> Model:
+    """Build a model and its nested models from already-validated values, skipping validation.
+
+    Keys that are not model fields (such as Mongo's _id) are dropped and missing
+    fields get their defaults. The values are used as they are, so they must not
+    be shared with anything that mutates them.
+    """
+    fields = {}
+    fields_set = set()
+    for name, field, nested, shape in _construction_plan(model):
+        if name not in values:
+            fields[name] = field.get_default()
+            continue
+        value = values[name]
+        if nested is not None and value is not None:
+            if shape == SHAPE_SINGLETON:
+                value = construct_trusted(nested, value)
+            elif shape == SHAPE_LIST:
+                value = [construct_trusted(nested, item) for item in value]
+        fields[name] = value
+        fields_set.add(name)
+
+    # What BaseModel.construct does, without its second pass over the fields
+    instance = model.__new__(model)
+    object.__setattr__(instance, "__dict__", fields)
+    object.__setattr__(instance, "__fields_set__", fields_set)
+    instance._init_private_attributes()
+    return instance
+
+@lru_cache(maxsize=None)
+def _construction_plan(model: Type[BaseModel]) -> Tuple[Tuple[str, ModelField, Optional[Type[BaseModel]], int], ...]:
+    """(name, field, nested model class or None, shape) for each field of a model"""
+    plan = []
+    for name, field in model.__fields__.items():
+        nested = field.type_ if isinstance(field.type_, type) and issubclass(field.type_, BaseModel) else None
+        plan.append((name, field, nested, field.shape))
+    return tuple(plan)
@@ -0,0 +1,38 @@
+from pydantic import BaseModel
+from typing import Optional
+from datetime import datetime
+import enum
+
+class JobStatus(str, enum.Enum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+
+# Statuses a job never leaves
+FINISHED_JOB_STATUSES = (JobStatus.COMPLETED, JobStatus.FAILED, JobStatus.CANCELLED)
+
+class TransformJob(BaseModel):
+    """A background transformation of an uploaded file with a mapping configuration"""
+    id: str
+    config_id: str
+    bank_id: str
+    filename: str
+    input_format: str
+    output_format: str
+    status: JobStatus = JobStatus.QUEUED
+    rows_done: int = 0
+    rows_failed: int = 0
+    rows_per_sec: float = 0.0
+    error: Optional[str] = None
+    cancel_requested: bool = False
+    # Where the output was stored, e.g. "local:<file name>" or "gridfs:<file id>"
+    result_location: Optional[str] = None
+    result_size: Optional[int] = None
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+    class Config:
+        use_enum_values = True
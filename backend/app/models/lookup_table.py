@@ -0,0 +1,35 @@
+from pydantic import BaseModel, validator
+from typing import Dict, Any, Optional, ClassVar
+from datetime import datetime
+
+class LookupTable(BaseModel):
+    """A shared key -> value table referenced by enum_map and lookup transformations"""
+    id: str
+    name: str
+    description: Optional[str] = None
+    # Values are usually strings (code -> code); objects can be picked apart with the lookup 'field' param
+    entries: Dict[str, Any]
+    created_at: datetime
+    updated_at: datetime
+    revision: int = 0  # Incremented on every update; the in-memory index reloads on change
+
+    @validator("entries", pre=True)
+    def entries_from_pairs(cls, v):
+        """Accept [[key, value], ...] as well as an object, since keys may not be valid object keys everywhere"""
+        if isinstance(v, list):
+            return {str(key): value for key, value in v}
+        return v
+
+class LookupTableSummary(BaseModel):
+    """Lightweight view of a lookup table for listings"""
+    id: str
+    name: str
+    description: Optional[str] = None
+    entry_count: int = 0
+    updated_at: datetime
+    revision: int = 0
+
+    # Fields fetched from the database for this view
+    projection: ClassVar[Dict[str, int]] = {
+        "_id": 0, "id": 1, "name": 1, "description": 1, "entry_count": 1, "updated_at": 1, "revision": 1
+    }
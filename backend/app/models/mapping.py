@@ -1,5 +1,5 @@
 from pydantic import BaseModel, validator
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, ClassVar, Tuple
 from datetime import datetime
 import enum
 from app.models.system_model import FieldDefinition
@@ -21,6 +21,24 @@ class FieldMapping(BaseModel):
     source_field: str
     target_field: str
     transformation: Optional[TransformationRule] = None
+    # Ordered pipeline of steps; takes precedence over the single transformation when set
+    transformations: Optional[List[TransformationRule]] = None
+
+    def pipeline(self) -> List[TransformationRule]:
+        """The transformation steps applied to this field, in order"""
+        if self.transformations:
+            return list(self.transformations)
+        return [self.transformation] if self.transformation else []
+
+def pipeline_rules(mapping: Any) -> List[Tuple[Any, Any]]:
+    """(type, params) of each step of a field mapping, given as a model or a plain dict.
+
+    Plain dicts are unvalidated payloads: malformed rules are skipped and left to model validation.
+    """
+    if isinstance(mapping, dict):
+        rules = mapping.get("transformations") or [mapping.get("transformation")]
+        return [(rule.get("type"), rule.get("params")) for rule in rules if isinstance(rule, dict)]
+    return [(rule.type, rule.params) for rule in mapping.pipeline()]
 
 class MappingConfig(BaseModel):
     """Configuration for mapping bank-specific formats to system formats"""
@@ -33,6 +51,7 @@ class MappingConfig(BaseModel):
     mappings: List[FieldMapping]
     created_at: datetime
     updated_at: datetime
+    revision: int = 0  # Incremented on every update, for optimistic concurrency
 
     @validator('mappings')
     def validate_target_fields(cls, v, values):
@@ -41,6 +60,52 @@ class MappingConfig(BaseModel):
         # This is now handled at the API level
         return v
 
+class MappingTestRequest(BaseModel):
+    """A sample payload to run through several mapping configurations at once"""
+    payload: Dict[str, Any]
+    # Either every configuration of a bank or an explicit list of configuration IDs
+    bank_id: Optional[str] = None
+    config_ids: Optional[List[str]] = None
+
+class RuntimeMapping:
+    """Compact, read-only form of a mapping configuration consumed by the transform engine.
+
+    Each entry of fields is (source_field, target_field, steps), where steps is the
+    field's ordered pipeline as (transformation type, params) pairs.
+    """
+    __slots__ = ("id", "bank_id", "system_model_id", "updated_at", "fields")
+
+    def __init__(self, id: str, bank_id: str, system_model_id: str, updated_at: datetime,
+                 fields: Tuple[Tuple[str, str, Tuple[Tuple[str, Dict[str, Any]], ...]], ...]):
+        self.id = id
+        self.bank_id = bank_id
+        self.system_model_id = system_model_id
+        self.updated_at = updated_at
+        self.fields = fields
+
+    @classmethod
+    def from_config(cls, config: "MappingConfig") -> "RuntimeMapping":
+        return cls(
+            config.id, config.bank_id, config.system_model_id, config.updated_at,
+            tuple(
+                (mapping.source_field, mapping.target_field, tuple((rule.type, rule.params or {}) for rule in mapping.pipeline()))
+                for mapping in config.mappings
+            )
+        )
+
+class MappingConfigSummary(BaseModel):
+    """Lightweight view of a mapping configuration for listings"""
+    id: str
+    name: str
+    bank_id: str
+    system_model_id: str
+    updated_at: datetime
+
+    # Fields fetched from the database for this view
+    projection: ClassVar[Dict[str, int]] = {
+        "_id": 0, "id": 1, "name": 1, "bank_id": 1, "system_model_id": 1, "updated_at": 1
+    }
+
 # This function remains for compatibility during transition
 async def get_mapping_config(config_id: str) -> Optional[MappingConfig]:
     """Get a mapping configuration by ID (redirects to repository)"""
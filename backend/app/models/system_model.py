@@ -20,6 +20,7 @@ class SystemModel(BaseModel):
     created_at: datetime
     updated_at: datetime
     created_by: str = "system"  # In a real system, this would be the user ID
+    revision: int = 0  # Incremented on every update, for optimistic concurrency
 
     class Config:
         schema_extra = {
@@ -40,6 +41,19 @@ class SystemModel(BaseModel):
             }
         }
 
+class SystemModelSummary(BaseModel):
+    """Lightweight view of a system model for listings"""
+    id: str
+    name: str
+    description: Optional[str] = None
+    version: str
+    updated_at: datetime
+
+    # Fields fetched from the database for this view
+    projection: ClassVar[Dict[str, int]] = {
+        "_id": 0, "id": 1, "name": 1, "description": 1, "version": 1, "updated_at": 1
+    }
+
 # This function remains for compatibility during transition
 async def get_system_model(model_id: str) -> Optional[SystemModel]:
     """Get a system model by ID (redirects to repository)"""
@@ -0,0 +1,399 @@
+# backend/app/services/columnar_service.py
+from typing import Dict, Any, List, Callable, Optional, Set, Tuple
+from functools import partial
+from itertools import repeat
+from operator import itemgetter
+import logging
+import os
+import time
+from app.services.transform_service import CompiledMapping, TransformStep, TRANSFORM_STEP_SAMPLE_EVERY, diagnostics
+from app.services.metrics_service import transform_step_duration
+from app.services.validation_service import error_message
+from app.services.lookup_service import lookup_index
+from app.services.memo_service import transform_memo
+from app.services.regex_service import BoundedRegex, RegexTimeout
+
+logger = logging.getLogger(__name__)
+
+# Engine used for batches: "row", "columnar" or "auto" (columnar for large batches)
+TRANSFORM_ENGINE = os.environ.get("TRANSFORM_ENGINE", "auto").lower()
+COLUMNAR_MIN_BATCH = int(os.environ.get("COLUMNAR_MIN_BATCH", "256"))
+
+class _MissingType:
+    """Marks a cell whose source field is absent from the record"""
+    __slots__ = ()
+
+    def __repr__(self):
+        return "<missing>"
+
+_MISSING = _MissingType()
+
+# A column kernel transforms a whole column at once, given the set of value types in it.
+# Kernels raise when they cannot handle the column; the engine then falls back to
+# applying the row step value by value, so results always match the row engine.
+ColumnKernel = Callable[[List[Any], Set[type]], List[Any]]
+
+_STR_ONLY = {str}
+_NUMBER_TYPES = {int, float, bool}
+
+def transform_records(compiled: CompiledMapping, records: List[Any], start_index: int = 0, engine: str = TRANSFORM_ENGINE,
+                      memoize: bool = True) -> List[Dict[str, Any]]:
+    """Transform a batch with the row or columnar engine, returning per-record results.
+
+    With the transform memo enabled, records seen before are served from it and
+    only the rest go through the engine.
+    """
+    # Diagnostics measure every step, so they always run the engine
+    if memoize and transform_memo.enabled and not diagnostics.enabled:
+        return transform_memo.transform_records(compiled, records, start_index, partial(_run_engine, engine=engine))
+    return _run_engine(compiled, records, start_index, engine)
+
+def _run_engine(compiled: CompiledMapping, records: List[Any], start_index: int = 0, engine: str = TRANSFORM_ENGINE) -> List[Dict[str, Any]]:
+    # Detailed diagnostics count per field, which only the row engine does
+    if engine == "row" or diagnostics.enabled or (engine == "auto" and len(records) < COLUMNAR_MIN_BATCH):
+        return compiled.transform_batch(records, start_index)
+    return transform_columnar(compiled, records, start_index)
+
+def transform_columnar(compiled: CompiledMapping, records: List[Any], start_index: int = 0) -> List[Dict[str, Any]]:
+    """Transform a batch column by column; produces the same results as transform_batch"""
+    plan = compiled.columnar_plan
+    if plan is None:
+        plan = compiled.columnar_plan = _build_plan(compiled)
+
+    rows = [record for record in records if isinstance(record, dict)]
+    outputs, columns = _transform_rows(plan, rows) if rows else ([], None)
+
+    # Validate column-wise when every row holds the same fields
+    if columns is not None:
+        row_issues = compiled.validator.check_columns(columns, len(rows))
+        errors = [error_message(issues) if issues else None for issues in row_issues]
+    else:
+        errors = []
+        validate = compiled.validator.validate
+        for output in outputs:
+            try:
+                validate(output)
+                errors.append(None)
+            except Exception as e:
+                errors.append(str(e))
+
+    if len(rows) == len(records):
+        # Every record is an object: one result per row, in order
+        return [
+            {"index": index, "output": output, "error": None} if error is None
+            else {"index": index, "output": None, "error": error}
+            for index, (output, error) in enumerate(zip(outputs, errors), start=start_index)
+        ]
+
+    results = []
+    rows_iter = iter(zip(outputs, errors))
+    for index, record in enumerate(records, start=start_index):
+        if not isinstance(record, dict):
+            results.append({"index": index, "output": None, "error": "Record must be a JSON object"})
+            continue
+        output, error = next(rows_iter)
+        if error is None:
+            results.append({"index": index, "output": output, "error": None})
+        else:
+            results.append({"index": index, "output": None, "error": error})
+
+    return results
+
+def _build_plan(compiled: CompiledMapping) -> List[tuple]:
+    """Pair each step of each compiled field with a column kernel, where one exists"""
+    plan = []
+    for (source_field, target_field, _, _), field_stages in zip(compiled.fields, compiled.stages):
+        stages = []
+        for transform_type, params, step in field_stages:
+            kernel = None
+            builder = _KERNEL_BUILDERS.get(transform_type)
+            if transform_type in _DISTINCT_VALUE_TYPES:
+                kernel = _distinct_value_kernel(step)
+            elif builder is not None:
+                try:
+                    kernel = builder(params)
+                except Exception:
+                    # Invalid params: the row step already handles them
+                    kernel = None
+            stages.append((transform_type, step, kernel))
+        # A pipeline runs column by column too, one step at a time
+        plan.append((source_field, target_field, tuple(stages)))
+    return plan
+
+def _transform_rows(plan: List[tuple], rows: List[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], Optional[Dict[str, List[Any]]]]:
+    """Transform rows column-wise; also returns the output columns when no cell is missing"""
+    # Pivot each distinct source field into a column
+    source_columns: Dict[str, List[Any]] = {}
+    for source_field, _, _ in plan:
+        if source_field not in source_columns:
+            source_columns[source_field] = [row.get(source_field, _MISSING) for row in rows]
+
+    targets = []
+    output_columns = []
+    has_missing = False
+    for source_field, target_field, stages in plan:
+        column = source_columns[source_field]
+        types = set(map(type, column))
+        if _MissingType in types:
+            has_missing = True
+
+        for index, (transform_type, step, kernel) in enumerate(stages):
+            if index:
+                types = set(map(type, column))
+            start = time.perf_counter()
+            column = _apply_column(column, types, rows, target_field, transform_type, step, kernel)
+            if TRANSFORM_STEP_SAMPLE_EVERY:
+                # Steps run a column at a time here, so each column is one sample of the time per value
+                transform_step_duration.observe((time.perf_counter() - start) / len(rows), transform_type)
+
+        targets.append(target_field)
+        output_columns.append(column)
+
+    if not targets:
+        return [{} for _ in rows], {}
+
+    # Pivot back to one dict per row
+    if has_missing:
+        outputs = [
+            {target: value for target, value in zip(targets, values) if value is not _MISSING}
+            for values in zip(*output_columns)
+        ]
+        return outputs, None
+
+    outputs = list(map(dict, map(zip, repeat(targets), zip(*output_columns))))
+    # Later mappings to the same target win, as with dict assignment in the row engine
+    columns = {}
+    for target, column in zip(targets, output_columns):
+        columns[target] = column
+    return outputs, columns
+
+def _apply_column(column: List[Any], types: Set[type], rows: List[Dict[str, Any]], target_field: str,
+                  transform_type: str, step: TransformStep, kernel: Optional[ColumnKernel]) -> List[Any]:
+    if kernel is not None and _MissingType not in types:
+        try:
+            return kernel(column, types)
+        except _ValueErrors as e:
+            for value, error in zip(column, e.errors):
+                if error is not None:
+                    diagnostics.record_error(transform_type, target_field, value, error)
+            return e.output
+        except Exception:
+            pass
+
+    # Value-by-value fallback with the same error handling as the row engine
+    output = []
+    append = output.append
+    for value, record in zip(column, rows):
+        if value is _MISSING:
+            append(value)
+            continue
+        try:
+            append(step(value, record))
+        except Exception as e:
+            diagnostics.record_error(transform_type, target_field, value, e)
+            append(value)
+    return output
+
+class _ValueErrors(Exception):
+    """Raised by a kernel that converted a column except for some values, which are kept unchanged"""
+    def __init__(self, output: List[Any], errors: List[Optional[Exception]]):
+        super().__init__(f"{sum(error is not None for error in errors)} values failed")
+        self.output = output
+        self.errors = errors
+
+def _require_str(types: Set[type]) -> None:
+    if not types <= _STR_ONLY:
+        raise TypeError("column is not all strings")
+
+# Kernel builders: each receives the rule params once and returns a ColumnKernel or None
+_KERNEL_BUILDERS: Dict[str, Callable[[Dict[str, Any]], Optional[ColumnKernel]]] = {}
+
+def _kernel_builder(transform_type: str):
+    def register(builder):
+        _KERNEL_BUILDERS[transform_type] = builder
+        return builder
+    return register
+
+# Pure per-value transformations whose cost is worth paying once per distinct value
+_DISTINCT_VALUE_TYPES = {"format_date"}
+
+def _distinct_value_kernel(step: TransformStep) -> ColumnKernel:
+    """Apply a row step once per distinct string in the column (dates repeat heavily)"""
+    def kernel(column, types):
+        _require_str(types)
+        converted = {value: step(value, None) for value in set(column)}
+        return list(map(converted.__getitem__, column))
+    return kernel
+
+@_kernel_builder("regex")
+def _regex_kernel(params: Dict[str, Any]) -> ColumnKernel:
+    extract = BoundedRegex.from_params(params).extract
+
+    def kernel(column, types):
+        _require_str(types)
+        converted = {}
+        failed = {}
+        for value in set(column):
+            try:
+                converted[value] = extract(value)
+            except RegexTimeout as e:
+                converted[value] = value
+                failed[value] = e
+        output = list(map(converted.__getitem__, column))
+        if failed:
+            # Searched once per distinct value, but reported for each record like the row engine
+            raise _ValueErrors(output, [failed.get(value) for value in column])
+        return output
+    return kernel
+
+def _slice_kernel(bounds: slice) -> ColumnKernel:
+    take = itemgetter(bounds)
+
+    def kernel(column, types):
+        _require_str(types)
+        return list(map(take, column))
+    return kernel
+
+@_kernel_builder("left")
+def _left_kernel(params: Dict[str, Any]) -> ColumnKernel:
+    return _slice_kernel(slice(None, int(params.get("count", 0))))
+
+@_kernel_builder("right")
+def _right_kernel(params: Dict[str, Any]) -> ColumnKernel:
+    count = int(params.get("count", 0))
+    if count <= 0:
+        return lambda column, types: column
+    return _slice_kernel(slice(-count, None))
+
+@_kernel_builder("substring")
+def _substring_kernel(params: Dict[str, Any]) -> ColumnKernel:
+    start_pos = int(params.get("startPosition", 0))
+    return _slice_kernel(slice(start_pos, start_pos + int(params.get("length", 0))))
+
+@_kernel_builder("case")
+def _case_kernel(params: Dict[str, Any]) -> Optional[ColumnKernel]:
+    convert = {"upper": str.upper, "lower": str.lower, "title": str.title}.get(params.get("caseType", "").lower())
+    if convert is None:
+        return lambda column, types: column
+
+    def kernel(column, types):
+        _require_str(types)
+        return list(map(convert, column))
+    return kernel
+
+@_kernel_builder("replace")
+def _replace_kernel(params: Dict[str, Any]) -> Optional[ColumnKernel]:
+    find_str = params.get("find", "")
+    replace_str = params.get("replace", "")
+    if not isinstance(find_str, str) or not isinstance(replace_str, str):
+        return None
+    count = -1 if params.get("replaceAll", False) else 1
+
+    def kernel(column, types):
+        _require_str(types)
+        return list(map(str.replace, column, repeat(find_str), repeat(replace_str), repeat(count)))
+    return kernel
+
+@_kernel_builder("split")
+def _split_kernel(params: Dict[str, Any]) -> Optional[ColumnKernel]:
+    delimiter = params.get("delimiter", ",")
+    index = params.get("index", 0)
+    if not isinstance(index, int) or not isinstance(delimiter, str) or not delimiter:
+        return None
+
+    def kernel(column, types):
+        _require_str(types)
+        return [
+            parts[index] if index < len(parts) else value
+            for parts, value in zip(map(str.split, column, repeat(delimiter)), column)
+        ] if index >= 0 else column
+    return kernel
+
+@_kernel_builder("enum_map")
+def _enum_map_kernel(params: Dict[str, Any]) -> ColumnKernel:
+    inline = params.get("mapping", {})
+    table_id = params.get("table")
+    if not table_id:
+        lookup = inline.get
+
+        def kernel(column, types):
+            return list(map(lookup, column, column))
+        return kernel
+
+    table = lookup_index.table(str(table_id))
+
+    def kernel(column, types):
+        # Other types may match a table key by their text; the row step handles that
+        _require_str(types)
+        entries = table.entries
+        if entries is None:
+            raise LookupError(f"Lookup table {table_id} is not loaded")
+        mapped = list(map(entries.get, column, column))
+        if inline:
+            mapped = [inline.get(value, table_value) for value, table_value in zip(column, mapped)]
+        return mapped
+    return kernel
+
+@_kernel_builder("lookup")
+def _lookup_kernel(params: Dict[str, Any]) -> Optional[ColumnKernel]:
+    table_id = params.get("table")
+    if not table_id:
+        return None
+    table = lookup_index.table(str(table_id))
+    has_default = "default" in params
+    default = params.get("default", _MISSING)
+    field = params.get("field")
+
+    def kernel(column, types):
+        _require_str(types)
+        entries = table.entries
+        if entries is None:
+            raise LookupError(f"Lookup table {table_id} is not loaded")
+        if field is None:
+            values = list(map(entries.get, column, repeat(default)))
+            # Misses without a default fail row by row, as the row step does
+            if not has_default and any(value is _MISSING for value in values):
+                raise KeyError("value not found in lookup table")
+            return values
+
+        values = []
+        append = values.append
+        for value in column:
+            entry = entries.get(value, _MISSING)
+            if entry is _MISSING:
+                if not has_default:
+                    raise KeyError("value not found in lookup table")
+                append(default)
+            else:
+                append(entry[field])
+        return values
+    return kernel
+
+@_kernel_builder("numeric_format")
+def _numeric_format_kernel(params: Dict[str, Any]) -> ColumnKernel:
+    decimal_places = params.get("decimalPlaces")
+
+    def kernel(column, types):
+        if decimal_places is not None:
+            return list(map(round, map(float, column), repeat(decimal_places)))
+        if types <= _NUMBER_TYPES:
+            return column
+        _require_str(types)
+        return [int(number) if number.is_integer() else number for number in map(float, column)]
+    return kernel
+
+@_kernel_builder("boolean_convert")
+def _boolean_convert_kernel(params: Dict[str, Any]) -> ColumnKernel:
+    true_values = [value.lower() for value in params.get("trueValues", ["true", "yes", "1", "t", "y"])]
+    false_values = [value.lower() for value in params.get("falseValues", ["false", "no", "0", "f", "n"])]
+    # True values win when a value appears in both lists, as in the row engine
+    table = dict.fromkeys(false_values, False)
+    table.update(dict.fromkeys(true_values, True))
+    lookup = table.get
+
+    def kernel(column, types):
+        # Booleans pass through unchanged, which the table cannot express
+        if bool in types:
+            raise TypeError("column contains booleans")
+        return list(map(lookup, map(str.lower, map(str, column)), map(bool, column)))
+    return kernel
@@ -0,0 +1,179 @@
+# backend/app/services/executor_service.py
+from concurrent.futures import Executor, ThreadPoolExecutor, ProcessPoolExecutor
+from collections import Counter
+from typing import Dict, Any, Iterable, List, Optional, Tuple
+import asyncio
+import logging
+import os
+import pickle
+import shutil
+import tempfile
+import time
+from app.models.mapping import MappingConfig
+from app.models.system_model import SystemModel
+from app.services.transform_service import get_compiled_mapping, diagnostics
+from app.services.columnar_service import transform_records
+from app.services.metrics_service import observe_transform
+from app.services.lookup_service import lookup_index, referenced_lookup_tables
+from app.services.memo_service import transform_memo
+from app.services.regex_service import abandoned_searches
+
+logger = logging.getLogger(__name__)
+
+# Where batch transforms run: "inline" (on the event loop), "thread" or "process"
+TRANSFORM_EXECUTOR = os.environ.get("TRANSFORM_EXECUTOR", "thread").lower()
+TRANSFORM_WORKERS = int(os.environ.get("TRANSFORM_WORKERS", str(os.cpu_count() or 1)))
+# Records per chunk handed to a worker; smaller batches are not split
+TRANSFORM_CHUNK_SIZE = int(os.environ.get("TRANSFORM_CHUNK_SIZE", "2000"))
+
+_executor: Optional[Executor] = None
+
+def get_executor() -> Optional[Executor]:
+    """Get the shared transform executor, creating it on first use"""
+    global _executor
+    if TRANSFORM_EXECUTOR == "inline":
+        return None
+    if _executor is None:
+        if TRANSFORM_EXECUTOR == "process":
+            logger.info(f"Starting transform process pool with {TRANSFORM_WORKERS} workers")
+            _executor = ProcessPoolExecutor(max_workers=TRANSFORM_WORKERS)
+        else:
+            logger.info(f"Starting transform thread pool with {TRANSFORM_WORKERS} workers")
+            _executor = ThreadPoolExecutor(max_workers=TRANSFORM_WORKERS, thread_name_prefix="transform")
+    return _executor
+
+def shutdown_executor() -> None:
+    """Stop the transform executor, if one was started"""
+    global _executor
+    if _executor is not None:
+        logger.info("Shutting down transform executor")
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
+    _snapshot_files.clear()
+
+class _SnapshotFiles:
+    """Lookup tables written to disk once per revision, for worker processes to load.
+
+    Chunks carry only (revision, path) for each table they use; a worker reads the
+    file when its own copy of the table is at another revision, so each worker
+    loads each revision once rather than receiving the entries with every chunk.
+    Files stay while a dispatch references them or they hold the loaded revision.
+    """
+
+    def __init__(self):
+        self._directory: Optional[str] = None
+        self._paths: Dict[Tuple[str, int], str] = {}
+        self._in_use: Counter = Counter()
+
+    def acquire(self, table_ids: Iterable[str]) -> Dict[str, Tuple[int, str]]:
+        """(revision, path) of the loaded revision of each table, kept until released"""
+        references = {}
+        for table_id, (revision, entries) in lookup_index.snapshot(table_ids).items():
+            key = (table_id, revision)
+            path = self._paths.get(key)
+            if path is None:
+                path = self._paths[key] = self._write(entries)
+            self._in_use[key] += 1
+            references[table_id] = (revision, path)
+        return references
+
+    def release(self, references: Dict[str, Tuple[int, str]]) -> None:
+        for table_id, (revision, _) in references.items():
+            self._in_use[(table_id, revision)] -= 1
+        self._in_use += Counter()  # Drops the keys no longer in use
+
+        # Revisions superseded in this process and no longer needed by any dispatch
+        loaded = lookup_index.revisions()
+        for key in [key for key in self._paths if key not in self._in_use and loaded.get(key[0]) != key[1]]:
+            os.unlink(self._paths.pop(key))
+
+    def clear(self) -> None:
+        if self._directory is not None:
+            shutil.rmtree(self._directory, ignore_errors=True)
+        self._directory = None
+        self._paths.clear()
+        self._in_use.clear()
+
+    def _write(self, entries: Dict[str, Any]) -> str:
+        if self._directory is None:
+            self._directory = tempfile.mkdtemp(prefix="lookup-tables-")
+        descriptor, path = tempfile.mkstemp(dir=self._directory, suffix=".pickle")
+        with os.fdopen(descriptor, "wb") as f:
+            pickle.dump(entries, f, protocol=pickle.HIGHEST_PROTOCOL)
+        return path
+
+_snapshot_files = _SnapshotFiles()
+
+def _install_lookup_tables(references: Dict[str, Tuple[int, str]]) -> None:
+    loaded = lookup_index.revisions()
+    for table_id, (revision, path) in references.items():
+        if loaded.get(table_id) != revision:
+            with open(path, "rb") as f:
+                lookup_index.install(table_id, revision, pickle.load(f))
+
+def _transform_chunk(mapping_config: MappingConfig, system_model: SystemModel, records: List[Any], start_index: int,
+                     lookup_tables: Optional[Dict[str, Tuple[int, str]]] = None, memoize: bool = True) -> List[Dict[str, Any]]:
+    """Transform one chunk of a batch; runs inside a worker thread or process"""
+    # Worker processes have their own lookup index, loaded from the snapshot files named
+    if lookup_tables:
+        _install_lookup_tables(lookup_tables)
+    # Each worker process keeps its own compiled plan cache
+    return transform_records(get_compiled_mapping(mapping_config, system_model), records, start_index, memoize=memoize)
+
+def _transform_chunk_counted(*args: Any) -> Tuple[List[Dict[str, Any]], int]:
+    """_transform_chunk, also returning how many regex searches it abandoned on timeout"""
+    abandoned = abandoned_searches()
+    results = _transform_chunk(*args)
+    return results, abandoned_searches() - abandoned
+
+async def run_batch_transform(mapping_config: MappingConfig, system_model: SystemModel, records: List[Any]) -> List[Dict[str, Any]]:
+    """Transform a batch off the event loop, split into ordered chunks across workers"""
+    start = time.perf_counter()
+    results = await _run_chunks(mapping_config, system_model, records)
+
+    failed = sum(1 for result in results if result["error"] is not None)
+    observe_transform(mapping_config.id, mapping_config.bank_id, "batch", time.perf_counter() - start, len(results) - failed, failed)
+    return results
+
+async def _run_chunks(mapping_config: MappingConfig, system_model: SystemModel, records: List[Any]) -> List[Dict[str, Any]]:
+    executor = get_executor()
+    if executor is None:
+        return _transform_chunk(mapping_config, system_model, records, 0)
+
+    if isinstance(executor, ProcessPoolExecutor):
+        if not transform_memo.enabled or diagnostics.enabled:
+            results, _ = await _dispatch(executor, mapping_config, system_model, records, memoize=False)
+            return results
+        # Worker processes cannot share a memo, so this process serves the records it
+        # has seen and sends only the rest to the workers
+        batch = transform_memo.lookup(get_compiled_mapping(mapping_config, system_model), records)
+        results, abandoned = await _dispatch(executor, mapping_config, system_model, batch.misses, memoize=False) if batch.misses else ([], 0)
+        # Results of a regex search abandoned on timeout depend on timing, so they are not kept
+        return transform_memo.complete(batch, results, 0, store=not abandoned)
+    results, _ = await _dispatch(executor, mapping_config, system_model, records)
+    return results
+
+async def _dispatch(executor: Executor, mapping_config: MappingConfig, system_model: SystemModel, records: List[Any],
+                    memoize: bool = True) -> Tuple[List[Dict[str, Any]], int]:
+    """Results in input order, and how many regex searches the workers abandoned on timeout"""
+    lookup_tables = {}
+    if isinstance(executor, ProcessPoolExecutor):
+        lookup_tables = _snapshot_files.acquire(referenced_lookup_tables(mapping_config.mappings))
+
+    try:
+        loop = asyncio.get_running_loop()
+        chunk_size = max(TRANSFORM_CHUNK_SIZE, 1)
+        futures = [
+            loop.run_in_executor(executor, _transform_chunk_counted, mapping_config, system_model, records[start:start + chunk_size], start, lookup_tables, memoize)
+            for start in range(0, len(records), chunk_size)
+        ]
+
+        # gather keeps chunk order, so results come back in input order
+        results = []
+        abandoned = 0
+        for chunk_results, chunk_abandoned in await asyncio.gather(*futures):
+            results.extend(chunk_results)
+            abandoned += chunk_abandoned
+        return results, abandoned
+    finally:
+        _snapshot_files.release(lookup_tables)
@@ -0,0 +1,96 @@
+# backend/app/services/fanout_service.py
+from typing import Dict, Any, List, Optional
+import asyncio
+import logging
+import time
+from app.db.repositories import mapping_repository, system_model_repository
+from app.models.mapping import MappingConfig
+from app.services.transform_service import get_compiled_mapping
+from app.services.validation_service import error_message
+from app.services.metrics_service import observe_transform, count_validation_failures
+
+logger = logging.getLogger(__name__)
+
+async def load_configs(bank_id: Optional[str] = None, config_ids: Optional[List[str]] = None) -> Dict[str, Any]:
+    """Load the selected mapping configurations and their system models.
+
+    System models are fetched concurrently, once per distinct model however many
+    configurations share it. Unknown configuration IDs are reported as missing.
+    """
+    if config_ids is not None:
+        found = await mapping_repository.get_many(config_ids)
+        configs = [found[config_id] for config_id in dict.fromkeys(config_ids) if config_id in found]
+        missing = [config_id for config_id in dict.fromkeys(config_ids) if config_id not in found]
+    else:
+        configs = sorted(await mapping_repository.get_all(bank_id=bank_id), key=lambda config: config.name)
+        missing = []
+
+    model_ids = list(dict.fromkeys(config.system_model_id for config in configs))
+    models = await asyncio.gather(*(system_model_repository.get_by_id(model_id) for model_id in model_ids))
+    return {
+        "configs": configs,
+        "system_models": {model_id: model for model_id, model in zip(model_ids, models) if model is not None},
+        "missing_config_ids": missing
+    }
+
+def run_fanout_test(payload: Dict[str, Any], configs: List[MappingConfig], system_models: Dict[str, Any]) -> Dict[str, Any]:
+    """Transform one payload with every configuration, side by side.
+
+    Each configuration gets a result entry with its mapped output, validation
+    issues, error and timing; the matrix lists every target field with its value
+    under each configuration (None where a configuration does not produce the field).
+    """
+    results = []
+    for config in configs:
+        entry = {
+            "config_id": config.id,
+            "config_name": config.name,
+            "bank_id": config.bank_id,
+            "system_model_id": config.system_model_id,
+            "output": None,
+            "error": None,
+            "issues": [],
+            "duration_ms": 0.0
+        }
+        system_model = system_models.get(config.system_model_id)
+        if system_model is None:
+            entry["error"] = "Referenced system model not found"
+            results.append(entry)
+            continue
+
+        start = time.perf_counter()
+        try:
+            # Keep the mapped values even when validation fails, so configurations can be compared
+            compiled = get_compiled_mapping(config, system_model)
+            entry["output"] = compiled.map_fields(payload)
+            issues = compiled.validator.check(entry["output"])
+            if issues:
+                count_validation_failures(compiled.validator.model_id, issues)
+                entry["issues"] = [issue._asdict() for issue in issues]
+            entry["error"] = error_message(issues)
+        except Exception as e:
+            entry["error"] = str(e)
+        succeeded = entry["error"] is None
+        elapsed = time.perf_counter() - start
+        entry["duration_ms"] = elapsed * 1000
+        observe_transform(config.id, config.bank_id, "test", elapsed, int(succeeded), int(not succeeded))
+        results.append(entry)
+
+    target_fields = list(dict.fromkeys(mapping.target_field for config in configs for mapping in config.mappings))
+    matrix = [
+        {
+            "target_field": target_field,
+            "values": [result["output"].get(target_field) if result["output"] is not None else None for result in results]
+        }
+        for target_field in target_fields
+    ]
+
+    failed = sum(1 for result in results if result["error"] is not None)
+    return {
+        "total": len(results),
+        "succeeded": len(results) - failed,
+        "failed": failed,
+        "config_ids": [result["config_id"] for result in results],
+        "results": results,
+        "matrix": matrix
+    }
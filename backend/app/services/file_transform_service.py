@@ -0,0 +1,179 @@
+# backend/app/services/file_transform_service.py
+from typing import Dict, Any, Callable, Iterable, Iterator, List, Optional, TextIO, Tuple
+from itertools import islice
+import csv
+import io
+import json
+import time
+from app.services.transform_service import CompiledMapping
+from app.services.columnar_service import transform_records
+from app.services.metrics_service import observe_transform
+from app.services.record_readers import RecordError
+
+# Number of output rows buffered before a chunk is handed to the response
+ROWS_PER_CHUNK = 500
+
+OUTPUT_MEDIA_TYPES = {
+    "csv": "text/csv",
+    "ndjson": "application/x-ndjson"
+}
+
+def stream_transformed_records(records: Iterable[Dict[str, Any]], compiled: CompiledMapping, output_format: str = "ndjson") -> Iterator[str]:
+    """Transform records a chunk at a time and yield the serialized output of each chunk"""
+    if output_format == "csv":
+        return _stream_csv(records, compiled)
+    if output_format == "ndjson":
+        return _stream_ndjson(records, compiled)
+    raise ValueError(f"Unsupported output format: {output_format}")
+
+class _StreamStats:
+    """Outcome counts and busy time of one streamed file, reported when the stream ends"""
+    __slots__ = ("succeeded", "failed", "busy_seconds", "resumed_at")
+
+    def __init__(self):
+        self.succeeded = 0
+        self.failed = 0
+        self.busy_seconds = 0.0
+        self.resumed_at = time.perf_counter()
+
+    def pause(self) -> None:
+        """Stop the clock while the response is sending a chunk"""
+        self.busy_seconds += time.perf_counter() - self.resumed_at
+
+    def resume(self) -> None:
+        self.resumed_at = time.perf_counter()
+
+    def report(self, compiled: CompiledMapping) -> None:
+        observe_transform(compiled.config_id, compiled.bank_id, "file", self.busy_seconds, self.succeeded, self.failed)
+
+def _transformed_rows(records: Iterable[Any], compiled: CompiledMapping, batch_size: int,
+                      should_stop: Optional[Callable[[], bool]] = None) -> Iterator[List[Tuple[int, Optional[Dict[str, Any]], Optional[str]]]]:
+    """(row number, output, error) for each record, a batch at a time.
+
+    Batches go through the batch engine, so they are served from the transform memo
+    when it is enabled and run column-wise when they are large enough. should_stop()
+    is checked once a batch has been read, so it is never asked after the last one.
+    """
+    records = iter(records)
+    row_number = 0
+    while True:
+        batch = list(islice(records, batch_size))
+        if not batch or (should_stop is not None and should_stop()):
+            return
+
+        # Records the reader could not parse keep their row but skip the engine
+        parsed = [record for record in batch if not isinstance(record, RecordError)]
+        results = iter(transform_records(compiled, parsed))
+
+        rows = []
+        for record in batch:
+            row_number += 1
+            if isinstance(record, RecordError):
+                rows.append((row_number, None, record.message))
+            else:
+                result = next(results)
+                rows.append((row_number, result["output"], result["error"]))
+        yield rows
+
+def _stream_ndjson(records: Iterable[Dict[str, Any]], compiled: CompiledMapping) -> Iterator[str]:
+    stats = _StreamStats()
+
+    try:
+        for rows in _transformed_rows(records, compiled, ROWS_PER_CHUNK):
+            lines = []
+            for row_number, output, error in rows:
+                if error is None:
+                    stats.succeeded += 1
+                else:
+                    stats.failed += 1
+                lines.append(json.dumps({"row": row_number, "output": output, "error": error}, default=str))
+
+            stats.pause()
+            yield "\n".join(lines) + "\n"
+            stats.resume()
+        stats.pause()
+    finally:
+        stats.report(compiled)
+
+def _stream_csv(records: Iterable[Dict[str, Any]], compiled: CompiledMapping) -> Iterator[str]:
+    target_fields = compiled.target_fields
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(["row"] + target_fields + ["error"])
+    stats = _StreamStats()
+
+    try:
+        for rows in _transformed_rows(records, compiled, ROWS_PER_CHUNK):
+            for row_number, output, error in rows:
+                if error is None:
+                    writer.writerow([row_number] + [output.get(field, "") for field in target_fields] + [""])
+                    stats.succeeded += 1
+                else:
+                    writer.writerow([row_number] + [""] * len(target_fields) + [error])
+                    stats.failed += 1
+
+            stats.pause()
+            yield buffer.getvalue()
+            stats.resume()
+            buffer.seek(0)
+            buffer.truncate()
+
+        stats.pause()
+        # The header alone, for an empty file
+        if buffer.tell():
+            yield buffer.getvalue()
+    finally:
+        stats.report(compiled)
+
+def write_transformed_records(records: Iterable[Any], compiled: CompiledMapping, output_format: str, out: TextIO,
+                              batch_size: int = 5000, on_batch: Optional[Callable[[int, int], None]] = None,
+                              should_stop: Optional[Callable[[], bool]] = None) -> Tuple[int, int, bool]:
+    """Transform records batch by batch into a text file, in the same layout as the streamed output.
+
+    Batches go through the batch engine (columnar for large batches). on_batch(succeeded, failed)
+    is called after each batch; should_stop() is checked before each batch is transformed and
+    stops the run early when it returns True. Returns the total succeeded and failed counts,
+    and whether every record was written (False only if the run was stopped early).
+    """
+    if output_format not in OUTPUT_MEDIA_TYPES:
+        raise ValueError(f"Unsupported output format: {output_format}")
+
+    target_fields = compiled.target_fields
+    writer = None
+    if output_format == "csv":
+        writer = csv.writer(out)
+        writer.writerow(["row"] + target_fields + ["error"])
+
+    stopped = False
+
+    def stop_requested() -> bool:
+        nonlocal stopped
+        stopped = should_stop is not None and should_stop()
+        return stopped
+
+    total_succeeded = total_failed = 0
+    for rows in _transformed_rows(records, compiled, batch_size, stop_requested):
+        succeeded = failed = 0
+        lines = []
+        for row_number, output, error in rows:
+            if error is None:
+                succeeded += 1
+            else:
+                failed += 1
+
+            if writer is not None:
+                if error is None:
+                    writer.writerow([row_number] + [output.get(field, "") for field in target_fields] + [""])
+                else:
+                    writer.writerow([row_number] + [""] * len(target_fields) + [error])
+            else:
+                lines.append(json.dumps({"row": row_number, "output": output, "error": error}, default=str))
+
+        if lines:
+            out.write("\n".join(lines) + "\n")
+        total_succeeded += succeeded
+        total_failed += failed
+        if on_batch is not None:
+            on_batch(succeeded, failed)
+
+    return total_succeeded, total_failed, not stopped
@@ -0,0 +1,351 @@
+# backend/app/services/job_service.py
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, AsyncIterator, BinaryIO, List, Optional, Set, Tuple
+from datetime import datetime
+import asyncio
+import logging
+import os
+import shutil
+import tempfile
+import threading
+import time
+import uuid
+from app.db.database import db
+from app.db.repositories import job_repository
+from app.models.job import TransformJob, JobStatus
+from app.models.mapping import MappingConfig
+from app.models.system_model import SystemModel
+from app.services.transform_service import get_compiled_mapping
+from app.services.file_transform_service import write_transformed_records
+from app.services.record_readers import open_record_reader
+from app.services.metrics_service import observe_transform
+
+logger = logging.getLogger(__name__)
+
+# Number of jobs transformed at the same time; further jobs wait in the queue
+JOB_WORKERS = int(os.environ.get("JOB_WORKERS", "2"))
+# Records read and transformed per batch inside a job
+JOB_BATCH_SIZE = int(os.environ.get("JOB_BATCH_SIZE", "5000"))
+# Where results are kept: "local" (JOB_DATA_DIR) or "gridfs" (MongoDB backend only)
+JOB_RESULT_STORE = os.environ.get("JOB_RESULT_STORE", "local").lower()
+# Uploads and local results, outside the source tree unless configured; resolved once
+# so it does not depend on the working directory. Point it at persistent storage to
+# keep local results across reboots.
+JOB_DATA_DIR = os.path.abspath(os.environ.get("JOB_DATA_DIR", os.path.join(tempfile.gettempdir(), "data-mapping-jobs")))
+# Seconds between progress writes to the database while a job runs
+JOB_PROGRESS_INTERVAL = float(os.environ.get("JOB_PROGRESS_INTERVAL", "2"))
+
+RESULT_EXTENSIONS = {"csv": ".csv", "ndjson": ".ndjson"}
+
+class LocalResultStore:
+    """Keeps job results as files under JOB_DATA_DIR/results, keyed by file name"""
+    name = "local"
+
+    def __init__(self, directory: str):
+        self.directory = directory
+
+    def _path(self, key: str) -> str:
+        # Only the file name counts, so a key never points outside the directory
+        # (locations saved before keys were file names held a relative path)
+        return os.path.join(self.directory, os.path.basename(key))
+
+    async def save(self, job_id: str, path: str) -> str:
+        # Results are written in place, so there is nothing to move
+        return f"{self.name}:{os.path.basename(path)}"
+
+    async def open(self, key: str) -> AsyncIterator[bytes]:
+        f = open(self._path(key), "rb")
+        return _read_file_chunks(f)
+
+    async def delete(self, key: str) -> None:
+        path = self._path(key)
+        if os.path.exists(path):
+            os.remove(path)
+
+class GridFSResultStore:
+    """Uploads job results to the 'job_results' GridFS bucket"""
+    name = "gridfs"
+
+    @property
+    def bucket(self):
+        from motor.motor_asyncio import AsyncIOMotorGridFSBucket
+        return AsyncIOMotorGridFSBucket(db.db, bucket_name="job_results")
+
+    async def save(self, job_id: str, path: str) -> str:
+        with open(path, "rb") as f:
+            file_id = await self.bucket.upload_from_stream(os.path.basename(path), f, metadata={"job_id": job_id})
+        os.remove(path)
+        return f"{self.name}:{file_id}"
+
+    async def open(self, key: str) -> AsyncIterator[bytes]:
+        from bson import ObjectId
+        stream = await self.bucket.open_download_stream(ObjectId(key))
+        return _read_grid_chunks(stream)
+
+    async def delete(self, key: str) -> None:
+        from bson import ObjectId
+        await self.bucket.delete(ObjectId(key))
+
+async def _read_file_chunks(f: BinaryIO) -> AsyncIterator[bytes]:
+    loop = asyncio.get_running_loop()
+    try:
+        while True:
+            chunk = await loop.run_in_executor(None, f.read, 1024 * 1024)
+            if not chunk:
+                break
+            yield chunk
+    finally:
+        f.close()
+
+async def _read_grid_chunks(stream) -> AsyncIterator[bytes]:
+    while True:
+        chunk = await stream.readchunk()
+        if not chunk:
+            break
+        yield chunk
+
+RESULT_STORES = {store.name: store for store in (LocalResultStore(os.path.join(JOB_DATA_DIR, "results")), GridFSResultStore())}
+
+def get_result_store():
+    """The store new results are written to"""
+    store = RESULT_STORES.get(JOB_RESULT_STORE)
+    if store is None:
+        raise ValueError(f"Unknown job result store: {JOB_RESULT_STORE}")
+    if store.name == "gridfs" and db.backend is not None and db.backend.name != "mongodb":
+        logger.warning("GridFS needs the mongodb storage backend; keeping job results on local disk")
+        return RESULT_STORES["local"]
+    return store
+
+def _split_location(location: str):
+    store_name, _, key = location.partition(":")
+    store = RESULT_STORES.get(store_name)
+    if store is None:
+        raise ValueError(f"Unknown result location: {location}")
+    return store, key
+
+class _ActiveJob:
+    """In-process state of a queued or running job"""
+    __slots__ = ("job", "cancel_event", "last_save")
+
+    def __init__(self, job: TransformJob):
+        self.job = job
+        self.cancel_event = threading.Event()
+        # Latest progress write scheduled from the worker thread
+        self.last_save: Optional[Future] = None
+
+class JobManager:
+    """Runs bulk transform jobs on a bounded worker pool and tracks their progress"""
+
+    def __init__(self, workers: int = JOB_WORKERS, data_dir: str = JOB_DATA_DIR):
+        self.workers = max(workers, 1)
+        self.data_dir = data_dir
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._active: Dict[str, _ActiveJob] = {}
+        self._tasks: Set[asyncio.Task] = set()
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            logger.info(f"Starting job pool with {self.workers} workers")
+            self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="transform-job")
+        return self._executor
+
+    def _path(self, kind: str, filename: str) -> str:
+        directory = os.path.join(self.data_dir, kind)
+        os.makedirs(directory, exist_ok=True)
+        return os.path.join(directory, filename)
+
+    async def submit(self, mapping_config: MappingConfig, system_model: SystemModel, upload: BinaryIO, filename: str,
+                     input_format: str, output_format: str, encoding: str = "utf-8", delimiter: str = ",") -> TransformJob:
+        """Queue a job for an uploaded file; the upload is copied to disk first"""
+        job = TransformJob(
+            id=str(uuid.uuid4()),
+            config_id=mapping_config.id,
+            bank_id=mapping_config.bank_id,
+            filename=filename,
+            input_format=input_format,
+            output_format=output_format,
+            created_at=datetime.now()
+        )
+
+        # The request's upload goes away with the request
+        input_path = self._path("inputs", job.id)
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, _copy_upload, upload, input_path)
+
+        await job_repository.create(job)
+        active = self._active[job.id] = _ActiveJob(job)
+
+        task = asyncio.create_task(self._run(active, mapping_config, system_model, input_path, encoding, delimiter))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        logger.info(f"Queued job {job.id} for config {mapping_config.id} ({filename})")
+        return job
+
+    async def get(self, job_id: str) -> Optional[TransformJob]:
+        """Current state of a job, live while it runs"""
+        active = self._active.get(job_id)
+        if active is not None:
+            return active.job
+        return await job_repository.get_by_id(job_id)
+
+    async def list(self, limit: int = 50, status: Optional[str] = None) -> List[TransformJob]:
+        """Recent jobs, with live progress for the ones running in this process"""
+        jobs = await job_repository.get_recent(limit, status)
+        return [self._active[job.id].job if job.id in self._active else job for job in jobs]
+
+    def cancel(self, job_id: str) -> Optional[TransformJob]:
+        """Ask a queued or running job to stop; returns None if it is not active here"""
+        active = self._active.get(job_id)
+        if active is None:
+            return None
+        active.job.cancel_requested = True
+        active.cancel_event.set()
+        logger.info(f"Cancellation requested for job {job_id}")
+        return active.job
+
+    def is_active(self, job_id: str) -> bool:
+        return job_id in self._active
+
+    async def open_result(self, job: TransformJob) -> AsyncIterator[bytes]:
+        """Open a finished job's output as a stream of chunks; raises if it is gone"""
+        store, key = _split_location(job.result_location)
+        return await store.open(key)
+
+    async def delete(self, job: TransformJob) -> None:
+        """Delete a finished job and its stored output"""
+        if job.result_location:
+            store, key = _split_location(job.result_location)
+            await store.delete(key)
+        await job_repository.delete(job.id)
+
+    async def recover(self) -> None:
+        """Mark jobs left queued or running by a previous process as failed, and remove their files"""
+        for job in await job_repository.get_unfinished():
+            if job.id in self._active:
+                continue
+            _remove(os.path.join(self.data_dir, "inputs", job.id))
+            _remove(os.path.join(self.data_dir, "results", job.id + RESULT_EXTENSIONS.get(job.output_format, "") + ".part"))
+            job.status = JobStatus.FAILED.value
+            job.error = "Interrupted by a server restart"
+            job.finished_at = datetime.now()
+            await job_repository.save(job)
+            logger.warning(f"Marked interrupted job {job.id} as failed")
+
+    def shutdown(self) -> None:
+        """Stop running jobs and the worker pool"""
+        for active in self._active.values():
+            active.cancel_event.set()
+        if self._executor is not None:
+            logger.info("Shutting down job pool")
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    async def _run(self, active: _ActiveJob, mapping_config: MappingConfig, system_model: SystemModel,
+                   input_path: str, encoding: str, delimiter: str) -> None:
+        job = active.job
+        result_path = self._path("results", job.id + RESULT_EXTENSIONS.get(job.output_format, ""))
+        partial_path = result_path + ".part"
+        loop = asyncio.get_running_loop()
+        try:
+            busy_seconds, completed = await loop.run_in_executor(
+                self._get_executor(), self._execute, active, mapping_config, system_model,
+                input_path, partial_path, encoding, delimiter, loop
+            )
+
+            # A cancel that arrives once every row is written leaves the result in place
+            if not completed:
+                job.status = JobStatus.CANCELLED.value
+                _remove(partial_path)
+            else:
+                os.replace(partial_path, result_path)
+                job.result_size = os.path.getsize(result_path)
+                job.result_location = await get_result_store().save(job.id, result_path)
+                job.status = JobStatus.COMPLETED.value
+
+            if busy_seconds is not None:
+                observe_transform(job.config_id, job.bank_id, "job", busy_seconds, job.rows_done - job.rows_failed, job.rows_failed)
+        except Exception as e:
+            logger.error(f"Job {job.id} failed: {str(e)}")
+            job.status = JobStatus.FAILED.value
+            job.error = str(e)
+            _remove(partial_path)
+        finally:
+            job.finished_at = datetime.now()
+            _remove(input_path)
+            # Let a progress write from the worker land before the final state
+            if active.last_save is not None:
+                try:
+                    await asyncio.wrap_future(active.last_save)
+                except Exception:
+                    pass
+            try:
+                await job_repository.save(job)
+            except Exception as e:
+                logger.error(f"Failed to save job {job.id}: {str(e)}")
+            self._active.pop(job.id, None)
+            logger.info(f"Job {job.id} {job.status}: {job.rows_done} rows, {job.rows_failed} failed")
+
+    def _execute(self, active: _ActiveJob, mapping_config: MappingConfig, system_model: SystemModel,
+                 input_path: str, output_path: str, encoding: str, delimiter: str,
+                 loop: asyncio.AbstractEventLoop) -> Tuple[Optional[float], bool]:
+        """Transform the input file into the output file; runs on a worker thread.
+
+        Returns the busy time (None if the job was cancelled before it started) and
+        whether the whole input was transformed.
+        """
+        job = active.job
+        if active.cancel_event.is_set():
+            return None, False
+
+        job.status = JobStatus.RUNNING.value
+        job.started_at = datetime.now()
+        self._save_from_worker(active, loop)
+
+        start = time.perf_counter()
+        last_save = start
+
+        def on_batch(succeeded: int, failed: int) -> None:
+            nonlocal last_save
+            now = time.perf_counter()
+            job.rows_done += succeeded + failed
+            job.rows_failed += failed
+            job.rows_per_sec = job.rows_done / (now - start) if now > start else 0.0
+            if now - last_save >= JOB_PROGRESS_INTERVAL:
+                last_save = now
+                self._save_from_worker(active, loop)
+
+        compiled = get_compiled_mapping(mapping_config, system_model)
+        with open(input_path, "rb") as source, open(output_path, "w", encoding="utf-8", newline="") as out:
+            records = open_record_reader(
+                job.input_format, source, encoding=encoding, delimiter=delimiter,
+                source_fields=mapping_config.source_fields
+            )
+            try:
+                _, _, completed = write_transformed_records(
+                    records, compiled, job.output_format, out,
+                    batch_size=JOB_BATCH_SIZE, on_batch=on_batch, should_stop=active.cancel_event.is_set
+                )
+            finally:
+                # A cancelled job leaves the reader part-way; finish it while its stream is open
+                records.close()
+        return time.perf_counter() - start, completed
+
+    @staticmethod
+    def _save_from_worker(active: _ActiveJob, loop: asyncio.AbstractEventLoop) -> None:
+        """Persist a snapshot of the job from the worker thread, skipping if a write is in flight"""
+        if active.last_save is not None and not active.last_save.done():
+            return
+        active.last_save = asyncio.run_coroutine_threadsafe(job_repository.save(active.job.copy()), loop)
+
+def _copy_upload(upload: BinaryIO, path: str) -> None:
+    upload.seek(0)
+    with open(path, "wb") as f:
+        shutil.copyfileobj(upload, f, 1024 * 1024)
+
+def _remove(path: str) -> None:
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+job_manager = JobManager()
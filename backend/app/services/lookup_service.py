@@ -0,0 +1,159 @@
+# backend/app/services/lookup_service.py
+from typing import Dict, Any, Iterable, List, Optional, Set, Tuple
+import asyncio
+import logging
+import os
+import threading
+from app.models.mapping import pipeline_rules
+from app.services.metrics_service import metrics
+
+logger = logging.getLogger(__name__)
+
+# Seconds between checks for lookup tables changed by other processes
+LOOKUP_REFRESH_SECONDS = float(os.environ.get("LOOKUP_REFRESH_SECONDS", "60"))
+
+# Transformation types whose 'table' param names a lookup table
+LOOKUP_TRANSFORMATION_TYPES = ("enum_map", "lookup")
+
+class LoadedTable:
+    """A lookup table in the index.
+
+    Compiled steps hold on to this object rather than to the entries, so a reload
+    swaps the entries under every compiled mapping without recompiling them.
+    entries is None until the table is loaded (or after it is deleted).
+    """
+    __slots__ = ("table_id", "revision", "entries")
+
+    def __init__(self, table_id: str):
+        self.table_id = table_id
+        self.revision: Optional[int] = None
+        self.entries: Optional[Dict[str, Any]] = None
+
+class LookupIndex:
+    """Process-wide hash index of lookup tables, keyed by table ID"""
+
+    def __init__(self):
+        self._tables: Dict[str, LoadedTable] = {}
+        self._lock = threading.Lock()
+        self.loads = 0
+        # Bumped whenever any table's entries change, so results derived from them can be invalidated
+        self.generation = 0
+
+    def table(self, table_id: str) -> LoadedTable:
+        """The index slot for a table, created empty if the table is not loaded yet"""
+        loaded = self._tables.get(table_id)
+        if loaded is None:
+            with self._lock:
+                loaded = self._tables.setdefault(table_id, LoadedTable(table_id))
+        return loaded
+
+    def install(self, table_id: str, revision: int, entries: Dict[str, Any]) -> None:
+        """Load (or replace) a table's entries"""
+        loaded = self.table(table_id)
+        if loaded.revision == revision and loaded.entries is not None:
+            return
+        # Readers see either the old or the new entries, never a mix
+        loaded.entries = entries
+        loaded.revision = revision
+        self.loads += 1
+        self.generation += 1
+        logger.info(f"Loaded lookup table {table_id} revision {revision} ({len(entries)} entries)")
+
+    def apply_changes(self, table_id: str, base_revision: int, revision: int,
+                      set_entries: Dict[str, Any], remove_keys: Iterable[str]) -> bool:
+        """Apply entry changes on top of the loaded base revision.
+
+        Returns False (changing nothing) if the table is not loaded at that revision,
+        in which case it has to be reloaded instead.
+        """
+        loaded = self.table(table_id)
+        if loaded.entries is None or loaded.revision != base_revision:
+            return False
+        # Changed on a copy, so readers see either the old or the new entries, never a mix
+        entries = dict(loaded.entries)
+        entries.update(set_entries)
+        for key in remove_keys:
+            entries.pop(key, None)
+        self.install(table_id, revision, entries)
+        return True
+
+    def drop(self, table_id: str) -> None:
+        """Unload a deleted table; steps referencing it fail until it is created again"""
+        loaded = self._tables.get(table_id)
+        if loaded is not None:
+            loaded.entries = None
+            loaded.revision = None
+            self.generation += 1
+
+    def revisions(self) -> Dict[str, int]:
+        """Revision of every loaded table"""
+        return {table_id: loaded.revision for table_id, loaded in list(self._tables.items()) if loaded.entries is not None}
+
+    def snapshot(self, table_ids: Iterable[str]) -> Dict[str, Tuple[int, Dict[str, Any]]]:
+        """(revision, entries) of the given loaded tables, e.g. to hand to a worker process"""
+        snapshot = {}
+        for table_id in table_ids:
+            loaded = self._tables.get(table_id)
+            if loaded is not None and loaded.entries is not None:
+                snapshot[table_id] = (loaded.revision, loaded.entries)
+        return snapshot
+
+    def stats(self) -> List[Dict[str, Any]]:
+        """Loaded tables with their revision and size"""
+        return [
+            {"id": table_id, "revision": loaded.revision, "entries": len(loaded.entries) if loaded.entries is not None else 0, "loaded": loaded.entries is not None}
+            for table_id, loaded in sorted(self._tables.items())
+        ]
+
+lookup_index = LookupIndex()
+
+def referenced_lookup_tables(mappings: Iterable[Any]) -> Set[str]:
+    """IDs of the lookup tables referenced by field mappings (models or plain dicts)"""
+    table_ids = set()
+    for mapping in mappings:
+        for rule_type, params in pipeline_rules(mapping):
+            if rule_type in LOOKUP_TRANSFORMATION_TYPES and isinstance(params, dict) and params.get("table"):
+                table_ids.add(str(params["table"]))
+    return table_ids
+
+async def load_lookup_tables(table_ids: Optional[Iterable[str]] = None) -> int:
+    """Load tables into the index whose stored revision differs from the loaded one.
+
+    Loads every table when no IDs are given. Returns the number of tables loaded.
+    """
+    # Imported here so the transform engine can use the index without the database layer
+    from app.db.repositories import lookup_table_repository
+
+    stored = await lookup_table_repository.get_revisions(list(table_ids) if table_ids is not None else None)
+    loaded_revisions = lookup_index.revisions()
+    loaded = 0
+    for table_id, revision in stored.items():
+        if loaded_revisions.get(table_id) == revision:
+            continue
+        table = await lookup_table_repository.get_by_id(table_id)
+        if table is not None:
+            lookup_index.install(table.id, table.revision, table.entries)
+            loaded += 1
+
+    # Tables deleted elsewhere
+    if table_ids is None:
+        for table_id in set(loaded_revisions) - set(stored):
+            lookup_index.drop(table_id)
+    return loaded
+
+async def refresh_lookup_tables_periodically(interval: float = LOOKUP_REFRESH_SECONDS) -> None:
+    """Pick up tables changed by other processes; runs until cancelled"""
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            await load_lookup_tables()
+        except Exception as e:
+            logger.error(f"Failed to refresh lookup tables: {str(e)}")
+
+def _collect_index_stats(key: str):
+    def read():
+        return [((table["id"],), table[key]) for table in lookup_index.stats() if table["loaded"]]
+    return read
+
+metrics.callback("lookup_table_entries", "Entries in each loaded lookup table", ("table",), _collect_index_stats("entries"), "gauge")
+metrics.callback("lookup_table_revision", "Loaded revision of each lookup table", ("table",), _collect_index_stats("revision"), "gauge")
@@ -0,0 +1,222 @@
+# backend/app/services/memo_service.py
+from typing import Dict, Any, Callable, Hashable, List, Optional, Tuple
+from collections import OrderedDict
+import hashlib
+import json
+import logging
+import os
+import sys
+import threading
+from app.services.lookup_service import lookup_index
+from app.services.metrics_service import metrics
+from app.services.regex_service import abandoned_searches
+
+try:
+    import orjson
+except ImportError:  # Standard library fallback
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+# Memory budget for memoized record results in megabytes; 0 disables the memo
+TRANSFORM_MEMO_MAX_MB = float(os.environ.get("TRANSFORM_MEMO_MAX_MB", "0"))
+
+# Rough per-entry cost beyond the output itself: key tuple, digest, LRU node and result tuple
+_ENTRY_OVERHEAD = 240
+
+def _tagged(value: Any) -> Any:
+    # Values without a JSON form keep their type in the hash, so they never collide with their text
+    return [type(value).__name__, str(value)]
+
+def record_digest(record: Dict[str, Any]) -> Optional[bytes]:
+    """Stable hash of a source record, independent of key order; None if it cannot be serialized"""
+    try:
+        if orjson is not None:
+            data = orjson.dumps(record, default=_tagged, option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME)
+        else:
+            data = json.dumps(record, default=_tagged, sort_keys=True, separators=(",", ":")).encode()
+    except (TypeError, ValueError):
+        # e.g. integers beyond 64 bits for orjson, or mixed key types for json
+        return None
+    return hashlib.blake2b(data, digest_size=16).digest()
+
+def _entry_size(output: Optional[Dict[str, Any]], error: Optional[str]) -> int:
+    size = _ENTRY_OVERHEAD
+    if output is not None:
+        # Target field names are shared with the compiled mapping, so only values count
+        size += sys.getsizeof(output) + sum(map(sys.getsizeof, output.values()))
+    if error is not None:
+        size += sys.getsizeof(error)
+    return size
+
+class MemoBatch:
+    """Positions of a batch's records that were found in the memo and that still need transforming"""
+    __slots__ = ("keys", "entries", "first_miss", "miss_positions", "misses")
+
+    def __init__(self):
+        self.keys: List[Optional[tuple]] = []
+        self.entries: List[Optional[Tuple[Optional[Dict[str, Any]], Optional[str]]]] = []
+        self.first_miss: Dict[tuple, int] = {}
+        self.miss_positions: List[int] = []
+        self.misses: List[Any] = []
+
+    def add_hit(self, key: tuple, entry: tuple) -> None:
+        self.keys.append(key)
+        self.entries.append(entry)
+
+    def add_miss(self, position: int, key: Optional[tuple], record: Any) -> None:
+        self.keys.append(key)
+        self.entries.append(None)
+        if key is not None:
+            self.first_miss[key] = position
+        self.miss_positions.append(position)
+        self.misses.append(record)
+
+    def add_repeat(self, key: tuple) -> None:
+        self.keys.append(key)
+        self.entries.append(None)
+
+class TransformMemo:
+    """Bounded LRU memo of whole-record transform results.
+
+    Keys are (configuration ID and version, system model ID and version, lookup
+    index generation, hash of the source record), so editing a configuration, its
+    system model or a lookup table never serves a stale result. Validation errors
+    are memoized too, since they are as deterministic as outputs. Entries are
+    evicted least recently used first once their estimated size exceeds max_bytes.
+
+    Batch transforms, file transforms (streamed and as jobs) and single-record
+    tests go through the memo. The fan-out test does not: it reports the mapped
+    values of records that fail validation, which the memo does not keep.
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[Hashable, Tuple[Optional[Dict[str, Any]], Optional[str], int]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_bytes > 0
+
+    def transform_records(self, compiled: Any, records: List[Any], start_index: int,
+                          transform: Callable[[Any, List[Any], int], List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+        """Per-record results for a batch, running transform only on the records not seen before"""
+        batch = self.lookup(compiled, records)
+        abandoned = abandoned_searches()
+        results = transform(compiled, batch.misses, 0) if batch.misses else []
+        # A regex search abandoned on timeout leaves a result that depends on timing
+        return self.complete(batch, results, start_index, store=abandoned_searches() == abandoned)
+
+    def lookup(self, compiled: Any, records: List[Any]) -> "MemoBatch":
+        """Find the memoized results of a batch; the misses still need transforming.
+
+        Repeats of the same record within the batch are a single miss.
+        """
+        prefix = (
+            compiled.config_id, compiled.config_updated_at,
+            compiled.system_model.id, compiled.system_model.updated_at,
+            lookup_index.generation
+        )
+        # Hashing is the costly part of a lookup; only the dict accesses hold the lock
+        digests = [record_digest(record) if isinstance(record, dict) else None for record in records]
+        batch = MemoBatch()
+        hits = 0
+        with self._lock:
+            for position, (record, digest) in enumerate(zip(records, digests)):
+                if digest is None:
+                    # Rejected by the engine, or not hashable: transformed every time
+                    batch.add_miss(position, None, record)
+                    continue
+                key = (prefix, digest)
+                entry = self._entries.get(key)
+                if entry is not None:
+                    self._entries.move_to_end(key)
+                    batch.add_hit(key, entry[:2])
+                    hits += 1
+                elif key in batch.first_miss:
+                    batch.add_repeat(key)
+                else:
+                    batch.add_miss(position, key, record)
+            self.hits += hits
+            self.misses += len(records) - hits
+        return batch
+
+    def complete(self, batch: "MemoBatch", results: List[Dict[str, Any]], start_index: int,
+                 store: bool = True) -> List[Dict[str, Any]]:
+        """Memoize the results of a batch's misses (unless store is False) and return results for the whole batch"""
+        entries = batch.entries
+        new_entries = []
+        for position, result in zip(batch.miss_positions, results):
+            entries[position] = (result["output"], result["error"])
+            key = batch.keys[position]
+            if key is not None:
+                new_entries.append((key, result["output"], result["error"]))
+        if store:
+            self._store(new_entries)
+
+        output = []
+        for index, (key, entry) in enumerate(zip(batch.keys, entries), start=start_index):
+            if entry is None:
+                # A repeat within the batch: take the result of its first occurrence
+                entry = entries[batch.first_miss[key]]
+            record_output, error = entry
+            # Callers get their own dict, so the memoized one is never modified
+            output.append({"index": index, "output": dict(record_output) if record_output is not None else None, "error": error})
+        return output
+
+    def _store(self, new_entries: List[Tuple[tuple, Optional[Dict[str, Any]], Optional[str]]]) -> None:
+        with self._lock:
+            for key, output, error in new_entries:
+                size = _entry_size(output, error)
+                if size > self.max_bytes:
+                    continue
+                previous = self._entries.pop(key, None)
+                if previous is not None:
+                    self.bytes -= previous[2]
+                self._entries[key] = (dict(output) if output is not None else None, error, size)
+                self.bytes += size
+            while self.bytes > self.max_bytes and self._entries:
+                _, (_, _, size) = self._entries.popitem(last=False)
+                self.bytes -= size
+                self.evictions += 1
+
+    def clear(self) -> None:
+        """Drop every memoized result"""
+        with self._lock:
+            self._entries.clear()
+            self.bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit rate and memory use for monitoring"""
+        lookups = self.hits + self.misses
+        return {
+            "enabled": self.enabled,
+            "entries": len(self._entries),
+            "bytes": self.bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions
+        }
+
+transform_memo = TransformMemo(int(TRANSFORM_MEMO_MAX_MB * 1024 * 1024))
+
+def _collect_memo_stats(key: str):
+    def read():
+        return [((), transform_memo.stats()[key])]
+    return read
+
+for _key, _name, _kind, _documentation in (
+    ("hits", "transform_memo_hits_total", "counter", "Records served from the transform memo"),
+    ("misses", "transform_memo_misses_total", "counter", "Records not found in the transform memo"),
+    ("evictions", "transform_memo_evictions_total", "counter", "Transform memo entries evicted to stay within its memory budget"),
+    ("entries", "transform_memo_entries", "gauge", "Records currently memoized"),
+    ("bytes", "transform_memo_bytes", "gauge", "Estimated memory used by memoized records")
+):
+    metrics.callback(_name, _documentation, (), _collect_memo_stats(_key), _kind)
@@ -0,0 +1,242 @@
+# backend/app/services/metrics_service.py
+from typing import Dict, Any, List, Callable, Iterable, Iterator, Tuple
+from bisect import bisect_left
+from contextlib import contextmanager
+import math
+import threading
+import time
+
+# Latency buckets in seconds, from sub-millisecond API calls to multi-second batch jobs
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+# Single transformation steps take microseconds
+STEP_BUCKETS = (0.000001, 0.0000025, 0.000005, 0.00001, 0.000025, 0.00005, 0.0001, 0.00025, 0.001, 0.01)
+
+CONTENT_TYPE = "text/plain; version=0.0.4"
+
+class Counter:
+    """A monotonically increasing value per label combination"""
+
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Tuple[str, ...] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self._values: Dict[Tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *labelvalues: Any, amount: float = 1) -> None:
+        key = tuple(map(str, labelvalues))
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def samples(self) -> Iterator[Tuple[str, Tuple[Tuple[str, str], ...], float]]:
+        with self._lock:
+            values = list(self._values.items())
+        for key, value in values:
+            yield self.name, tuple(zip(self.labelnames, key)), value
+
+    def reset(self) -> None:
+        with self._lock:
+            self._values.clear()
+
+class Histogram:
+    """Cumulative bucket counts, sum and count per label combination"""
+
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Tuple[str, ...] = (), buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self.buckets = tuple(sorted(buckets))
+        # Per label combination: [per-bucket counts (last one is +Inf), sum]
+        self._values: Dict[Tuple[str, ...], list] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *labelvalues: Any) -> None:
+        key = tuple(map(str, labelvalues))
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            entry = self._values.get(key)
+            if entry is None:
+                entry = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0]
+            entry[0][index] += 1
+            entry[1] += value
+
+    @contextmanager
+    def time(self, *labelvalues: Any):
+        """Observe the duration of the enclosed block"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, *labelvalues)
+
+    def samples(self) -> Iterator[Tuple[str, Tuple[Tuple[str, str], ...], float]]:
+        with self._lock:
+            values = [(key, list(counts), total) for key, (counts, total) in self._values.items()]
+        for key, counts, total in values:
+            labels = tuple(zip(self.labelnames, key))
+            cumulative = 0
+            for bound, count in zip(self.buckets + (math.inf,), counts):
+                cumulative += count
+                yield f"{self.name}_bucket", labels + (("le", _format_bound(bound)),), cumulative
+            yield f"{self.name}_sum", labels, total
+            yield f"{self.name}_count", labels, cumulative
+
+    def reset(self) -> None:
+        with self._lock:
+            self._values.clear()
+
+class CallbackMetric:
+    """Values read from a callback at scrape time, e.g. statistics kept elsewhere"""
+
+    def __init__(self, name: str, documentation: str, labelnames: Tuple[str, ...],
+                 collect: Callable[[], Iterable[Tuple[Tuple[Any, ...], float]]], kind: str = "gauge"):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self.kind = kind
+        self._collect = collect
+
+    def samples(self) -> Iterator[Tuple[str, Tuple[Tuple[str, str], ...], float]]:
+        for labelvalues, value in self._collect():
+            yield self.name, tuple(zip(self.labelnames, map(str, labelvalues))), value
+
+    def reset(self) -> None:
+        pass
+
+class MetricsRegistry:
+    """The set of metrics exposed in the Prometheus text format"""
+
+    def __init__(self):
+        self._metrics: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+
+    def register(self, metric):
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f"Metric {metric.name} is already registered")
+            self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Tuple[str, ...] = ()) -> Counter:
+        return self.register(Counter(name, documentation, labelnames))
+
+    def histogram(self, name: str, documentation: str, labelnames: Tuple[str, ...] = (), buckets: Tuple[float, ...] = DEFAULT_BUCKETS) -> Histogram:
+        return self.register(Histogram(name, documentation, labelnames, buckets))
+
+    def callback(self, name: str, documentation: str, labelnames: Tuple[str, ...], collect: Callable, kind: str = "gauge") -> CallbackMetric:
+        return self.register(CallbackMetric(name, documentation, labelnames, collect, kind))
+
+    def unregister(self, name: str) -> None:
+        with self._lock:
+            self._metrics.pop(name, None)
+
+    def render(self) -> str:
+        """Render every metric in the Prometheus text exposition format"""
+        with self._lock:
+            metrics = list(self._metrics.values())
+
+        lines: List[str] = []
+        for metric in metrics:
+            lines.append(f"# HELP {metric.name} {_escape_help(metric.documentation)}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            for name, labels, value in metric.samples():
+                if labels:
+                    rendered = ",".join(f'{key}="{_escape_label(value_)}"' for key, value_ in labels)
+                    lines.append(f"{name}{{{rendered}}} {_format_value(value)}")
+                else:
+                    lines.append(f"{name} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+    def reset(self) -> None:
+        """Clear every recorded value"""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        for metric in metrics:
+            metric.reset()
+
+def _escape_help(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("\n", "\\n")
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def _format_bound(bound: float) -> str:
+    return "+Inf" if bound == math.inf else repr(float(bound))
+
+def _format_value(value: float) -> str:
+    if isinstance(value, float):
+        if math.isinf(value):
+            return "+Inf" if value > 0 else "-Inf"
+        if math.isnan(value):
+            return "NaN"
+        return repr(value)
+    return str(value)
+
+metrics = MetricsRegistry()
+
+# HTTP
+http_request_duration = metrics.histogram(
+    "http_request_duration_seconds", "HTTP request latency by route template",
+    ("method", "route", "status")
+)
+
+# Transformation
+transform_duration = metrics.histogram(
+    "transform_duration_seconds", "Time spent transforming records per mapping configuration and operation",
+    ("config_id", "bank_id", "operation")
+)
+transformed_records = metrics.counter(
+    "transform_records_total", "Records transformed per mapping configuration",
+    ("config_id", "bank_id", "outcome")
+)
+transform_step_duration = metrics.histogram(
+    "transform_step_duration_seconds", "Time per transformation step by type, sampled (every step while transform diagnostics are enabled)",
+    ("transformation_type",), buckets=STEP_BUCKETS
+)
+
+# Validation
+validation_failures = metrics.counter(
+    "validation_failures_total", "Validation errors per system model field and issue code",
+    ("system_model_id", "field", "code")
+)
+
+# Repositories
+repository_operation_duration = metrics.histogram(
+    "repository_operation_duration_seconds", "Database time per repository operation",
+    ("repository", "operation")
+)
+
+def observe_transform(config_id: str, bank_id: str, operation: str, seconds: float, succeeded: int, failed: int = 0) -> None:
+    """Record the time and record outcomes of one transform call for a mapping configuration"""
+    transform_duration.observe(seconds, config_id, bank_id, operation)
+    if succeeded:
+        transformed_records.inc(config_id, bank_id, "succeeded", amount=succeeded)
+    if failed:
+        transformed_records.inc(config_id, bank_id, "failed", amount=failed)
+
+def count_validation_failures(system_model_id: str, issues) -> None:
+    """Count the error-level issues of one failed validation"""
+    for issue in issues:
+        if issue.severity == "error":
+            validation_failures.inc(system_model_id, issue.field, issue.code)
+
+def register_cache_metrics(caches: Callable[[], Iterable[Any]]) -> None:
+    """Expose repository cache statistics, read from the caches at scrape time"""
+    def collect(key: str):
+        def read():
+            return [((cache.name,), cache.stats()[key]) for cache in caches()]
+        return read
+
+    for key, name, kind, documentation in (
+        ("hits", "repository_cache_hits_total", "counter", "Repository cache hits"),
+        ("misses", "repository_cache_misses_total", "counter", "Repository cache misses"),
+        ("evictions", "repository_cache_evictions_total", "counter", "Repository cache evictions"),
+        ("invalidations", "repository_cache_invalidations_total", "counter", "Repository cache invalidations"),
+        ("size", "repository_cache_size", "gauge", "Entries currently in the repository cache")
+    ):
+        metrics.unregister(name)
+        metrics.callback(name, documentation, ("cache",), collect(key), kind)
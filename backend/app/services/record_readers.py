@@ -0,0 +1,227 @@
+# backend/app/services/record_readers.py
+from typing import Dict, Any, Callable, Iterator, BinaryIO, List, Optional, Tuple
+import csv
+import io
+import json
+import os
+from app.models.system_model import FieldDefinition
+
+# Bytes requested from the upload per read by the line-oriented readers
+READ_CHUNK_SIZE = 64 * 1024
+# Longest line the line-oriented readers accept; longer lines are reported, never buffered whole
+MAX_LINE_BYTES = int(os.environ.get("MAX_LINE_BYTES", str(16 * 1024 * 1024)))
+
+class RecordError:
+    """Stands in for a record the reader could not parse, so the row can be reported"""
+    __slots__ = ("message",)
+
+    def __init__(self, message: str):
+        self.message = message
+
+    def __repr__(self):
+        return f"RecordError({self.message!r})"
+
+# A record reader lazily turns a binary stream into dicts (or RecordErrors) for the mapping engine
+RecordReader = Callable[..., Iterator[Any]]
+
+_READERS: Dict[str, RecordReader] = {}
+
+# Input format guessed from the file extension when none is given
+FORMAT_EXTENSIONS = {
+    ".csv": "csv",
+    ".tsv": "csv",
+    ".txt": "csv",
+    ".ndjson": "ndjson",
+    ".jsonl": "ndjson",
+    ".fix": "fix",
+    ".log": "fix",
+    ".dat": "fixed_width",
+    ".fw": "fixed_width"
+}
+
+def _record_reader(input_format: str):
+    def register(reader):
+        _READERS[input_format] = reader
+        return reader
+    return register
+
+def input_formats() -> List[str]:
+    """Names of the registered input formats"""
+    return list(_READERS)
+
+def detect_input_format(filename: str) -> Optional[str]:
+    """Guess the input format from a file name, or None if the extension is unknown"""
+    return FORMAT_EXTENSIONS.get(os.path.splitext(filename or "")[1].lower())
+
+def open_record_reader(input_format: str, stream: BinaryIO, encoding: str = "utf-8", delimiter: str = ",",
+                       source_fields: Optional[List[FieldDefinition]] = None) -> Iterator[Any]:
+    """Create a lazy record iterator for a stream.
+
+    Raises ValueError straight away if the format is unknown or its options are invalid
+    (e.g. a fixed-width layout without lengths), before any record is read.
+    """
+    reader = _READERS.get(input_format)
+    if reader is None:
+        raise ValueError(f"Unsupported input format: {input_format}")
+    return reader(stream, encoding=encoding, delimiter=delimiter, source_fields=source_fields or [])
+
+@_record_reader("csv")
+def _open_csv(stream: BinaryIO, encoding: str, delimiter: str, source_fields: List[FieldDefinition]) -> Iterator[Dict[str, str]]:
+    return iter_csv_records(stream, encoding=encoding, delimiter=delimiter)
+
+def iter_csv_records(stream: BinaryIO, encoding: str = "utf-8", delimiter: str = ",") -> Iterator[Dict[str, str]]:
+    """Lazily read a binary CSV stream as one dict per row, keyed by the stripped headers"""
+    text_stream = io.TextIOWrapper(stream, encoding=encoding, newline="")
+    try:
+        reader = csv.reader(text_stream, delimiter=delimiter)
+        headers = next(reader, None)
+        if headers is None:
+            return
+        headers = [header.strip() for header in headers]
+
+        for row in reader:
+            # Skip blank lines
+            if not row:
+                continue
+            yield dict(zip(headers, row))
+    finally:
+        # Leave the underlying stream open for its owner to close
+        text_stream.detach()
+
+def _iter_lines(stream: BinaryIO) -> Iterator[Optional[bytes]]:
+    """Yield the lines of a binary stream, reading it in fixed-size chunks.
+
+    A line longer than MAX_LINE_BYTES is yielded as None, and is only buffered up to that length.
+    """
+    pending = bytearray()
+    skipping = False  # Inside a line already known to be too long
+    while True:
+        chunk = stream.read(READ_CHUNK_SIZE)
+        if not chunk:
+            break
+        lines = chunk.split(b"\n")
+        tail = lines.pop()
+        if lines:
+            # The first line continues the one left open by the previous chunk
+            if skipping:
+                lines[0] = None
+                skipping = False
+            elif pending:
+                pending += lines[0]
+                lines[0] = bytes(pending)
+                pending.clear()
+            for line in lines:
+                yield None if line is not None and len(line) > MAX_LINE_BYTES else line
+        if not skipping:
+            pending += tail
+            if len(pending) > MAX_LINE_BYTES:
+                pending.clear()
+                skipping = True
+    if skipping:
+        yield None
+    elif pending:
+        yield bytes(pending)
+
+def _line_too_long(line_number: int) -> RecordError:
+    return RecordError(f"Line {line_number} is longer than {MAX_LINE_BYTES} bytes")
+
+@_record_reader("ndjson")
+def _open_ndjson(stream: BinaryIO, encoding: str, delimiter: str, source_fields: List[FieldDefinition]) -> Iterator[Any]:
+    return iter_ndjson_records(stream, encoding=encoding)
+
+def iter_ndjson_records(stream: BinaryIO, encoding: str = "utf-8") -> Iterator[Any]:
+    """Lazily read newline-delimited JSON, one object per line"""
+    for line_number, line in enumerate(_iter_lines(stream), start=1):
+        if line is None:
+            yield _line_too_long(line_number)
+            continue
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line.decode(encoding))
+        except (ValueError, UnicodeDecodeError) as e:
+            yield RecordError(f"Invalid JSON on line {line_number}: {str(e)}")
+            continue
+        if not isinstance(record, dict):
+            yield RecordError(f"Line {line_number} is not a JSON object")
+            continue
+        yield record
+
+# FIX field separator (SOH); logs often print it as '|' or '^A'
+FIX_SEPARATORS = (b"\x01", b"|", b"^A")
+
+@_record_reader("fix")
+def _open_fix(stream: BinaryIO, encoding: str, delimiter: str, source_fields: List[FieldDefinition]) -> Iterator[Any]:
+    return iter_fix_records(stream, encoding=encoding)
+
+def iter_fix_records(stream: BinaryIO, encoding: str = "utf-8") -> Iterator[Any]:
+    """Lazily read FIX tag=value messages, one per line, keyed by tag number.
+
+    Text before '8=FIX' (log timestamps, session prefixes) is skipped, as are lines
+    without a FIX message. For repeated tags (repeating groups) the last value wins.
+    """
+    for line_number, line in enumerate(_iter_lines(stream), start=1):
+        if line is None:
+            yield _line_too_long(line_number)
+            continue
+        start = line.find(b"8=FIX")
+        if start < 0:
+            continue
+        message = line[start:].rstrip(b"\r")
+
+        separator = next((sep for sep in FIX_SEPARATORS if sep in message), None)
+        fields = message.split(separator) if separator is not None else [message]
+        try:
+            record = {}
+            for field in fields:
+                if not field:
+                    continue
+                tag, equals, value = field.partition(b"=")
+                if not equals or not tag.isdigit():
+                    raise ValueError(f"malformed field {field[:40]!r}")
+                record[tag.decode("ascii")] = value.decode(encoding)
+        except (ValueError, UnicodeDecodeError) as e:
+            yield RecordError(f"Invalid FIX message on line {line_number}: {str(e)}")
+            continue
+        yield record
+
+@_record_reader("fixed_width")
+def _open_fixed_width(stream: BinaryIO, encoding: str, delimiter: str, source_fields: List[FieldDefinition]) -> Iterator[Any]:
+    return iter_fixed_width_records(stream, compile_fixed_width_layout(source_fields), encoding=encoding)
+
+def compile_fixed_width_layout(source_fields: List[FieldDefinition]) -> List[Tuple[str, slice]]:
+    """Build the column slices of a fixed-width layout from source field constraints.
+
+    Each field needs a 'length' constraint; 'position' (0-based) is optional and
+    defaults to the end of the previous field, so fields can simply be listed in order.
+    """
+    layout = []
+    position = 0
+    for field in source_fields:
+        constraints = field.constraints or {}
+        try:
+            length = int(constraints["length"])
+            position = int(constraints.get("position", position))
+        except KeyError:
+            raise ValueError(f"Fixed-width field {field.name} needs a 'length' constraint")
+        except (TypeError, ValueError):
+            raise ValueError(f"Fixed-width field {field.name} has an invalid 'length' or 'position' constraint")
+        if length <= 0 or position < 0:
+            raise ValueError(f"Fixed-width field {field.name} needs a positive length and position")
+        layout.append((field.name, slice(position, position + length)))
+        position += length
+
+    if not layout:
+        raise ValueError("Fixed-width input needs source fields with a 'length' constraint")
+    return layout
+
+def iter_fixed_width_records(stream: BinaryIO, layout: List[Tuple[str, slice]], encoding: str = "utf-8") -> Iterator[Any]:
+    """Lazily read newline-terminated fixed-width records, trimming the padding of each field"""
+    for line_number, line in enumerate(_iter_lines(stream), start=1):
+        if line is None:
+            yield _line_too_long(line_number)
+            continue
+        text = line.decode(encoding, errors="replace").rstrip("\r")
+        if not text.strip():
+            continue
+        yield {name: text[columns].strip() for name, columns in layout}
@@ -0,0 +1,254 @@
+# backend/app/services/regex_service.py
+from typing import Dict, Any, Iterable, List, Optional
+import logging
+import math
+import os
+import re
+import threading
+from app.models.mapping import pipeline_rules
+from app.services.metrics_service import metrics
+
+try:
+    # Optional engine that can abandon a search after a timeout
+    import regex as _timeout_engine
+except ImportError:
+    _timeout_engine = None
+
+try:
+    from re import _parser as _sre_parse
+except ImportError:  # Python < 3.11
+    import sre_parse as _sre_parse
+
+logger = logging.getLogger(__name__)
+
+# Time budget for one search, in milliseconds (overridable per rule with 'timeout_ms')
+REGEX_TIMEOUT_MS = float(os.environ.get("REGEX_TIMEOUT_MS", "50"))
+# Longer values are never searched
+REGEX_MAX_INPUT_LENGTH = int(os.environ.get("REGEX_MAX_INPUT_LENGTH", "10000"))
+
+# Worst-case backtracking steps the standard engine is assumed to take per millisecond;
+# measured rates are 5 to 200 times higher, so a search stays well within its budget
+_STEPS_PER_MS = 20000
+
+regex_budget_exceeded = metrics.counter(
+    "regex_budget_exceeded_total", "Regex searches stopped or not run for their budget, by reason: timeout (abandoned), input_length (value too long for the pattern to search within budget) or unsafe_pattern (nested repeats)",
+    ("reason",)
+)
+
+# Per thread, so a batch can tell whether its own results depend on timing
+_abandoned = threading.local()
+
+def abandoned_searches() -> int:
+    """Searches the current thread has abandoned on timeout so far.
+
+    Values not searched because of their pattern or length are not counted: the
+    result of those is the same every time.
+    """
+    return getattr(_abandoned, "count", 0)
+
+class RegexTimeout(TimeoutError):
+    """A regex search was stopped, or not run, because it could exceed its budget"""
+
+class BoundedRegex:
+    """A regex transformation compiled once, whose searches stay within a time budget.
+
+    Without the optional 'regex' package the budget is enforced before searching:
+    patterns whose repeats are nested (e.g. (a+)+) can take exponential time and are
+    never run, and each other pattern only searches values short enough for its
+    worst case, which grows as len(value) ** (repeats that can backtrack + 1), to
+    fit the budget. With the 'regex' package, searches are abandoned on timeout.
+    Either way a value that is not searched raises RegexTimeout and is counted.
+    """
+    __slots__ = ("pattern", "group", "template", "timeout", "max_length", "_search")
+
+    def __init__(self, pattern: str, group: Any = 0, template: Optional[str] = None, timeout_ms: float = REGEX_TIMEOUT_MS):
+        compiled = re.compile(pattern)
+        if isinstance(group, str) and group.isdigit():
+            group = int(group)
+        _check_group(compiled, group)
+        if template is not None:
+            _check_template(pattern, template)
+        if timeout_ms <= 0:
+            raise ValueError("timeout_ms must be positive")
+        self.pattern = pattern
+        self.group = group
+        self.template = template
+        self.timeout = timeout_ms / 1000
+        if _timeout_engine is not None:
+            self.max_length = REGEX_MAX_INPUT_LENGTH
+            self._search = _timeout_engine.compile(pattern).search
+        else:
+            # -1 for patterns that are never run
+            self.max_length = max_input_length(pattern, timeout_ms)
+            self._search = compiled.search
+
+    @classmethod
+    def from_params(cls, params: Dict[str, Any]) -> "BoundedRegex":
+        return cls(
+            params.get("pattern", ""),
+            params.get("group", 0),  # Group number or name; 0 is the entire match
+            params.get("template"),  # e.g. "\\g<ccy>/\\g<tenor>", built from named groups
+            float(params.get("timeout_ms", REGEX_TIMEOUT_MS))
+        )
+
+    def extract(self, value: str) -> Any:
+        """The selected group (or expanded template) of the first match, else the value unchanged"""
+        if len(value) > self.max_length:
+            raise self._not_searched(value)
+        if _timeout_engine is not None:
+            try:
+                match = self._search(value, timeout=self.timeout)
+            except TimeoutError:
+                regex_budget_exceeded.inc("timeout")
+                _abandoned.count = abandoned_searches() + 1
+                logger.warning(f"Regex search abandoned after {self.timeout * 1000:g} ms: {self.pattern!r}")
+                raise RegexTimeout(f"regex search exceeded its {self.timeout * 1000:g} ms budget")
+        else:
+            match = self._search(value)
+        if match is None:
+            return value
+        if self.template is not None:
+            return match.expand(self.template)
+        return match.group(self.group)
+
+    def _not_searched(self, value: str) -> RegexTimeout:
+        if self.max_length < 0:
+            regex_budget_exceeded.inc("unsafe_pattern")
+            return RegexTimeout(f"regex {self.pattern!r} nests repeats and can take exponential time, so it is not run")
+        regex_budget_exceeded.inc("input_length")
+        return RegexTimeout(
+            f"value of {len(value)} characters is longer than the {self.max_length} regex {self.pattern!r} can search within its budget"
+        )
+
+def _check_group(compiled: re.Pattern, group: Any) -> None:
+    if isinstance(group, str):
+        if group not in compiled.groupindex:
+            raise ValueError(f"pattern has no group named '{group}'")
+    elif not 0 <= int(group) <= compiled.groups:
+        raise ValueError(f"pattern has no group {group}")
+
+# Inline global flags must stay at the start of a pattern
+_GLOBAL_FLAGS = re.compile(r"^\(\?[aiLmsux]+\)")
+
+def _check_template(pattern: str, template: str) -> None:
+    # The same groups, made optional so the pattern matches the empty string and
+    # the template is expanded (and checked) without needing a sample value
+    flags = _GLOBAL_FLAGS.match(pattern)
+    prefix = flags.group(0) if flags else ""
+    try:
+        re.compile(f"{prefix}(?:{pattern[len(prefix):]})?").sub(template, "", count=1)
+    except (re.error, IndexError) as e:
+        raise ValueError(f"invalid template: {str(e)}")
+
+# Repeat opcodes of the parsed pattern (possessive repeats and atomic groups exist from Python 3.11)
+_REPEATS = tuple(getattr(_sre_parse, name) for name in ("MAX_REPEAT", "MIN_REPEAT", "POSSESSIVE_REPEAT") if hasattr(_sre_parse, name))
+_POSSESSIVE_REPEAT = getattr(_sre_parse, "POSSESSIVE_REPEAT", None)
+_ATOMIC_GROUP = getattr(_sre_parse, "ATOMIC_GROUP", None)
+
+# A bounded repeat matching the same text in at most this many ways costs a constant factor
+_CONSTANT_WAYS = 1000
+
+def max_input_length(pattern: str, timeout_ms: float) -> int:
+    """Longest value the standard engine searches with a pattern within a budget; -1 if the pattern is never run"""
+    degree = _backtracking_degree(_sre_parse.parse(pattern))
+    if math.isinf(degree):
+        return -1
+    # Every start position is tried, and each repeat that can backtrack multiplies that by up to len(value)
+    steps = timeout_ms * _STEPS_PER_MS
+    return min(REGEX_MAX_INPUT_LENGTH, int(steps ** (1 / (degree + 1)) + 1e-9) - 1)
+
+def _backtracking_degree(items) -> float:
+    """How many repeats of a parsed pattern can backtrack against each other; inf for nested repeats"""
+    degree = 0
+    for op, av in items:
+        if op in _REPEATS:
+            low, high, body = av
+            if op != _POSSESSIVE_REPEAT and high > 1 and _repeated_ways(_ways(body), high) > _CONSTANT_WAYS:
+                # e.g. (a+)+ or (a|aa)+: the ways to split a value grow exponentially with its length
+                return math.inf
+            degree += _backtracking_degree(body)
+            if high == _sre_parse.MAXREPEAT or high - low > _CONSTANT_WAYS:
+                degree += 1
+        elif op == _sre_parse.SUBPATTERN:
+            degree += _backtracking_degree(av[-1])
+        elif op == _sre_parse.BRANCH:
+            degree += max(_backtracking_degree(branch) for branch in av[1])
+        elif op == _sre_parse.GROUPREF_EXISTS:
+            degree += max(_backtracking_degree(av[1]), _backtracking_degree(av[2]) if av[2] else 0)
+        elif op in (_sre_parse.ASSERT, _sre_parse.ASSERT_NOT):
+            degree += _backtracking_degree(av[1])
+        elif op == _ATOMIC_GROUP:
+            degree += _backtracking_degree(av)
+    return degree
+
+def _ways(items) -> float:
+    """Upper bound on the ways a parsed pattern can match one piece of text; inf when unbounded"""
+    ways = 1
+    for op, av in items:
+        if op in _REPEATS:
+            low, high, body = av
+            if op == _POSSESSIVE_REPEAT:
+                continue  # Never gives characters back
+            if high == _sre_parse.MAXREPEAT:
+                return math.inf
+            ways *= (high - low + 1) * _repeated_ways(_ways(body), high)
+        elif op == _sre_parse.SUBPATTERN:
+            ways *= _ways(av[-1])
+        elif op == _sre_parse.BRANCH:
+            ways *= _branch_ways(av[1])
+        elif op == _sre_parse.GROUPREF_EXISTS:
+            ways *= _ways(av[1]) + (_ways(av[2]) if av[2] else 1)
+        # Atomic groups and lookarounds never backtrack once matched; other items match one way
+    return ways
+
+def _repeated_ways(ways: float, count: int) -> float:
+    if ways <= 1:
+        return 1
+    if count == _sre_parse.MAXREPEAT or count * math.log(ways) > math.log(_CONSTANT_WAYS ** 2):
+        return math.inf
+    return ways ** count
+
+def _branch_ways(branches) -> float:
+    # Alternatives starting with different characters never match at the same position, e.g. EUR|USD
+    firsts = [_first_literal(branch) for branch in branches]
+    if None not in firsts and len(set(firsts)) == len(firsts):
+        return max(_ways(branch) for branch in branches)
+    return sum(_ways(branch) for branch in branches)
+
+def _first_literal(items) -> Optional[str]:
+    items = list(items)
+    if not items:
+        return None
+    op, av = items[0]
+    if op == _sre_parse.LITERAL:
+        # Case-folded, in case the pattern ignores case
+        return chr(av).lower()
+    if op == _sre_parse.SUBPATTERN:
+        return _first_literal(av[-1])
+    return None
+
+def check_regex_params(params: Dict[str, Any]) -> Optional[str]:
+    """Why a regex rule cannot be saved, or None if it is valid"""
+    pattern = params.get("pattern")
+    if not isinstance(pattern, str) or not pattern:
+        return "regex needs a 'pattern'"
+    try:
+        compiled = BoundedRegex.from_params(params)
+    except (re.error, TypeError, ValueError) as e:
+        return f"invalid pattern {pattern!r}: {str(e)}"
+    if compiled.max_length < 0:
+        return f"pattern {pattern!r} nests repeats, e.g. (a+)+, and can take exponential time; repeat each part once instead, e.g. a+"
+    return None
+
+def invalid_regex_rules(mappings: Iterable[Any]) -> List[str]:
+    """Problems with the regex rules of field mappings (models or plain dicts)"""
+    problems = []
+    for mapping in mappings:
+        for rule_type, params in pipeline_rules(mapping):
+            if rule_type != "regex":
+                continue
+            problem = check_regex_params(params if isinstance(params, dict) else {})
+            if problem:
+                target_field = mapping.get("target_field") if isinstance(mapping, dict) else mapping.target_field
+                problems.append(f"{target_field}: {problem}")
+    return problems
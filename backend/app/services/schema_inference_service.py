@@ -0,0 +1,289 @@
+# backend/app/services/schema_inference_service.py
+from typing import Dict, Any, Iterable, List, Optional, Tuple, BinaryIO
+from collections import Counter
+from datetime import datetime
+import codecs
+import csv
+import io
+import json
+import os
+import re
+from app.models.system_model import FieldDefinition
+from app.services.transform_service import convert_date_format_to_python
+from app.services.record_readers import RecordError, open_record_reader
+
+# Only this much of an upload is read, however large the file is
+SAMPLE_MAX_BYTES = int(os.environ.get("SAMPLE_MAX_BYTES", str(1024 * 1024)))
+SAMPLE_MAX_ROWS = int(os.environ.get("SAMPLE_MAX_ROWS", "1000"))
+# Share of non-empty sampled values that must fit a type for the column to get it
+INFERENCE_MIN_SHARE = 0.95
+
+CANDIDATE_DELIMITERS = [",", ";", "\t", "|"]
+
+# Date formats in the notation used by format_date, grouped by the shape of the value
+DATE_FORMATS_BY_SHAPE = [
+    (re.compile(r"^\d{4}-\d{2}-\d{2}$"), ["YYYY-MM-DD", "YYYY-DD-MM"]),
+    (re.compile(r"^\d{4}/\d{2}/\d{2}$"), ["YYYY/MM/DD"]),
+    (re.compile(r"^\d{2}-\d{2}-\d{4}$"), ["DD-MM-YYYY", "MM-DD-YYYY"]),
+    (re.compile(r"^\d{2}/\d{2}/\d{4}$"), ["MM/DD/YYYY", "DD/MM/YYYY"]),
+    (re.compile(r"^\d{2}\.\d{2}\.\d{4}$"), ["DD.MM.YYYY"]),
+    (re.compile(r"^\d{2}/\d{2}/\d{2}$"), ["MM/DD/YY", "DD/MM/YY"]),
+    (re.compile(r"^(19|20)\d{6}$"), ["YYYYMMDD"]),
+]
+
+_INTEGER = re.compile(r"^[+-]?(0|[1-9]\d*)$")
+# Needs a point or an exponent; like _INTEGER it rejects leading zeros, so codes such as
+# "007" stay strings (integer values still count towards decimal columns)
+_DECIMAL = re.compile(r"^[+-]?((0|[1-9]\d*)\.\d*([eE][+-]?\d+)?|\.\d+([eE][+-]?\d+)?|(0|[1-9]\d*)[eE][+-]?\d+)$")
+_BOOLEANS = frozenset(["true", "false", "yes", "no", "y", "n", "t", "f"])
+
+def read_sample(stream: BinaryIO, max_bytes: int = SAMPLE_MAX_BYTES) -> Tuple[bytes, bool]:
+    """Read at most max_bytes from a binary stream, cut back to the last complete line.
+
+    Returns the sample and whether the stream held more data than was read.
+    """
+    sample = stream.read(max_bytes + 1)
+    truncated = len(sample) > max_bytes
+    if truncated:
+        sample = sample[:max_bytes]
+        last_newline = sample.rfind(b"\n")
+        if last_newline > 0:
+            sample = sample[:last_newline + 1]
+    return sample, truncated
+
+def detect_encoding(sample: bytes) -> Tuple[str, float]:
+    """Guess the text encoding of a sample, with a confidence between 0 and 1"""
+    for bom, encoding in (
+        (codecs.BOM_UTF8, "utf-8-sig"),
+        (codecs.BOM_UTF16_LE, "utf-16"),
+        (codecs.BOM_UTF16_BE, "utf-16"),
+    ):
+        if sample.startswith(bom):
+            return encoding, 1.0
+
+    try:
+        sample.decode("utf-8")
+    except UnicodeDecodeError as e:
+        # A multi-byte character cut by the byte limit is not an encoding problem
+        if e.start < len(sample) - 3:
+            try:
+                sample.decode("cp1252")
+                return "cp1252", 0.6
+            except UnicodeDecodeError:
+                return "latin-1", 0.3
+    # Pure ASCII is valid in every candidate, so it says less about the encoding
+    return "utf-8", 1.0 if any(byte > 0x7F for byte in sample) else 0.9
+
+def detect_delimiter(lines: List[str]) -> Tuple[str, float]:
+    """Pick the delimiter that splits the sampled lines into the most consistent columns"""
+    best = (",", 0.0, 0)
+    for delimiter in CANDIDATE_DELIMITERS:
+        widths = [len(row) for row in csv.reader(lines, delimiter=delimiter) if row]
+        if not widths:
+            continue
+        width, count = Counter(widths).most_common(1)[0]
+        if width < 2:
+            continue
+        consistency = count / len(widths)
+        # Prefer consistency, then more columns
+        if (consistency, width) > (best[1], best[2]):
+            best = (delimiter, consistency, width)
+    return best[0], best[1]
+
+def infer_column(values: List[str]) -> Dict[str, Any]:
+    """Infer the data type of one sampled column"""
+    present = [value.strip() for value in values if value is not None and value.strip()]
+    result = {
+        "data_type": "string",
+        "confidence": 0.0,
+        "date_formats": [],
+        "null_count": len(values) - len(present)
+    }
+    if not present:
+        return result
+
+    total = len(present)
+    threshold = INFERENCE_MIN_SHARE * total
+
+    # Narrowest type first; "0"/"1" columns are integers rather than booleans
+    booleans = sum(1 for value in present if value.lower() in _BOOLEANS)
+    if booleans >= threshold:
+        result.update(data_type="boolean", confidence=booleans / total)
+        return result
+
+    # Dates before numbers, so compact dates such as 20240131 are not taken for integers
+    date_formats = _matching_date_formats(present, threshold)
+    if date_formats:
+        formats = [date_format for date_format, _ in date_formats]
+        result.update(data_type="date", confidence=date_formats[0][1] / total, date_formats=formats)
+        return result
+
+    integers = sum(1 for value in present if _INTEGER.match(value))
+    if integers >= threshold:
+        result.update(data_type="integer", confidence=integers / total)
+        return result
+
+    decimals = integers + sum(1 for value in present if _DECIMAL.match(value))
+    if decimals >= threshold:
+        result.update(data_type="decimal", confidence=decimals / total)
+        return result
+
+    # Strings fit everything; confidence reflects how little any other type fits
+    result["confidence"] = 1.0 - max(booleans, integers, decimals) / total
+    return result
+
+def _matching_date_formats(values: List[str], threshold: float) -> List[Tuple[str, int]]:
+    """Date formats that parse at least `threshold` values, best first"""
+    shape_counts = Counter()
+    for value in values:
+        for index, (shape, _) in enumerate(DATE_FORMATS_BY_SHAPE):
+            if shape.match(value):
+                shape_counts[index] += 1
+                break
+    if not shape_counts:
+        return []
+
+    index, count = shape_counts.most_common(1)[0]
+    if count < threshold:
+        return []
+
+    shape, formats = DATE_FORMATS_BY_SHAPE[index]
+    shaped = [value for value in values if shape.match(value)]
+    matches = []
+    for date_format in formats:
+        python_format = convert_date_format_to_python(date_format)
+        parsed = 0
+        for value in shaped:
+            try:
+                datetime.strptime(value, python_format)
+                parsed += 1
+            except ValueError:
+                pass
+        if parsed >= threshold:
+            matches.append((date_format, parsed))
+
+    # Ambiguous formats (day/month order) stay in their listed order on ties
+    matches.sort(key=lambda match: -match[1])
+    return matches
+
+def infer_schema(stream: BinaryIO, encoding: Optional[str] = None, delimiter: Optional[str] = None,
+                 max_bytes: int = SAMPLE_MAX_BYTES, max_rows: int = SAMPLE_MAX_ROWS) -> Dict[str, Any]:
+    """Infer field definitions from a bounded prefix of a delimited text upload"""
+    sample, truncated = read_sample(stream, max_bytes)
+
+    encoding_confidence = 1.0
+    if encoding is None:
+        encoding, encoding_confidence = detect_encoding(sample)
+    # The sample may end in the middle of a multi-byte character
+    text = sample.decode(encoding, errors="replace" if truncated else "strict")
+
+    lines = text.splitlines()
+    delimiter_confidence = 1.0
+    if delimiter is None:
+        delimiter, delimiter_confidence = detect_delimiter(lines[:max_rows + 1])
+
+    reader = csv.reader(io.StringIO(text, newline=""), delimiter=delimiter)
+    headers = next(reader, None)
+    if headers is None:
+        raise ValueError("File is empty")
+    headers = [header.strip() for header in headers]
+
+    columns: List[List[str]] = [[] for _ in headers]
+    sampled_rows = 0
+    for row in reader:
+        if not row:
+            continue
+        for column, value in zip(columns, row):
+            column.append(value)
+        # Short rows leave the remaining columns empty
+        for column in columns[len(row):]:
+            column.append("")
+        sampled_rows += 1
+        if sampled_rows >= max_rows:
+            break
+
+    fields, column_reports = _infer_fields(zip(headers, columns))
+    return {
+        "fields": fields,
+        "inference": {
+            "encoding": encoding,
+            "encoding_confidence": encoding_confidence,
+            "delimiter": delimiter,
+            "delimiter_confidence": delimiter_confidence,
+            "sampled_bytes": len(sample),
+            "sampled_rows": sampled_rows,
+            "truncated": truncated or sampled_rows >= max_rows,
+            "columns": column_reports
+        }
+    }
+
+def infer_record_schema(stream: BinaryIO, input_format: str, encoding: Optional[str] = None,
+                        max_bytes: int = SAMPLE_MAX_BYTES, max_rows: int = SAMPLE_MAX_ROWS) -> Dict[str, Any]:
+    """Infer field definitions from a bounded prefix of a record-oriented upload (NDJSON, FIX)"""
+    sample, truncated = read_sample(stream, max_bytes)
+
+    encoding_confidence = 1.0
+    if encoding is None:
+        encoding, encoding_confidence = detect_encoding(sample)
+
+    # Field names in order of first appearance; records may hold different fields
+    columns: Dict[str, List[str]] = {}
+    sampled_rows = 0
+    for record in open_record_reader(input_format, io.BytesIO(sample), encoding=encoding):
+        if isinstance(record, RecordError):
+            continue
+        for name, value in record.items():
+            column = columns.get(name)
+            if column is None:
+                # Earlier records did not have this field
+                column = columns[name] = [""] * sampled_rows
+            column.append(_sample_text(value))
+        sampled_rows += 1
+        for column in columns.values():
+            if len(column) < sampled_rows:
+                column.append("")
+        if sampled_rows >= max_rows:
+            break
+
+    if not sampled_rows:
+        raise ValueError("No records found in the sample")
+
+    fields, column_reports = _infer_fields(columns.items())
+    return {
+        "fields": fields,
+        "inference": {
+            "input_format": input_format,
+            "encoding": encoding,
+            "encoding_confidence": encoding_confidence,
+            "sampled_bytes": len(sample),
+            "sampled_rows": sampled_rows,
+            "truncated": truncated or sampled_rows >= max_rows,
+            "columns": column_reports
+        }
+    }
+
+def _sample_text(value: Any) -> str:
+    """Render a parsed value the way it would appear in a text file"""
+    if value is None:
+        return ""
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, (dict, list)):
+        return json.dumps(value)
+    return str(value)
+
+def _infer_fields(columns: Iterable[Tuple[str, List[str]]]) -> Tuple[List[FieldDefinition], List[Dict[str, Any]]]:
+    """Build field definitions and per-column reports from sampled column values"""
+    fields = []
+    column_reports = []
+    for name, values in columns:
+        inferred = infer_column(values)
+        constraints = {"date_format": inferred["date_formats"][0]} if inferred["date_formats"] else None
+        fields.append(FieldDefinition(
+            name=name,
+            data_type=inferred["data_type"],
+            required=False,
+            constraints=constraints
+        ))
+        column_reports.append(dict(inferred, name=name))
+    return fields, column_reports
@@ -1,38 +1,108 @@
 # backend/app/services/transform_service.py
-from typing import Dict, Any, Union
+from typing import Dict, Any, Union, Callable, Optional, Tuple, List, Iterable
+from collections import OrderedDict, Counter, deque
 from datetime import datetime
-import re
-from app.models.mapping import MappingConfig
+from calendar import monthrange
+from itertools import count as counter
+import logging
+import os
+import threading
+import time
+from app.models.mapping import MappingConfig, RuntimeMapping
 from app.models.system_model import SystemModel
+from app.services.validation_service import get_model_validator, raise_for_errors, validate_transformed_data, validate_field_value
+from app.services.metrics_service import count_validation_failures, transform_step_duration
+from app.services.lookup_service import lookup_index
+from app.services.regex_service import BoundedRegex
+
+logger = logging.getLogger(__name__)
+
+# A compiled transformation step: (value, source_data) -> transformed value.
+# Steps raise on failure; the caller falls back to the original value.
+TransformStep = Callable[[Any, Dict[str, Any]], Any]
+
+# Maximum number of compiled mapping plans kept in memory
+MAX_COMPILED_MAPPINGS = 256
+
+# One record in this many has every step timed for transform_step_duration_seconds
+# (every record while diagnostics are enabled); 0 times steps only with diagnostics
+TRANSFORM_STEP_SAMPLE_EVERY = int(os.environ.get("TRANSFORM_STEP_SAMPLE_EVERY", "100"))
+
+# Records transformed by the row engine, for picking the ones whose steps are timed
+_step_samples = counter()
+
+class TransformDiagnostics:
+    """Per-transformation-type outcome counters with sampled error examples.
+
+    Errors are always counted since they only cost anything when a step fails.
+    Success/fallback counts and validation issue counts are only collected while
+    enabled, as they add work for every field of every record.
+    """
+
+    def __init__(self, enabled: bool = False, max_samples: int = 50, sample_every: int = 100):
+        self.enabled = enabled
+        self.sample_every = sample_every
+        self._outcomes: Counter = Counter()
+        self._validation: Counter = Counter()
+        self._samples: deque = deque(maxlen=max_samples)
+        self._lock = threading.Lock()
+
+    def count(self, transform_type: str, outcome: str) -> None:
+        """Count a step outcome: 'success', 'fallback' (value left unchanged) or 'error'"""
+        self._outcomes[(transform_type, outcome)] += 1
+
+    def count_validation(self, issues) -> None:
+        """Count validation issues by system model field and issue code"""
+        for issue in issues:
+            self._validation[(issue.field, issue.code)] += 1
+
+    def record_error(self, transform_type: str, field: str, value: Any, error: Exception) -> None:
+        """Count a failed step and keep the first and every Nth failure per type as an example"""
+        with self._lock:
+            key = (transform_type, "error")
+            self._outcomes[key] += 1
+            if (self._outcomes[key] - 1) % self.sample_every == 0:
+                self._samples.append({
+                    "transform_type": transform_type,
+                    "field": field,
+                    "value": repr(value)[:200],
+                    "error": str(error),
+                    "timestamp": time.time()
+                })
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Return the current counters and sampled errors"""
+        with self._lock:
+            transformations: Dict[str, Dict[str, int]] = {}
+            for (transform_type, outcome), count in self._outcomes.items():
+                counts = transformations.setdefault(transform_type, {"success": 0, "fallback": 0, "error": 0})
+                counts[outcome] = count
+
+            validation: Dict[str, Dict[str, int]] = {}
+            for (field, code), count in self._validation.items():
+                validation.setdefault(field, {})[code] = count
+
+            return {
+                "enabled": self.enabled,
+                "transformations": transformations,
+                "validation": validation,
+                "error_samples": list(self._samples)
+            }
+
+    def reset(self) -> None:
+        """Clear all counters and samples"""
+        with self._lock:
+            self._outcomes.clear()
+            self._validation.clear()
+            self._samples.clear()
+
+diagnostics = TransformDiagnostics(
+    enabled=os.environ.get("TRANSFORM_DIAGNOSTICS", "false").lower() in ("1", "true", "yes")
+)
 
 def transform_data(source_data: Dict[str, Any], mapping_config: MappingConfig, system_model: SystemModel) -> Dict[str, Any]:
     """Transform data from source format to system format using a mapping configuration"""
-    result = {}
-    
-    for mapping in mapping_config.mappings:
-        source_field = mapping.source_field
-        target_field = mapping.target_field
-        
-        # Skip if source field isn't in the data
-        if source_field not in source_data:
-            continue
-        
-        # Get the source value
-        source_value = source_data[source_field]
-        
-        # Apply transformation if defined
-        if mapping.transformation:
-            transformed_value = apply_transformation(source_value, mapping.transformation, source_data)
-        else:
-            transformed_value = source_value
-        
-        # Add to result
-        result[target_field] = transformed_value
-    
-    # Validate the result against the system model
-    validate_transformed_data(result, system_model)
-    
-    return result
+    return get_compiled_mapping(mapping_config, system_model).transform(source_data)
 
 def apply_transformation(value: Any, transformation: Dict[str, Any], source_data: Dict[str, Any]) -> Any:
     """Apply a transformation to a value"""
@@ -42,235 +112,548 @@ def apply_transformation(value: Any, transformation: Dict[str, Any], source_data
         params = transformation.params or {}
     else:
         transform_type = transformation.get("type")
-        params = transformation.get("params", {})
-    
-    if transform_type == "direct":
+        params = transformation.get("params") or {}
+
+    step = build_transform_step(transform_type, params)
+    if step is None:
         return value
-    
-    # String transformations
-    elif transform_type == "left" and isinstance(value, str):
-        try:
-            count = int(params.get("count", 0))
-            return value[:count]
-        except:
-            return value
-    
-    elif transform_type == "right" and isinstance(value, str):
-        try:
-            count = int(params.get("count", 0))
-            return value[-count:] if count > 0 else value
-        except:
-            return value
-    
-    elif transform_type == "substring" and isinstance(value, str):
-        try:
-            start_pos = int(params.get("startPosition", 0))
-            length = int(params.get("length", 0))
-            return value[start_pos:start_pos + length]
-        except:
-            return value
-    
-    elif transform_type == "replace" and isinstance(value, str):
-        try:
-            find_str = params.get("find", "")
-            replace_str = params.get("replace", "")
-            replace_all = params.get("replaceAll", False)
-            
-            if replace_all:
-                return value.replace(find_str, replace_str)
-            else:
-                return value.replace(find_str, replace_str, 1)
-        except:
-            return value
-    
-    elif transform_type == "case" and isinstance(value, str):
-        try:
-            case_type = params.get("caseType", "").lower()
-            if case_type == "upper":
-                return value.upper()
-            elif case_type == "lower":
-                return value.lower()
-            elif case_type == "title":
-                return value.title()
-            return value
-        except:
-            return value
-    
-    elif transform_type == "regex" and isinstance(value, str):
-        try:
-            pattern = params.get("pattern", "")
-            group = params.get("group", 0)  # Default to the entire match (group 0)
-            
-            # Try to match the pattern against the value
-            match = re.search(pattern, value)
-            
-            if match:
-                # Extract the specified group or the entire match if group=0
-                return match.group(group)
+    try:
+        return step(value, source_data)
+    except Exception as e:
+        diagnostics.record_error(transform_type, "", value, e)
+        return value
+
+class CompiledMapping:
+    """A mapping configuration pre-resolved into per-field callables"""
+    __slots__ = ("config_id", "config_updated_at", "bank_id", "system_model", "validator", "fields", "stages", "columnar_plan")
+
+    def __init__(self, mapping_config: Union[MappingConfig, RuntimeMapping], system_model: SystemModel):
+        if not isinstance(mapping_config, RuntimeMapping):
+            mapping_config = RuntimeMapping.from_config(mapping_config)
+        self.config_id = mapping_config.id
+        self.config_updated_at = mapping_config.updated_at
+        self.bank_id = mapping_config.bank_id
+        self.system_model = system_model
+        self.validator = get_model_validator(system_model)
+
+        # Each entry is (source_field, target_field, transform_type, step)
+        fields = []
+        stages = []
+        for source_field, target_field, rules in mapping_config.fields:
+            field_stages = []
+            for rule_type, rule_params in rules:
+                rule_step = build_transform_step(rule_type, rule_params)
+                # Direct and unknown steps leave the value unchanged
+                if rule_step is not None:
+                    field_stages.append((rule_type, rule_params, rule_step))
+
+            if not field_stages:
+                transform_type, step = None, None
+            elif len(field_stages) == 1:
+                transform_type, _, step = field_stages[0]
             else:
-                # No match found, return original value
-                return value
-        except Exception as e:
-            print(f"Regex error: {str(e)}")
-            return value
-    
-    elif transform_type == "split" and isinstance(value, str):
-        try:
+                transform_type, step = PIPELINE_TYPE, fuse_steps(field_stages, target_field)
+            fields.append((source_field, target_field, transform_type, step))
+            stages.append(tuple(field_stages))
+        self.fields: Tuple[Tuple[str, str, Optional[str], Optional[TransformStep]], ...] = tuple(fields)
+        # The (transform_type, params, step) stages behind each field's step, for engines
+        # that compile their own kernels
+        self.stages: Tuple[Tuple[Tuple[str, Dict[str, Any], TransformStep], ...], ...] = tuple(stages)
+        # Built lazily by columnar_service the first time a batch runs column-wise
+        self.columnar_plan = None
+
+    @property
+    def target_fields(self) -> List[str]:
+        """Target field names in mapping order, without duplicates"""
+        return list(dict.fromkeys(target_field for _, target_field, _, _ in self.fields))
+
+    def transform(self, source_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Transform a single source record and validate it against the system model"""
+        if diagnostics.enabled:
+            # Every step is timed and counted
+            result = self.map_fields(source_data, transform_step_duration.observe, diagnostics.count)
+        elif TRANSFORM_STEP_SAMPLE_EVERY and next(_step_samples) % TRANSFORM_STEP_SAMPLE_EVERY == 0:
+            result = self.map_fields(source_data, transform_step_duration.observe)
+        else:
+            result = self.map_fields(source_data)
+
+        # Validate the result against the system model
+        issues = self.validator.check(result)
+        if issues:
+            if diagnostics.enabled:
+                diagnostics.count_validation(issues)
+            count_validation_failures(self.validator.model_id, issues)
+            raise_for_errors(issues)
+
+        return result
+
+    def map_fields(self, source_data: Dict[str, Any], observe_step: Optional[Callable[[float, str], None]] = None,
+                   count: Optional[Callable[[str, str], None]] = None) -> Dict[str, Any]:
+        """Apply the field mappings to a record without validating the result, e.g. for previews.
+
+        Optional instrumentation hooks: observe_step(seconds, transform_type) receives the
+        time of every step, count(transform_type, outcome) the outcome of every step that
+        does not fail ('success', or 'fallback' when the value is left unchanged).
+        """
+        result = {}
+        perf_counter = time.perf_counter
+        start = 0.0
+
+        for source_field, target_field, transform_type, step in self.fields:
+            # Skip if source field isn't in the data
+            if source_field not in source_data:
+                continue
+
+            value = source_data[source_field]
+
+            # Apply transformation if defined, keeping the original value on failure
+            if step is not None:
+                if observe_step is not None:
+                    start = perf_counter()
+                try:
+                    transformed = step(value, source_data)
+                except Exception as e:
+                    if observe_step is not None:
+                        observe_step(perf_counter() - start, transform_type)
+                    diagnostics.record_error(transform_type, target_field, value, e)
+                else:
+                    if observe_step is not None:
+                        observe_step(perf_counter() - start, transform_type)
+                    if count is not None:
+                        count(transform_type, "fallback" if transformed is value else "success")
+                    value = transformed
+
+            result[target_field] = value
+
+        return result
+
+    def transform_batch(self, records: Iterable[Any], start_index: int = 0) -> List[Dict[str, Any]]:
+        """Transform many records, capturing errors per record instead of failing the batch"""
+        results = []
+        transform = self.transform
+
+        for index, record in enumerate(records, start=start_index):
+            if not isinstance(record, dict):
+                results.append({"index": index, "output": None, "error": "Record must be a JSON object"})
+                continue
+            try:
+                results.append({"index": index, "output": transform(record), "error": None})
+            except Exception as e:
+                results.append({"index": index, "output": None, "error": str(e)})
+
+        return results
+
+_compiled_mappings: "OrderedDict[tuple, CompiledMapping]" = OrderedDict()
+_compiled_mappings_lock = threading.Lock()
+
+def compile_mapping(mapping_config: Union[MappingConfig, RuntimeMapping], system_model: SystemModel) -> CompiledMapping:
+    """Compile a mapping configuration into an executable plan (uncached)"""
+    return CompiledMapping(mapping_config, system_model)
+
+def get_compiled_mapping(mapping_config: Union[MappingConfig, RuntimeMapping], system_model: SystemModel) -> CompiledMapping:
+    """Get the compiled plan for a mapping configuration, compiling it if needed"""
+    key = (mapping_config.id, mapping_config.updated_at, system_model.id, system_model.updated_at)
+
+    with _compiled_mappings_lock:
+        compiled = _compiled_mappings.get(key)
+        if compiled is not None:
+            _compiled_mappings.move_to_end(key)
+            return compiled
+
+    compiled = compile_mapping(mapping_config, system_model)
+
+    with _compiled_mappings_lock:
+        _compiled_mappings[key] = compiled
+        _compiled_mappings.move_to_end(key)
+        while len(_compiled_mappings) > MAX_COMPILED_MAPPINGS:
+            _compiled_mappings.popitem(last=False)
+
+    return compiled
+
+def clear_compiled_mappings() -> None:
+    """Drop all compiled mapping plans"""
+    with _compiled_mappings_lock:
+        _compiled_mappings.clear()
+
+# Transform type reported for fields with more than one step
+PIPELINE_TYPE = "pipeline"
+
+def fuse_steps(stages: List[Tuple[str, Dict[str, Any], TransformStep]], target_field: str = "") -> TransformStep:
+    """Fuse a field's ordered steps into one step.
+
+    Each step receives the previous step's output. A failing step is recorded and
+    passes its input on unchanged, as a single failing transformation does, so the
+    fused step itself never raises.
+    """
+    chain = tuple((transform_type, step) for transform_type, _, step in stages)
+    record_error = diagnostics.record_error
+
+    def step(value, source_data):
+        for transform_type, stage in chain:
+            try:
+                value = stage(value, source_data)
+            except Exception as e:
+                record_error(transform_type, target_field, value, e)
+        return value
+    return step
+
+# Step builders: each receives the rule params once and returns a TransformStep
+_STEP_BUILDERS: Dict[str, Callable[[Dict[str, Any]], TransformStep]] = {}
+
+def _step_builder(transform_type: str):
+    def register(builder):
+        _STEP_BUILDERS[transform_type] = builder
+        return builder
+    return register
+
+def build_transform_step(transform_type: str, params: Dict[str, Any]) -> Optional[TransformStep]:
+    """Pre-bind a transformation type and its params into a callable step"""
+    if transform_type == "direct":
+        return None
+
+    builder = _STEP_BUILDERS.get(transform_type)
+    if builder is None:
+        # Unknown transformation type
+        return None
+
+    try:
+        return builder(params)
+    except Exception as e:
+        # Invalid params: every application fails and falls back to the original value
+        return _failing_step(e)
+
+def _failing_step(error: Exception) -> TransformStep:
+    def step(value, source_data):
+        raise error
+    return step
+
+# String transformations
+@_step_builder("left")
+def _build_left(params: Dict[str, Any]) -> TransformStep:
+    count = int(params.get("count", 0))
+
+    def step(value, source_data):
+        if isinstance(value, str):
+            return value[:count]
+        return value
+    return step
+
+@_step_builder("right")
+def _build_right(params: Dict[str, Any]) -> TransformStep:
+    count = int(params.get("count", 0))
+
+    def step(value, source_data):
+        if isinstance(value, str) and count > 0:
+            return value[-count:]
+        return value
+    return step
+
+@_step_builder("substring")
+def _build_substring(params: Dict[str, Any]) -> TransformStep:
+    start_pos = int(params.get("startPosition", 0))
+    end_pos = start_pos + int(params.get("length", 0))
+
+    def step(value, source_data):
+        if isinstance(value, str):
+            return value[start_pos:end_pos]
+        return value
+    return step
+
+@_step_builder("replace")
+def _build_replace(params: Dict[str, Any]) -> TransformStep:
+    find_str = params.get("find", "")
+    replace_str = params.get("replace", "")
+    count = -1 if params.get("replaceAll", False) else 1
+
+    def step(value, source_data):
+        if isinstance(value, str):
+            return value.replace(find_str, replace_str, count)
+        return value
+    return step
+
+@_step_builder("case")
+def _build_case(params: Dict[str, Any]) -> TransformStep:
+    case_type = params.get("caseType", "").lower()
+    convert = {"upper": str.upper, "lower": str.lower, "title": str.title}.get(case_type)
+
+    def step(value, source_data):
+        if convert is not None and isinstance(value, str):
+            return convert(value)
+        return value
+    return step
+
+@_step_builder("regex")
+def _build_regex(params: Dict[str, Any]) -> TransformStep:
+    # Compiled once; group may be a number or a name, and searches stay within a time budget
+    extract = BoundedRegex.from_params(params).extract
+
+    def step(value, source_data):
+        if isinstance(value, str):
+            return extract(value)
+        return value
+    return step
+
+@_step_builder("split")
+def _build_split(params: Dict[str, Any]) -> TransformStep:
+    delimiter = params.get("delimiter", ",")
+    index = params.get("index", 0)
+
+    def step(value, source_data):
+        if isinstance(value, str):
             # Split string and get specified index
-            delimiter = params.get("delimiter", ",")
-            index = params.get("index", 0)
             parts = value.split(delimiter)
             return parts[index] if 0 <= index < len(parts) else value
-        except:
-            return value
-    
-    elif transform_type == "concat":
-        try:
-            # Concatenate multiple fields
-            fields = params.get("fields", [])
-            separator = params.get("separator", "")
-            values = [source_data.get(field, "") for field in fields]
-            values.append(str(value))  # Add the current field value
-            return separator.join(str(v) for v in values if v)
-        except:
-            return value
-    
-    # Date transformations
-    elif transform_type == "format_date":
-        try:
-            # Convert date format
-            source_format_str = params.get("source_format", "MM/DD/YYYY")
-            target_format_str = params.get("target_format", "YYYY-MM-DD")
-            
-            # Convert user-friendly formats to Python datetime formats
-            source_format = convert_date_format_to_python(source_format_str)
-            target_format = convert_date_format_to_python(target_format_str)
-            
-            print(f"Original source_format: {source_format_str}")
-            print(f"Converted Python source_format: {source_format}")
-            print(f"Original target_format: {target_format_str}")
-            print(f"Converted Python target_format: {target_format}")
-            
-            # Handle if value is already a datetime object
-            if isinstance(value, datetime):
-                dt = value
+        return value
+    return step
+
+@_step_builder("concat")
+def _build_concat(params: Dict[str, Any]) -> TransformStep:
+    # Concatenate multiple fields
+    fields = tuple(params.get("fields", []))
+    separator = params.get("separator", "")
+
+    def step(value, source_data):
+        values = [source_data.get(field, "") for field in fields]
+        values.append(str(value))  # Add the current field value
+        return separator.join(str(v) for v in values if v)
+    return step
+
+# Date transformations
+@_step_builder("format_date")
+def _build_format_date(params: Dict[str, Any]) -> TransformStep:
+    # Convert user-friendly formats to Python datetime formats once per config
+    source_format = convert_date_format_to_python(params.get("source_format", "MM/DD/YYYY"))
+    target_format = convert_date_format_to_python(params.get("target_format", "YYYY-MM-DD"))
+    logger.debug(f"Compiled format_date step: {source_format} -> {target_format}")
+    convert = compile_date_converter(source_format, target_format)
+
+    # Value dates repeat heavily across a file, so remember recent conversions
+    memo: Dict[str, str] = {}
+    memo_get = memo.get
+
+    def step(value, source_data):
+        if isinstance(value, str):
+            result = memo_get(value)
+            if result is None:
+                result = convert(value)
+                if len(memo) >= DATE_MEMO_SIZE:
+                    memo.clear()
+                memo[value] = result
+            return result
+        # Handle if value is already a datetime object
+        if isinstance(value, datetime):
+            return value.strftime(target_format)
+        return convert(str(value))
+    return step
+
+# Maximum number of memoized values per format_date step
+DATE_MEMO_SIZE = 4096
+
+# Fixed-width numeric directives understood by the date fast path
+_FIXED_DATE_WIDTHS = {"%Y": 4, "%y": 2, "%m": 2, "%d": 2}
+
+def compile_date_converter(source_format: str, target_format: str) -> Callable[[str], str]:
+    """Build a string -> string date converter for a pair of Python date formats.
+
+    Fixed-layout formats made of %Y/%y/%m/%d and literal separators (YYYY-MM-DD,
+    DD/MM/YYYY, ...) are parsed by slicing and formatted with str.format. Anything
+    the fast path does not accept goes through strptime/strftime, so results and
+    errors are identical to the strptime path.
+    """
+    parse = _compile_fixed_date_parser(source_format)
+    render = _compile_fixed_date_formatter(target_format)
+    strptime = datetime.strptime
+
+    def convert(text: str) -> str:
+        fields = parse(text) if parse is not None else None
+        if fields is None:
+            return strptime(text, source_format).strftime(target_format)
+        year, month, day = fields
+        if render is not None and year >= 1000:
+            return render(year, month, day)
+        return datetime(year, month, day).strftime(target_format)
+    return convert
+
+def _tokenize_date_format(python_format: str) -> Optional[List[str]]:
+    """Split a format into directives and literal characters; None if unsupported"""
+    tokens = []
+    i = 0
+    while i < len(python_format):
+        char = python_format[i]
+        if char == "%":
+            directive = python_format[i:i + 2]
+            if directive == "%%":
+                tokens.append("%")
+            elif directive in _FIXED_DATE_WIDTHS:
+                tokens.append(directive)
             else:
-                # Parse the date string to a datetime object
-                dt = datetime.strptime(str(value), source_format)
-            
-            # Format the datetime object back to a string
-            return dt.strftime(target_format)
-        except Exception as e:
-            # Return original value if transformation fails
-            print(f"Date transformation error: {str(e)}")
-            return value
-    
-    # Numeric transformations
-    elif transform_type == "numeric_format":
-        try:
-            if not isinstance(value, (int, float)):
-                # Try to convert to number
-                value = float(value)
-                if value.is_integer():
-                    value = int(value)
-            
-            # Apply formatting options
-            decimal_places = params.get("decimalPlaces")
-            if decimal_places is not None:
-                value = round(float(value), decimal_places)
-            
-            return value
-        except:
-            return value
-    
-    # Boolean transformations
-    elif transform_type == "boolean_convert":
-        try:
-            # Handle various boolean representations
-            if isinstance(value, bool):
-                return value
-            
-            true_values = params.get("trueValues", ["true", "yes", "1", "t", "y"])
-            if str(value).lower() in map(str.lower, true_values):
-                return True
-            
-            false_values = params.get("falseValues", ["false", "no", "0", "f", "n"])
-            if str(value).lower() in map(str.lower, false_values):
-                return False
-            
-            return bool(value)
-        except:
+                return None
+            i += 2
+        elif char.isspace() or char.isdigit():
+            # strptime treats whitespace loosely, and digit literals are ambiguous
+            return None
+        else:
+            tokens.append(char)
+            i += 1
+    return tokens
+
+def _compile_fixed_date_parser(source_format: str) -> Optional[Callable[[str], Optional[Tuple[int, int, int]]]]:
+    """Compile a slicing parser for a fixed-layout date format, if the format allows it"""
+    tokens = _tokenize_date_format(source_format)
+    if tokens is None:
+        return None
+
+    slots = {}
+    literals = []
+    position = 0
+    for token in tokens:
+        width = _FIXED_DATE_WIDTHS.get(token)
+        if width is None:
+            literals.append((position, token))
+            position += 1
+            continue
+        slot = "year" if token in ("%Y", "%y") else token
+        if slot in slots:
+            return None
+        slots[slot] = (position, position + width, token == "%y")
+        position += width
+
+    if set(slots) != {"year", "%m", "%d"}:
+        return None
+
+    length = position
+    year_start, year_end, short_year = slots["year"]
+    month_start, month_end, _ = slots["%m"]
+    day_start, day_end, _ = slots["%d"]
+    literals = tuple(literals)
+
+    def parse(text: str) -> Optional[Tuple[int, int, int]]:
+        if len(text) != length or not text.isascii():
+            return None
+        for literal_position, literal in literals:
+            if text[literal_position] != literal:
+                return None
+        year_text = text[year_start:year_end]
+        month_text = text[month_start:month_end]
+        day_text = text[day_start:day_end]
+        if not (year_text.isdigit() and month_text.isdigit() and day_text.isdigit()):
+            return None
+
+        year = int(year_text)
+        if short_year:
+            year += 1900 if year >= 69 else 2000
+        month = int(month_text)
+        day = int(day_text)
+        if year < 1 or not 1 <= month <= 12 or not 1 <= day <= monthrange(year, month)[1]:
+            return None
+        return year, month, day
+    return parse
+
+def _compile_fixed_date_formatter(target_format: str) -> Optional[Callable[[int, int, int], str]]:
+    """Compile a str.format renderer for a fixed-layout target format, if possible"""
+    tokens = _tokenize_date_format(target_format)
+    if tokens is None:
+        return None
+
+    placeholders = {"%Y": "{0:04d}", "%m": "{1:02d}", "%d": "{2:02d}", "%y": "{3:02d}"}
+    template = "".join(
+        placeholders.get(token) or token.replace("{", "{{").replace("}", "}}")
+        for token in tokens
+    )
+
+    def render(year: int, month: int, day: int) -> str:
+        return template.format(year, month, day, year % 100)
+    return render
+
+# Numeric transformations
+@_step_builder("numeric_format")
+def _build_numeric_format(params: Dict[str, Any]) -> TransformStep:
+    decimal_places = params.get("decimalPlaces")
+
+    def step(value, source_data):
+        if not isinstance(value, (int, float)):
+            # Try to convert to number
+            value = float(value)
+            if value.is_integer():
+                value = int(value)
+
+        # Apply formatting options
+        if decimal_places is not None:
+            value = round(float(value), decimal_places)
+
+        return value
+    return step
+
+# Boolean transformations
+@_step_builder("boolean_convert")
+def _build_boolean_convert(params: Dict[str, Any]) -> TransformStep:
+    # Handle various boolean representations
+    true_values = frozenset(map(str.lower, params.get("trueValues", ["true", "yes", "1", "t", "y"])))
+    false_values = frozenset(map(str.lower, params.get("falseValues", ["false", "no", "0", "f", "n"])))
+
+    def step(value, source_data):
+        if isinstance(value, bool):
             return value
-    
-    # Enum value mapping
-    elif transform_type == "enum_map":
-        # Map enum values
-        mapping_dict = params.get("mapping", {})
-        return mapping_dict.get(value, value)
-    
-    # Unknown transformation type
-    return value
-
-def validate_transformed_data(data: Dict[str, Any], system_model: SystemModel) -> None:
-    """Validate transformed data against system model"""
-    # Check required fields
-    for field in system_model.fields:
-        if field.required and field.name not in data:
-            raise ValueError(f"Required field {field.name} is missing")
-    
-    # Validate data types
-    for field_name, field_value in data.items():
-        system_field = next((f for f in system_model.fields if f.name == field_name), None)
-        if system_field:
-            # Skip validation if field is not defined in the system model
-            validate_field_value(field_name, field_value, system_field.data_type)
-
-def validate_field_value(field_name: str, value: Any, data_type: str) -> None:
-    """Validate a field value against its expected data type"""
-    try:
-        if data_type == "string":
-            if value is not None and not isinstance(value, str):
-                # Attempt to convert to string for display
-                str(value)
-                print(f"Note: Field {field_name} was automatically converted to string")
-        
-        elif data_type == "integer":
-            if value is not None and not isinstance(value, int):
-                # Try to convert string to int
-                int(value)
-                print(f"Note: Field {field_name} was validated as integer")
-        
-        elif data_type == "decimal":
-            if value is not None and not isinstance(value, (int, float)):
-                # Try to convert string to float
-                float(value)
-                print(f"Note: Field {field_name} was validated as decimal")
-        
-        elif data_type == "boolean":
-            if value is not None and not isinstance(value, bool):
-                # Boolean might be represented as string, int, etc.
-                # Just check it can be interpreted as a boolean
-                bool(value)
-                print(f"Note: Field {field_name} was validated as boolean")
-        
-        elif data_type == "date":
-            if value is not None:
-                if isinstance(value, datetime):
-                    # Already a datetime, no validation needed
-                    pass
-                elif isinstance(value, str):
-                    # For date validation, we'll just verify it's a string for now
-                    # The actual format validation happens during transformation
-                    pass
-                else:
-                    raise ValueError(f"Field {field_name} should be a date string or datetime object")
-        
-        # Other data types could be added here
-    
-    except (ValueError, TypeError) as e:
-        # Log the error but don't raise for now
-        # This could be modified to raise exceptions based on your validation requirements
-        print(f"Validation warning for field {field_name}: {str(e)}")
+        lowered = str(value).lower()
+        if lowered in true_values:
+            return True
+        if lowered in false_values:
+            return False
+        return bool(value)
+    return step
+
+# Enum value mapping
+@_step_builder("enum_map")
+def _build_enum_map(params: Dict[str, Any]) -> TransformStep:
+    inline = params.get("mapping", {})
+    table_id = params.get("table")
+    if not table_id:
+        lookup = inline.get
+
+        def step(value, source_data):
+            return lookup(value, value)
+        return step
+
+    # Entries of a shared lookup table; inline mapping entries take precedence
+    table = lookup_index.table(str(table_id))
+
+    def step(value, source_data):
+        if value in inline:
+            return inline[value]
+        entries = table.entries
+        if entries is None:
+            raise LookupError(f"Lookup table {table_id} is not loaded")
+        if value in entries:
+            return entries[value]
+        # Table keys are strings; numeric source values match their text
+        return entries.get(str(value), value) if not isinstance(value, str) else value
+    return step
+
+_NO_DEFAULT = object()
+
+@_step_builder("lookup")
+def _build_lookup(params: Dict[str, Any]) -> TransformStep:
+    table_id = params.get("table")
+    if not table_id:
+        raise ValueError("lookup needs a 'table' param")
+    table = lookup_index.table(str(table_id))
+    default = params.get("default", _NO_DEFAULT)
+    field = params.get("field")
+
+    def step(value, source_data):
+        entries = table.entries
+        if entries is None:
+            raise LookupError(f"Lookup table {table_id} is not loaded")
+        entry = entries.get(value, _NO_DEFAULT)
+        if entry is _NO_DEFAULT and not isinstance(value, str):
+            entry = entries.get(str(value), _NO_DEFAULT)
+        if entry is _NO_DEFAULT:
+            if default is _NO_DEFAULT:
+                raise KeyError(f"{value!r} not found in lookup table {table_id}")
+            return default
+        # Object entries can be narrowed to one of their fields
+        return entry[field] if field is not None else entry
+    return step
 
 def convert_date_format_to_python(format_str):
     """Convert user-friendly date format to Python's datetime format"""
@@ -0,0 +1,350 @@
+# backend/app/services/validation_service.py
+from typing import Dict, Any, List, Optional, Callable, NamedTuple, Set, Tuple
+from collections import OrderedDict
+from datetime import datetime
+import logging
+import re
+import threading
+from app.models.system_model import SystemModel, FieldDefinition
+from app.services.metrics_service import count_validation_failures
+
+logger = logging.getLogger(__name__)
+
+# Maximum number of compiled system model validators kept in memory
+MAX_MODEL_VALIDATORS = 64
+
+class ValidationIssue(NamedTuple):
+    """A single finding produced while validating a field value"""
+    field: str
+    code: str
+    message: str
+    severity: str  # "info", "warning" or "error"
+
+# A compiled check returns None when the value passes
+FieldCheck = Callable[[Any], Optional[ValidationIssue]]
+# A column test for a check, given a column and the set of value types in it: True when
+# the check passes for every value, False when values must be checked one by one
+ColumnPass = Callable[[List[Any], Set[type]], bool]
+
+_NO_ISSUES: Tuple[ValidationIssue, ...] = ()
+
+class FieldValidator:
+    """Pre-compiled type and constraint checks for one system model field"""
+    __slots__ = ("name", "data_type", "required", "checks", "column_passes")
+
+    def __init__(self, field: FieldDefinition):
+        self.name = field.name
+        self.data_type = field.data_type
+        self.required = field.required
+        checks = []
+        type_check = _build_type_check(field.name, field.data_type)
+        if type_check is not None:
+            checks.append(type_check)
+        checks.extend(_build_constraint_checks(field.name, field.constraints or {}))
+        self.checks: Tuple[FieldCheck, ...] = tuple(check for check, _ in checks)
+        # Whole-column shortcut for each check, where one exists
+        self.column_passes: Tuple[Optional[ColumnPass], ...] = tuple(passes for _, passes in checks)
+
+    def validate(self, value: Any) -> Tuple[ValidationIssue, ...]:
+        """Run every check against a value and return the issues found"""
+        issues = None
+        for check in self.checks:
+            issue = check(value)
+            if issue is not None:
+                if issues is None:
+                    issues = []
+                issues.append(issue)
+        return tuple(issues) if issues else _NO_ISSUES
+
+class SystemModelValidator:
+    """Validator for one system model version with a field name index"""
+    __slots__ = ("model_id", "required_fields", "validators")
+
+    def __init__(self, system_model: SystemModel):
+        self.model_id = system_model.id
+        self.required_fields: Tuple[str, ...] = tuple(f.name for f in system_model.fields if f.required)
+        self.validators: Dict[str, FieldValidator] = {f.name: FieldValidator(f) for f in system_model.fields}
+
+    def check(self, data: Dict[str, Any]) -> List[ValidationIssue]:
+        """Collect every issue for a transformed record without raising"""
+        # Check required fields
+        issues = [
+            ValidationIssue(field_name, "missing_required", f"Required field {field_name} is missing", "error")
+            for field_name in self.required_fields
+            if field_name not in data
+        ]
+
+        validators = self.validators
+        for field_name, field_value in data.items():
+            # Skip validation if field is not defined in the system model
+            validator = validators.get(field_name)
+            if validator is not None:
+                issues.extend(validator.validate(field_value))
+
+        return issues
+
+    def check_columns(self, columns: Dict[str, List[Any]], row_count: int) -> List[Optional[List[ValidationIssue]]]:
+        """Column-wise check() for a batch whose rows all hold exactly the given fields.
+
+        Returns one entry per row: None when the row has no issues, otherwise the
+        same issues, in the same order, that check() would report for that row.
+        """
+        row_issues: List[Optional[List[ValidationIssue]]] = [None] * row_count
+
+        # Every row has the same fields, so a missing required field is missing everywhere
+        missing = [
+            ValidationIssue(field_name, "missing_required", f"Required field {field_name} is missing", "error")
+            for field_name in self.required_fields
+            if field_name not in columns
+        ]
+        if missing:
+            row_issues = [list(missing) for _ in range(row_count)]
+
+        validators = self.validators
+        for field_name, column in columns.items():
+            validator = validators.get(field_name)
+            if validator is None:
+                continue
+            types = set(map(type, column))
+            for check, passes in zip(validator.checks, validator.column_passes):
+                # Most columns pass as a whole; only the others are checked value by value
+                if passes is not None and passes(column, types):
+                    continue
+                for row, issue in enumerate(map(check, column)):
+                    if issue is not None:
+                        if row_issues[row] is None:
+                            row_issues[row] = [issue]
+                        else:
+                            row_issues[row].append(issue)
+
+        model_id = self.model_id
+        for issues in row_issues:
+            if issues:
+                count_validation_failures(model_id, issues)
+
+        return row_issues
+
+    def validate(self, data: Dict[str, Any]) -> List[ValidationIssue]:
+        """Validate a transformed record, raising ValueError on missing fields or constraint errors"""
+        issues = self.check(data)
+        if issues:
+            count_validation_failures(self.model_id, issues)
+            raise_for_errors(issues)
+        return issues
+
+def error_message(issues: List[ValidationIssue]) -> Optional[str]:
+    """Join every error-level issue into one message, or None if there are none"""
+    errors = [issue.message for issue in issues if issue.severity == "error"]
+    return "; ".join(errors) if errors else None
+
+def raise_for_errors(issues: List[ValidationIssue]) -> None:
+    """Raise a ValueError listing every error-level issue, if there are any"""
+    message = error_message(issues)
+    if message is not None:
+        raise ValueError(message)
+
+_model_validators: "OrderedDict[tuple, SystemModelValidator]" = OrderedDict()
+_model_validators_lock = threading.Lock()
+
+def get_model_validator(system_model: SystemModel) -> SystemModelValidator:
+    """Get the compiled validator for a system model version, compiling it if needed"""
+    key = (system_model.id, system_model.version, system_model.updated_at)
+
+    with _model_validators_lock:
+        validator = _model_validators.get(key)
+        if validator is not None:
+            _model_validators.move_to_end(key)
+            return validator
+
+    validator = SystemModelValidator(system_model)
+
+    with _model_validators_lock:
+        _model_validators[key] = validator
+        _model_validators.move_to_end(key)
+        while len(_model_validators) > MAX_MODEL_VALIDATORS:
+            _model_validators.popitem(last=False)
+
+    return validator
+
+def validate_transformed_data(data: Dict[str, Any], system_model: SystemModel) -> List[ValidationIssue]:
+    """Validate transformed data against system model"""
+    return get_model_validator(system_model).validate(data)
+
+def validate_field_value(field_name: str, value: Any, data_type: str, constraints: Optional[Dict[str, Any]] = None) -> List[ValidationIssue]:
+    """Validate a field value against its expected data type and constraints"""
+    field = FieldDefinition(name=field_name, data_type=data_type, constraints=constraints)
+    return list(FieldValidator(field).validate(value))
+
+def _types_pass(passing_types: Set[type]) -> ColumnPass:
+    """Column test for a type check that passes exactly the values of the given types"""
+    passing_types = frozenset(passing_types) | {type(None)}
+    return lambda column, types: types <= passing_types
+
+def _build_type_check(field_name: str, data_type: str) -> Optional[Tuple[FieldCheck, Optional[ColumnPass]]]:
+    """Compile the data type check for a field, with its column test"""
+    # These issues do not depend on the value, so each is built once
+    if data_type == "string":
+        coerced = ValidationIssue(field_name, "coerced", f"Field {field_name} was automatically converted to string", "info")
+
+        def check(value):
+            if value is None or isinstance(value, str):
+                return None
+            return coerced
+        return check, _types_pass({str})
+
+    if data_type == "integer":
+        return _conversion_check(field_name, int, int, "integer"), _types_pass({int, bool})
+
+    if data_type == "decimal":
+        return _conversion_check(field_name, (int, float), float, "decimal"), _types_pass({int, bool, float})
+
+    if data_type == "boolean":
+        coerced = ValidationIssue(field_name, "coerced", f"Field {field_name} was validated as boolean", "info")
+
+        def check(value):
+            if value is None or isinstance(value, bool):
+                return None
+            # Boolean might be represented as string, int, etc.
+            return coerced
+        return check, _types_pass({bool})
+
+    if data_type == "date":
+        invalid_type = ValidationIssue(
+            field_name, "invalid_type",
+            f"Field {field_name} should be a date string or datetime object", "warning"
+        )
+
+        def check(value):
+            # The actual format validation happens during transformation
+            if value is None or isinstance(value, (str, datetime)):
+                return None
+            return invalid_type
+        return check, _types_pass({str, datetime})
+
+    # Other data types could be added here
+    return None
+
+def _conversion_check(field_name: str, accepted_types, convert: Callable[[Any], Any], type_label: str) -> FieldCheck:
+    """Check that a value has, or can be converted to, the expected type"""
+    def check(value):
+        if value is None or isinstance(value, accepted_types):
+            return None
+        try:
+            convert(value)
+        except (ValueError, TypeError) as e:
+            return ValidationIssue(field_name, "invalid_type", f"Field {field_name}: {str(e)}", "warning")
+        return ValidationIssue(field_name, "coerced", f"Field {field_name} was validated as {type_label}", "info")
+    return check
+
+_STR_TYPES = frozenset({str})
+_NUMBER_TYPES = frozenset({int, float})
+
+def _build_constraint_checks(field_name: str, constraints: Dict[str, Any]) -> List[Tuple[FieldCheck, Optional[ColumnPass]]]:
+    """Compile enum, range and pattern constraints for a field, each with its column test"""
+    checks = []
+
+    allowed_values = constraints.get("values")
+    if allowed_values:
+        allowed = frozenset(allowed_values)
+
+        def check_enum(value):
+            try:
+                if value is None or value in allowed:
+                    return None
+            except TypeError:
+                # Unhashable values can never be allowed
+                pass
+            return ValidationIssue(
+                field_name, "not_allowed",
+                f"Field {field_name} value {value!r} is not one of the allowed values", "error"
+            )
+
+        allowed_or_none = allowed | {None}
+
+        def enum_passes(column, types):
+            try:
+                return allowed_or_none.issuperset(column)
+            except TypeError:
+                return False
+        checks.append((check_enum, enum_passes))
+
+    min_length = _constraint_number(constraints, "min_length", int)
+    max_length = _constraint_number(constraints, "max_length", int)
+    if min_length is not None or max_length is not None:
+        def check_length(value):
+            if not isinstance(value, str):
+                return None
+            if min_length is not None and len(value) < min_length:
+                return ValidationIssue(field_name, "too_short", f"Field {field_name} is shorter than {min_length} characters", "error")
+            if max_length is not None and len(value) > max_length:
+                return ValidationIssue(field_name, "too_long", f"Field {field_name} is longer than {max_length} characters", "error")
+            return None
+
+        def length_passes(column, types):
+            if str not in types:
+                return True
+            if not types <= _STR_TYPES:
+                return False
+            lengths = list(map(len, column))
+            return ((min_length is None or min(lengths) >= min_length)
+                    and (max_length is None or max(lengths) <= max_length))
+        checks.append((check_length, length_passes))
+
+    min_value = _constraint_number(constraints, "min_value", float)
+    max_value = _constraint_number(constraints, "max_value", float)
+    if min_value is not None or max_value is not None:
+        def check_range(value):
+            if value is None or isinstance(value, bool):
+                return None
+            try:
+                number = float(value)
+            except (ValueError, TypeError):
+                # Type problems are reported by the type check
+                return None
+            if min_value is not None and number < min_value:
+                return ValidationIssue(field_name, "below_minimum", f"Field {field_name} is below the minimum of {min_value:g}", "error")
+            if max_value is not None and number > max_value:
+                return ValidationIssue(field_name, "above_maximum", f"Field {field_name} is above the maximum of {max_value:g}", "error")
+            return None
+
+        def range_passes(column, types):
+            if not types <= _NUMBER_TYPES:
+                return False
+            lowest, highest = min(column), max(column)
+            # min() and max() are unreliable once NaN is involved
+            if lowest != lowest or highest != highest:
+                return False
+            return ((min_value is None or lowest >= min_value)
+                    and (max_value is None or highest <= max_value))
+        checks.append((check_range, range_passes))
+
+    pattern = constraints.get("format")
+    if pattern:
+        try:
+            search = re.compile(pattern).search
+        except re.error as e:
+            logger.warning(f"Ignoring invalid format constraint on field {field_name}: {str(e)}")
+        else:
+            def check_pattern(value):
+                if not isinstance(value, str) or search(value):
+                    return None
+                return ValidationIssue(field_name, "pattern_mismatch", f"Field {field_name} does not match the required format", "error")
+
+            def pattern_passes(column, types):
+                if str not in types:
+                    return True
+                return types <= _STR_TYPES and all(map(search, column))
+            checks.append((check_pattern, pattern_passes))
+
+    return checks
+
+def _constraint_number(constraints: Dict[str, Any], key: str, convert: Callable[[Any], Any]) -> Optional[Any]:
+    """Read a numeric constraint, ignoring blank or malformed values"""
+    value = constraints.get(key)
+    if value is None or value == "":
+        return None
+    try:
+        return convert(value)
+    except (ValueError, TypeError):
+        logger.warning(f"Ignoring invalid {key} constraint: {value!r}")
+        return None
@@ -0,0 +1,2 @@
+# Benchmarks for the transformation engine; run from the backend directory, e.g.
+#   python -m benchmarks.transform_benchmark
@@ -0,0 +1,131 @@
+# backend/benchmarks/response_benchmark.py
+"""Serialization benchmarks for API responses.
+
+Run from the backend directory:
+
+    python -m benchmarks.response_benchmark --sizes 10,100,1000 --repeats 5
+    python -m benchmarks.response_benchmark --baseline benchmarks/results/<earlier run>.json
+
+Two suites compare FastAPI's default response path (response_model validation,
+jsonable_encoder and the stdlib json encoder) with FastJSONResponse:
+  - lists:  List[MappingConfig] as returned by GET /api/mappings/
+  - batch:  the result document of POST /api/mappings/{config_id}/transform
+
+Both paths must produce the same JSON; a mismatch is reported as failed.
+"""
+from typing import Dict, Any, List, Optional
+from datetime import datetime
+import argparse
+import asyncio
+import json
+import logging
+import os
+import sys
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+from app.api.responses import FastJSONResponse, orjson
+from app.models.mapping import MappingConfig
+from app.services.transform_service import get_compiled_mapping
+from benchmarks.trade_generator import build_fx_forward_config, generate_trades, load_fx_forward_model
+from benchmarks.transform_benchmark import RESULTS_DIR, _int_list, _measure, _run_metadata, compare_results
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SIZES = [10, 100, 1000]
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark API response serialization")
+    parser.add_argument("--sizes", type=_int_list, default=DEFAULT_SIZES, help="Comma-separated numbers of configs per list")
+    parser.add_argument("--records", type=int, default=10000, help="Records in the batch-transform response")
+    parser.add_argument("--repeats", type=int, default=5, help="Repetitions per measurement; the best is kept")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for the synthetic trade generator")
+    parser.add_argument("--suite", action="append", choices=["lists", "batch"], help="Suites to run (default: all)")
+    parser.add_argument("--output", help="Result file (default: benchmarks/results/response-<timestamp>.json)")
+    parser.add_argument("--baseline", help="Earlier result file to compare against")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    logging.getLogger("app").setLevel(logging.WARNING)
+    logger.info(f"Encoder: {'orjson ' + orjson.__version__ if orjson is not None else 'json (orjson not installed)'}")
+
+    suites = args.suite or ["lists", "batch"]
+    loop = asyncio.new_event_loop()
+    results: List[Dict[str, Any]] = []
+    try:
+        if "lists" in suites:
+            results.extend(benchmark_config_lists(loop, args.sizes, args.repeats))
+        if "batch" in suites:
+            results.extend(benchmark_batch_response(loop, args.records, args.repeats, args.seed))
+    finally:
+        loop.close()
+
+    report = {"meta": _run_metadata(args), "results": results}
+    output = args.output or os.path.join(RESULTS_DIR, f"response-{datetime.now():%Y%m%d-%H%M%S}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(report, f, indent=2)
+    logger.info(f"Results written to {output}")
+
+    if args.baseline:
+        with open(args.baseline, "r") as f:
+            compare_results(json.load(f)["results"], results)
+    return 0
+
+def benchmark_config_lists(loop: asyncio.AbstractEventLoop, sizes: List[int], repeats: int) -> List[Dict[str, Any]]:
+    """Measure encoding a list of validated mapping configurations"""
+    template = build_fx_forward_config()
+    field = create_response_field(name="response", type_=List[MappingConfig])
+    results = []
+    for size in sizes:
+        configs = [template.copy(update={"id": f"config-{index}", "name": f"Config {index}"}, deep=True) for index in range(size)]
+        results.extend(_compare_paths(loop, "lists", f"configs-{size}", size, repeats, configs, field))
+    return results
+
+def benchmark_batch_response(loop: asyncio.AbstractEventLoop, records: int, repeats: int, seed: int) -> List[Dict[str, Any]]:
+    """Measure encoding a batch-transform result document"""
+    config = build_fx_forward_config()
+    compiled = get_compiled_mapping(config, load_fx_forward_model())
+    transformed = compiled.transform_batch(generate_trades(records, seed=seed))
+    failed = sum(1 for result in transformed if result["error"] is not None)
+    content = {
+        "config_id": config.id,
+        "total": len(transformed),
+        "succeeded": len(transformed) - failed,
+        "failed": failed,
+        "results": transformed
+    }
+    return _compare_paths(loop, "batch", f"transform-{records}", records, repeats, content, None)
+
+def _compare_paths(loop: asyncio.AbstractEventLoop, suite: str, name: str, records: int, repeats: int,
+                   content: Any, field) -> List[Dict[str, Any]]:
+    """Time the default and fast response paths on the same content"""
+    def default_body() -> bytes:
+        # What FastAPI does with an endpoint's return value, then JSONResponse's encoding
+        encoded = loop.run_until_complete(serialize_response(field=field, response_content=content))
+        return JSONResponse(encoded).body
+
+    def fast_body() -> bytes:
+        return FastJSONResponse(content).body
+
+    # The fast path must not change what clients receive
+    mismatch = int(json.loads(default_body()) != json.loads(fast_body()))
+    if mismatch:
+        logger.warning(f"{name}: fast response differs from the default response")
+
+    results = []
+    for path, render in (("default", default_body), ("fast", fast_body)):
+        def run():
+            render()
+            return mismatch
+        result = _measure(suite, f"{name}/{path}", records, repeats, run, path=path)
+        result["bytes"] = len(render())
+        results.append(result)
+
+    speedup = results[0]["seconds"] / results[1]["seconds"] if results[1]["seconds"] else 0.0
+    logger.info(f"{name}: fast path {speedup:.1f}x the default")
+    results[1]["speedup"] = speedup
+    return results
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,184 @@
+# backend/benchmarks/trade_generator.py
+from typing import Dict, Any, List, Tuple
+from datetime import date, datetime, timedelta
+import json
+import os
+import random
+from app.models.mapping import MappingConfig
+from app.models.system_model import SystemModel, FieldDefinition
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SYSTEM_MODELS_FILE = os.path.join(BACKEND_DIR, "system_models.json")
+MAPPING_CONFIGS_FILE = os.path.join(BACKEND_DIR, "mapping_configs.json")
+
+CURRENCIES = ["EUR", "USD", "GBP", "JPY", "CHF", "AUD", "CAD", "CLP", "MXN", "BRL"]
+COUNTERPARTIES = ["acme bank ltd", "globex capital", "initech markets", "umbrella trust", "banco del sur"]
+
+# Source-side description of a generated trade: field name -> data type
+TRADE_FIELDS = {
+    "trade_id": "string",
+    "base_currency": "string",
+    "quote_currency": "string",
+    "currency_pair": "string",
+    "buy_sell": "enum",
+    "notional": "decimal",
+    "rate": "decimal",
+    "value_date": "date",
+    "trade_date": "date",
+    "settled": "boolean",
+    "counterparty": "string",
+    "reference": "string"
+}
+
+# One representative rule per transformation type, applied to a generated trade field
+TRANSFORMATION_CASES: Dict[str, Dict[str, Any]] = {
+    "direct": {"source_field": "trade_id", "transformation": None},
+    "left": {"source_field": "currency_pair", "transformation": {"type": "left", "params": {"count": 3}}},
+    "right": {"source_field": "currency_pair", "transformation": {"type": "right", "params": {"count": 3}}},
+    "substring": {"source_field": "trade_id", "transformation": {"type": "substring", "params": {"startPosition": 2, "length": 6}}},
+    "replace": {"source_field": "currency_pair", "transformation": {"type": "replace", "params": {"find": "/", "replace": "", "replaceAll": True}}},
+    "case": {"source_field": "counterparty", "transformation": {"type": "case", "params": {"caseType": "upper"}}},
+    "regex": {"source_field": "reference", "transformation": {"type": "regex", "params": {"pattern": r"REF-(\d{4})-(\d+)", "group": 2}}},
+    "split": {"source_field": "currency_pair", "transformation": {"type": "split", "params": {"delimiter": "/", "index": 1}}},
+    "concat": {"source_field": "quote_currency", "transformation": {"type": "concat", "params": {"fields": ["base_currency"], "separator": "/"}}},
+    "format_date": {"source_field": "value_date", "transformation": {"type": "format_date", "params": {"source_format": "MM/DD/YYYY", "target_format": "DD-MM-YYYY"}}},
+    "numeric_format": {"source_field": "notional", "transformation": {"type": "numeric_format", "params": {"decimalPlaces": 2}}},
+    "boolean_convert": {"source_field": "settled", "transformation": {"type": "boolean_convert", "params": {}}},
+    "enum_map": {"source_field": "buy_sell", "transformation": {"type": "enum_map", "params": {"mapping": {"B": "BUY", "S": "SELL"}}}}
+}
+
+# Fully mapped fx-forward-v1 configuration for the generated trades
+FX_FORWARD_MAPPINGS = [
+    {"source_field": "trade_id", "target_field": "tradeId", "transformation": None},
+    {"source_field": "base_currency", "target_field": "baseCurrency", "transformation": {"type": "case", "params": {"caseType": "upper"}}},
+    {"source_field": "quote_currency", "target_field": "quoteCurrency", "transformation": {"type": "case", "params": {"caseType": "upper"}}},
+    {"source_field": "notional", "target_field": "amount", "transformation": {"type": "numeric_format", "params": {"decimalPlaces": 2}}},
+    {"source_field": "rate", "target_field": "rate", "transformation": {"type": "numeric_format", "params": {}}},
+    {"source_field": "value_date", "target_field": "valueDate", "transformation": {"type": "format_date", "params": {"source_format": "MM/DD/YYYY", "target_format": "DD-MM-YYYY"}}},
+    {"source_field": "buy_sell", "target_field": "direction", "transformation": {"type": "enum_map", "params": {"mapping": {"B": "BUY", "S": "SELL"}}}},
+    {"source_field": "currency_pair", "target_field": "currencyPair", "transformation": None}
+]
+
+def generate_trades(count: int, seed: int = 0) -> List[Dict[str, Any]]:
+    """Generate synthetic FX forward trades as a bank would send them"""
+    rng = random.Random(seed)
+    start = date(2024, 1, 2)
+    trades = []
+
+    for i in range(count):
+        base, quote = rng.sample(CURRENCIES, 2)
+        value_date = start + timedelta(days=rng.randrange(730))
+        trade_date = value_date - timedelta(days=rng.randrange(1, 90))
+        trades.append({
+            "trade_id": f"FX{seed:02d}{i:08d}",
+            "base_currency": base.lower() if rng.random() < 0.2 else base,
+            "quote_currency": quote,
+            "currency_pair": f"{base}/{quote}",
+            "buy_sell": rng.choice("BS"),
+            "notional": f"{rng.randrange(10_000, 50_000_000) / 100:.2f}",
+            "rate": f"{rng.uniform(0.5, 150):.5f}",
+            "value_date": value_date.strftime("%m/%d/%Y"),
+            "trade_date": trade_date.strftime("%Y-%m-%d"),
+            "settled": rng.choice(["Y", "N", "true", "false"]),
+            "counterparty": rng.choice(COUNTERPARTIES),
+            "reference": f"REF-{value_date.year}-{i:06d}"
+        })
+
+    return trades
+
+def generate_records(source_fields: List[FieldDefinition], count: int, seed: int = 0) -> List[Dict[str, Any]]:
+    """Generate records for an arbitrary source field list, based on each field's data type"""
+    rng = random.Random(seed)
+    start = date(2024, 1, 2)
+    generators = {
+        "integer": lambda: str(rng.randrange(1_000_000)),
+        "decimal": lambda: f"{rng.uniform(0, 1_000_000):.2f}",
+        "boolean": lambda: rng.choice(["true", "false", "Y", "N"]),
+        "date": lambda: (start + timedelta(days=rng.randrange(730))).strftime("%m/%d/%Y"),
+        "enum": lambda: rng.choice(["Yes", "No", "BUY", "SELL"])
+    }
+
+    records = []
+    for i in range(count):
+        record = {}
+        for field in source_fields:
+            generate = generators.get(field.data_type)
+            record[field.name] = generate() if generate else f"{field.name}-{i:06d}/{rng.choice(CURRENCIES)} abc"
+        records.append(record)
+    return records
+
+def load_fx_forward_model() -> SystemModel:
+    """Load fx-forward-v1 from system_models.json for benchmarking"""
+    return next(m for m in load_system_models() if m.id == "fx-forward-v1")
+
+def load_system_models() -> List[SystemModel]:
+    with open(SYSTEM_MODELS_FILE, "r") as f:
+        return [SystemModel(**model_data) for model_data in json.load(f)]
+
+def load_mapping_configs() -> List[MappingConfig]:
+    with open(MAPPING_CONFIGS_FILE, "r") as f:
+        return [MappingConfig(**config_data) for config_data in json.load(f)]
+
+def build_fx_forward_config() -> MappingConfig:
+    """A mapping configuration that fills every fx-forward-v1 field from a generated trade"""
+    return _build_config("bench-fx-forward", "fx-forward-v1", FX_FORWARD_MAPPINGS)
+
+def build_transformation_case(transform_type: str) -> Tuple[MappingConfig, SystemModel]:
+    """A one-field configuration and model that isolate a single transformation type"""
+    case = TRANSFORMATION_CASES[transform_type]
+    config = _build_config(
+        f"bench-type-{transform_type}", f"bench-type-{transform_type}",
+        [dict(case, target_field="value")]
+    )
+    model = _build_model(f"bench-type-{transform_type}", [FieldDefinition(name="value", data_type="string")])
+    return config, model
+
+def build_wide_case(width: int) -> Tuple[MappingConfig, SystemModel]:
+    """A configuration with `width` mappings, cycling through every transformation type"""
+    types = list(TRANSFORMATION_CASES)
+    mappings = []
+    fields = []
+    for i in range(width):
+        case = TRANSFORMATION_CASES[types[i % len(types)]]
+        target_field = f"field{i:03d}"
+        mappings.append(dict(case, target_field=target_field))
+        fields.append(FieldDefinition(name=target_field, data_type="string", required=True))
+
+    config = _build_config(f"bench-width-{width}", f"bench-width-{width}", mappings)
+    return config, _build_model(f"bench-width-{width}", fields)
+
+# The transformations that are one operation applied to a whole column
+COLUMN_OPERATION_TYPES = ["left", "right", "substring", "case", "replace", "enum_map", "numeric_format", "boolean_convert"]
+
+def build_column_operations_case(direct: bool = False) -> Tuple[MappingConfig, SystemModel]:
+    """One mapping per column-wise transformation type; with direct, the same fields copied unchanged"""
+    mappings = []
+    fields = []
+    for transform_type in COLUMN_OPERATION_TYPES:
+        case = TRANSFORMATION_CASES[transform_type]
+        mappings.append({
+            "source_field": case["source_field"],
+            "target_field": transform_type,
+            "transformation": None if direct else case["transformation"]
+        })
+        fields.append(FieldDefinition(name=transform_type, data_type="string", required=True))
+
+    case_id = "bench-column-operations" + ("-direct" if direct else "")
+    return _build_config(case_id, case_id, mappings), _build_model(case_id, fields)
+
+def _build_config(config_id: str, system_model_id: str, mappings: List[Dict[str, Any]]) -> MappingConfig:
+    now = datetime.now()
+    return MappingConfig(
+        id=config_id,
+        name=config_id,
+        bank_id="Benchmark Bank",
+        system_model_id=system_model_id,
+        source_fields=[FieldDefinition(name=name, data_type=data_type) for name, data_type in TRADE_FIELDS.items()],
+        mappings=mappings,
+        created_at=now,
+        updated_at=now
+    )
+
+def _build_model(model_id: str, fields: List[FieldDefinition]) -> SystemModel:
+    now = datetime.now()
+    return SystemModel(id=model_id, name=model_id, version="1.0.0", fields=fields, created_at=now, updated_at=now)
@@ -0,0 +1,312 @@
+# backend/benchmarks/transform_benchmark.py
+"""Throughput and latency benchmarks for the transformation engine.
+
+Run from the backend directory:
+
+    python -m benchmarks.transform_benchmark --records 20000 --repeats 3
+    python -m benchmarks.transform_benchmark --baseline benchmarks/results/<earlier run>.json
+
+Four suites are measured on synthetic fx-forward-v1 trades:
+  - types:    each transformation type on its own, through apply_transformation and transform_data
+  - widths:   configurations of increasing width at several batch sizes, row and columnar engines
+  - configs:  the fx-forward-v1 configurations from mapping_configs.json plus a fully mapped one
+  - bulk:     a large file (1M records by default) at the job batch size, for the column-wise
+              transformation types; also reports the columnar speedup and the most any engine
+              could gain (see benchmark_bulk)
+
+Results are written as JSON so runs can be compared over time.
+"""
+from typing import Dict, Any, List, Callable, Optional
+from datetime import datetime
+from itertools import cycle, islice
+import argparse
+import json
+import logging
+import os
+import platform
+import subprocess
+import sys
+import time
+from app.services.transform_service import apply_transformation, get_compiled_mapping, transform_data
+from app.services.columnar_service import transform_records
+from app.services.job_service import JOB_BATCH_SIZE
+from benchmarks.trade_generator import (
+    TRANSFORMATION_CASES, build_column_operations_case, build_fx_forward_config, build_transformation_case,
+    build_wide_case, generate_records, generate_trades, load_fx_forward_model, load_mapping_configs
+)
+
+logger = logging.getLogger(__name__)
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+
+DEFAULT_WIDTHS = [1, 4, 8, 16, 32, 64]
+DEFAULT_BATCH_SIZES = [100, 1000, 10000]
+DEFAULT_BULK_RECORDS = 1000000
+ENGINES = ["row", "columnar"]
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the transformation engine")
+    parser.add_argument("--records", type=int, default=20000, help="Records per measurement")
+    parser.add_argument("--repeats", type=int, default=3, help="Repetitions per measurement; the best is kept")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for the synthetic trade generator")
+    parser.add_argument("--suite", action="append", choices=["types", "widths", "configs", "bulk"], help="Suites to run (default: all)")
+    parser.add_argument("--widths", type=_int_list, default=DEFAULT_WIDTHS, help="Comma-separated config widths")
+    parser.add_argument("--batch-sizes", type=_int_list, default=DEFAULT_BATCH_SIZES, help="Comma-separated batch sizes")
+    parser.add_argument("--bulk-records", type=int, default=DEFAULT_BULK_RECORDS, help="Records per file in the bulk suite")
+    parser.add_argument("--bulk-batch-size", type=int, default=JOB_BATCH_SIZE, help="Batch size in the bulk suite (default: the job batch size)")
+    parser.add_argument("--output", help="Result file (default: benchmarks/results/transform-<timestamp>.json)")
+    parser.add_argument("--baseline", help="Earlier result file to compare against")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    # The engine logs at debug level while compiling; keep that out of the measurements
+    logging.getLogger("app").setLevel(logging.WARNING)
+
+    suites = args.suite or ["types", "widths", "configs", "bulk"]
+    trades = generate_trades(args.records, seed=args.seed)
+    results: List[Dict[str, Any]] = []
+
+    if "types" in suites:
+        results.extend(benchmark_transformation_types(trades, args.repeats))
+    if "widths" in suites:
+        results.extend(benchmark_config_widths(trades, args.widths, args.batch_sizes, args.repeats))
+    if "configs" in suites:
+        results.extend(benchmark_configs(trades, args.repeats, args.seed))
+    if "bulk" in suites:
+        results.extend(benchmark_bulk(trades, args.bulk_records, args.bulk_batch_size, args.repeats))
+
+    report = {"meta": _run_metadata(args), "results": results}
+    output = args.output or os.path.join(RESULTS_DIR, f"transform-{datetime.now():%Y%m%d-%H%M%S}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(report, f, indent=2)
+    logger.info(f"Results written to {output}")
+
+    if args.baseline:
+        with open(args.baseline, "r") as f:
+            compare_results(json.load(f)["results"], results)
+    return 0
+
+def benchmark_transformation_types(trades: List[Dict[str, Any]], repeats: int) -> List[Dict[str, Any]]:
+    """Measure each transformation type in isolation"""
+    results = []
+    for transform_type, case in TRANSFORMATION_CASES.items():
+        config, model = build_transformation_case(transform_type)
+        source_field = case["source_field"]
+        transformation = case["transformation"] or {"type": "direct"}
+
+        # apply_transformation compiles the rule on every call, as callers of the old API did
+        values = [(trade[source_field], trade) for trade in trades]
+        results.append(_record_latencies(
+            "types", f"{transform_type}/apply_transformation", len(values), repeats,
+            lambda item: apply_transformation(item[0], transformation, item[1]), values,
+            transformation_type=transform_type, mode="apply_transformation"
+        ))
+
+        # transform_data runs the cached compiled plan plus validation
+        results.append(_record_latencies(
+            "types", f"{transform_type}/transform_data", len(trades), repeats,
+            lambda trade: transform_data(trade, config, model), trades,
+            transformation_type=transform_type, mode="transform_data"
+        ))
+    return results
+
+def benchmark_config_widths(trades: List[Dict[str, Any]], widths: List[int], batch_sizes: List[int], repeats: int) -> List[Dict[str, Any]]:
+    """Measure batch throughput for configurations of increasing width"""
+    results = []
+    for width in widths:
+        config, model = build_wide_case(width)
+        compiled = get_compiled_mapping(config, model)
+        for batch_size in batch_sizes:
+            batches = [trades[i:i + batch_size] for i in range(0, len(trades), batch_size)]
+            for engine in ENGINES:
+                def run():
+                    failed = 0
+                    for batch in batches:
+                        # Repeats would otherwise be served from the memo when TRANSFORM_MEMO_MAX_MB is set
+                        for result in transform_records(compiled, batch, engine=engine, memoize=False):
+                            if result["error"] is not None:
+                                failed += 1
+                    return failed
+
+                result = _measure("widths", f"width-{width}/batch-{batch_size}/{engine}", len(trades), repeats, run,
+                                  width=width, batch_size=batch_size, engine=engine)
+                result["mean_batch_ms"] = result["seconds"] / len(batches) * 1000
+                results.append(result)
+    return results
+
+def benchmark_configs(trades: List[Dict[str, Any]], repeats: int, seed: int) -> List[Dict[str, Any]]:
+    """Measure the stored fx-forward-v1 configurations and a fully mapped one"""
+    model = load_fx_forward_model()
+    cases = [(build_fx_forward_config(), trades)]
+    for config in load_mapping_configs():
+        if config.system_model_id != model.id:
+            logger.info(f"Skipping config {config.name}: system model {config.system_model_id} is not in system_models.json")
+            continue
+        cases.append((config, generate_records(config.source_fields, len(trades), seed=seed)))
+
+    results = []
+    for config, records in cases:
+        results.append(_record_latencies(
+            "configs", f"{config.name}/transform_data", len(records), repeats,
+            lambda record: transform_data(record, config, model), records,
+            width=len(config.mappings), mode="transform_data"
+        ))
+        compiled = get_compiled_mapping(config, model)
+        for engine in ENGINES:
+            def run():
+                return sum(1 for result in transform_records(compiled, records, engine=engine, memoize=False) if result["error"] is not None)
+
+            results.append(_measure("configs", f"{config.name}/batch/{engine}", len(records), repeats, run,
+                                    width=len(config.mappings), batch_size=len(records), engine=engine))
+    return results
+
+def benchmark_bulk(trades: List[Dict[str, Any]], total_records: int, batch_size: int, repeats: int) -> List[Dict[str, Any]]:
+    """Measure a large file transformed batch by batch, as a job does, with each engine.
+
+    The generated trades are reused until total_records have been transformed. The
+    same fields mapped without transformations measure what any engine pays to read
+    the records and build output rows and results; the row engine's time over that
+    bare cost is the most a faster engine could gain on this configuration.
+    """
+    batch_size = max(1, min(batch_size, len(trades)))
+    batches = [trades[start:start + batch_size] for start in range(0, len(trades) - batch_size + 1, batch_size)]
+    batch_count = max(1, total_records // batch_size)
+    records = batch_count * batch_size
+
+    results = []
+    seconds = {}
+    for case, direct in (("column-operations", False), ("column-operations-direct", True)):
+        config, model = build_column_operations_case(direct=direct)
+        compiled = get_compiled_mapping(config, model)
+        for engine in ENGINES:
+            def run():
+                failed = 0
+                for batch in islice(cycle(batches), batch_count):
+                    # Without the memo, reused records are transformed every time
+                    for result in transform_records(compiled, batch, engine=engine, memoize=False):
+                        if result["error"] is not None:
+                            failed += 1
+                return failed
+
+            result = _measure("bulk", f"{case}/records-{records}/batch-{batch_size}/{engine}", records, repeats, run,
+                              width=len(config.mappings), batch_size=batch_size, engine=engine)
+            seconds[(case, engine)] = result["seconds"]
+            results.append(result)
+
+    row_seconds = seconds[("column-operations", "row")]
+    speedup = row_seconds / seconds[("column-operations", "columnar")]
+    ceiling = row_seconds / min(seconds[("column-operations-direct", engine)] for engine in ENGINES)
+    results[1]["speedup"] = speedup
+    results[1]["speedup_ceiling"] = ceiling
+    logger.info(f"Columnar speedup on column-wise transformations: {speedup:.1f}x (at most {ceiling:.1f}x without any transformation work)")
+    return results
+
+def compare_results(baseline: List[Dict[str, Any]], current: List[Dict[str, Any]]) -> None:
+    """Log the records/sec change of every measurement present in both runs"""
+    previous = {result["name"]: result for result in baseline}
+    logger.info(f"{'benchmark':<60} {'baseline':>12} {'current':>12} {'change':>8}")
+    for result in current:
+        before = previous.get(result["name"])
+        if before is None or not before.get("records_per_sec"):
+            continue
+        change = result["records_per_sec"] / before["records_per_sec"] - 1
+        logger.info(f"{result['name']:<60} {before['records_per_sec']:>12,.0f} {result['records_per_sec']:>12,.0f} {change:>+8.1%}")
+
+def _measure(suite: str, name: str, records: int, repeats: int, run: Callable[[], int], **labels) -> Dict[str, Any]:
+    """Time a whole run several times and report the best; run() returns the failed record count"""
+    best = None
+    failed = 0
+    for _ in range(max(repeats, 1)):
+        start = time.perf_counter()
+        failed = run()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+
+    result = _result(suite, name, records, best, failed, labels)
+    _log_result(result)
+    return result
+
+def _record_latencies(suite: str, name: str, records: int, repeats: int, call: Callable[[Any], Any],
+                      items: List[Any], **labels) -> Dict[str, Any]:
+    """Time every call individually, keeping the fastest repetition's latency distribution"""
+    perf_counter = time.perf_counter
+    best = None
+    best_latencies: List[float] = []
+    failed = 0
+    for _ in range(max(repeats, 1)):
+        latencies = []
+        append = latencies.append
+        failed = 0
+        for item in items:
+            start = perf_counter()
+            try:
+                call(item)
+            except Exception:
+                failed += 1
+            append(perf_counter() - start)
+        elapsed = sum(latencies)
+        if best is None or elapsed < best:
+            best, best_latencies = elapsed, latencies
+
+    result = _result(suite, name, records, best, failed, labels)
+    best_latencies.sort()
+    result["latency_us"].update({
+        "p50": _percentile(best_latencies, 0.50) * 1e6,
+        "p95": _percentile(best_latencies, 0.95) * 1e6,
+        "p99": _percentile(best_latencies, 0.99) * 1e6,
+        "max": best_latencies[-1] * 1e6 if best_latencies else 0.0
+    })
+    _log_result(result)
+    return result
+
+def _result(suite: str, name: str, records: int, seconds: float, failed: int, labels: Dict[str, Any]) -> Dict[str, Any]:
+    result = {"suite": suite, "name": name}
+    result.update(labels)
+    result.update({
+        "records": records,
+        "failed": failed,
+        "seconds": seconds,
+        "records_per_sec": records / seconds if seconds else 0.0,
+        "latency_us": {"mean": seconds / records * 1e6 if records else 0.0}
+    })
+    return result
+
+def _percentile(sorted_values: List[float], fraction: float) -> float:
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(fraction * len(sorted_values)))]
+
+def _log_result(result: Dict[str, Any]) -> None:
+    failed = f" ({result['failed']} failed)" if result["failed"] else ""
+    logger.info(f"{result['name']:<60} {result['records_per_sec']:>12,.0f} rec/s {result['latency_us']['mean']:>9.2f} us/rec{failed}")
+
+def _run_metadata(args: argparse.Namespace) -> Dict[str, Any]:
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+
+    return {
+        "timestamp": datetime.now().isoformat(),
+        "git_commit": commit,
+        "python": sys.version.split()[0],
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "records": args.records,
+        "repeats": args.repeats,
+        "seed": args.seed,
+        "environment": {
+            key: os.environ[key] for key in ("TRANSFORM_ENGINE", "COLUMNAR_MIN_BATCH", "TRANSFORM_DIAGNOSTICS", "TRANSFORM_STEP_SAMPLE_EVERY")
+            if key in os.environ
+        }
+    }
+
+def _int_list(value: str) -> List[int]:
+    return [int(part) for part in value.split(",") if part.strip()]
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -52,12 +52,32 @@ async def migrate_mapping_configs():
     else:
         logger.info("No mapping configurations file found, skipping migration")
 
+# Format constraints stored with their repetition braces missing, and their intended form
+FORMAT_FIXES = {
+    "^[A-Z]3/[A-Z]3$": "^[A-Z]{3}/[A-Z]{3}$",
+}
+
+async def fix_format_constraints():
+    """Repair known-bad format constraints in stored system models"""
+    for model in await system_model_repository.get_all():
+        fixed = False
+        for field in model.fields:
+            pattern = (field.constraints or {}).get("format")
+            if pattern in FORMAT_FIXES:
+                field.constraints = dict(field.constraints, format=FORMAT_FIXES[pattern])
+                fixed = True
+        if fixed:
+            logger.info(f"Fixing format constraints of system model: {model.name}")
+            await system_model_repository.update(model.id, model.dict(), expected_revision=model.revision)
+    logger.info("Format constraint fixes completed")
+
 async def main():
     """Main migration function"""
     logger.info("Starting migration")
     await connect_to_mongo()
     
     await migrate_system_models()
+    await fix_format_constraints()
     await migrate_mapping_configs()
     
     await close_mongo_connection()
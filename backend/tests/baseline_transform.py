@@ -0,0 +1,195 @@
+# backend/tests/baseline_transform.py
+"""apply_transformation as it was before mappings were compiled, kept as the reference
+the compiled transformation steps are tested against. Only its print() calls are removed."""
+from typing import Dict, Any
+from datetime import datetime
+import re
+
+def apply_transformation(value: Any, transformation: Dict[str, Any], source_data: Dict[str, Any]) -> Any:
+    """Apply a transformation to a value"""
+    # Handle both dictionary and object access patterns
+    if hasattr(transformation, 'type'):
+        transform_type = transformation.type
+        params = transformation.params or {}
+    else:
+        transform_type = transformation.get("type")
+        params = transformation.get("params", {})
+
+    if transform_type == "direct":
+        return value
+
+    # String transformations
+    elif transform_type == "left" and isinstance(value, str):
+        try:
+            count = int(params.get("count", 0))
+            return value[:count]
+        except:
+            return value
+
+    elif transform_type == "right" and isinstance(value, str):
+        try:
+            count = int(params.get("count", 0))
+            return value[-count:] if count > 0 else value
+        except:
+            return value
+
+    elif transform_type == "substring" and isinstance(value, str):
+        try:
+            start_pos = int(params.get("startPosition", 0))
+            length = int(params.get("length", 0))
+            return value[start_pos:start_pos + length]
+        except:
+            return value
+
+    elif transform_type == "replace" and isinstance(value, str):
+        try:
+            find_str = params.get("find", "")
+            replace_str = params.get("replace", "")
+            replace_all = params.get("replaceAll", False)
+
+            if replace_all:
+                return value.replace(find_str, replace_str)
+            else:
+                return value.replace(find_str, replace_str, 1)
+        except:
+            return value
+
+    elif transform_type == "case" and isinstance(value, str):
+        try:
+            case_type = params.get("caseType", "").lower()
+            if case_type == "upper":
+                return value.upper()
+            elif case_type == "lower":
+                return value.lower()
+            elif case_type == "title":
+                return value.title()
+            return value
+        except:
+            return value
+
+    elif transform_type == "regex" and isinstance(value, str):
+        try:
+            pattern = params.get("pattern", "")
+            group = params.get("group", 0)  # Default to the entire match (group 0)
+
+            # Try to match the pattern against the value
+            match = re.search(pattern, value)
+
+            if match:
+                # Extract the specified group or the entire match if group=0
+                return match.group(group)
+            else:
+                # No match found, return original value
+                return value
+        except Exception:
+            return value
+
+    elif transform_type == "split" and isinstance(value, str):
+        try:
+            # Split string and get specified index
+            delimiter = params.get("delimiter", ",")
+            index = params.get("index", 0)
+            parts = value.split(delimiter)
+            return parts[index] if 0 <= index < len(parts) else value
+        except:
+            return value
+
+    elif transform_type == "concat":
+        try:
+            # Concatenate multiple fields
+            fields = params.get("fields", [])
+            separator = params.get("separator", "")
+            values = [source_data.get(field, "") for field in fields]
+            values.append(str(value))  # Add the current field value
+            return separator.join(str(v) for v in values if v)
+        except:
+            return value
+
+    # Date transformations
+    elif transform_type == "format_date":
+        try:
+            # Convert date format
+            source_format_str = params.get("source_format", "MM/DD/YYYY")
+            target_format_str = params.get("target_format", "YYYY-MM-DD")
+
+            # Convert user-friendly formats to Python datetime formats
+            source_format = convert_date_format_to_python(source_format_str)
+            target_format = convert_date_format_to_python(target_format_str)
+
+            # Handle if value is already a datetime object
+            if isinstance(value, datetime):
+                dt = value
+            else:
+                # Parse the date string to a datetime object
+                dt = datetime.strptime(str(value), source_format)
+
+            # Format the datetime object back to a string
+            return dt.strftime(target_format)
+        except Exception:
+            # Return original value if transformation fails
+            return value
+
+    # Numeric transformations
+    elif transform_type == "numeric_format":
+        try:
+            if not isinstance(value, (int, float)):
+                # Try to convert to number
+                value = float(value)
+                if value.is_integer():
+                    value = int(value)
+
+            # Apply formatting options
+            decimal_places = params.get("decimalPlaces")
+            if decimal_places is not None:
+                value = round(float(value), decimal_places)
+
+            return value
+        except:
+            return value
+
+    # Boolean transformations
+    elif transform_type == "boolean_convert":
+        try:
+            # Handle various boolean representations
+            if isinstance(value, bool):
+                return value
+
+            true_values = params.get("trueValues", ["true", "yes", "1", "t", "y"])
+            if str(value).lower() in map(str.lower, true_values):
+                return True
+
+            false_values = params.get("falseValues", ["false", "no", "0", "f", "n"])
+            if str(value).lower() in map(str.lower, false_values):
+                return False
+
+            return bool(value)
+        except:
+            return value
+
+    # Enum value mapping
+    elif transform_type == "enum_map":
+        # Map enum values
+        mapping_dict = params.get("mapping", {})
+        return mapping_dict.get(value, value)
+
+    # Unknown transformation type
+    return value
+
+def convert_date_format_to_python(format_str):
+    """Convert user-friendly date format to Python's datetime format"""
+    # Translation mapping
+    translation = {
+        "MM": "%m",
+        "M": "%m",
+        "DD": "%d",
+        "D": "%d",
+        "YYYY": "%Y",
+        "YY": "%y"
+    }
+
+    # Replace each pattern with its Python equivalent
+    result = format_str
+    for pattern, replacement in translation.items():
+        result = result.replace(pattern, replacement)
+
+    return result
@@ -0,0 +1,60 @@
+# backend/tests/conftest.py
+import asyncio
+import json
+import os
+from datetime import datetime
+from pathlib import Path
+
+# Tests run offline against the in-memory storage backend; this must be set before the app reads it
+os.environ["STORAGE_BACKEND"] = "memory"
+
+import pytest
+from fastapi.testclient import TestClient
+from app.db.backends import create_backend
+from app.db.database import db
+from app.models.mapping import MappingConfig
+from app.models.system_model import SystemModel
+
+SYSTEM_MODELS_FILE = Path(__file__).resolve().parent.parent / "system_models.json"
+
+@pytest.fixture(scope="session", autouse=True)
+def _stop_workers():
+    """Stop the transform worker pool started by the tests"""
+    yield
+    from app.services.executor_service import shutdown_executor
+    shutdown_executor()
+
+@pytest.fixture
+def fx_model() -> SystemModel:
+    """The seeded FX Forward system model"""
+    with open(SYSTEM_MODELS_FILE) as f:
+        return SystemModel(**json.load(f)[0])
+
+@pytest.fixture
+def make_config():
+    """Build a mapping configuration from a list of field mappings"""
+    def make(mappings, system_model_id="fx-forward-v1", **fields):
+        now = datetime.now()
+        fields.setdefault("id", "test-config")
+        return MappingConfig(
+            name="Test", bank_id="test-bank", system_model_id=system_model_id,
+            source_fields=[], mappings=mappings, created_at=now, updated_at=now, **fields
+        )
+    return make
+
+@pytest.fixture
+def client():
+    """API client on a fresh in-memory database, seeded with the default system models"""
+    from app.main import app
+    with TestClient(app) as test_client:
+        yield test_client
+
+@pytest.fixture(params=["memory", "sqlite"])
+def storage(request, tmp_path, monkeypatch):
+    """Each offline storage backend in turn, as the database the repositories use"""
+    backend = create_backend(request.param, sqlite_path=str(tmp_path / "storage.db"))
+    asyncio.run(backend.connect())
+    monkeypatch.setattr(db, "backend", backend)
+    monkeypatch.setattr(db, "db", backend.database)
+    yield backend
+    asyncio.run(backend.close())
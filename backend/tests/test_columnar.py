@@ -0,0 +1,111 @@
+# backend/tests/test_columnar.py
+from datetime import datetime
+import json
+import random
+import pytest
+from app.models.system_model import SystemModel
+from app.services.columnar_service import transform_records
+from app.services.transform_service import compile_mapping
+from app.services.validation_service import SystemModelValidator
+from test_transform_steps import RULES, VALUES
+
+EQUIVALENCE_MODEL = SystemModel(
+    id="equivalence", name="Equivalence", version="1", created_at=datetime(2024, 1, 1), updated_at=datetime(2024, 1, 1),
+    fields=[
+        {"name": "t0", "data_type": "string"},
+        {"name": "t1", "data_type": "decimal", "constraints": {"min_value": 2}},
+        {"name": "t2", "data_type": "enum", "constraints": {"values": ["BUY", "SELL", "abc"]}},
+    ]
+)
+
+EXTRA_RULES = [
+    {"type": "boolean_convert", "params": {"trueValues": ["x"], "falseValues": ["true"]}},
+    {"type": "numeric_format", "params": {"decimalPlaces": "2"}},
+    {"type": "enum_map", "params": {"mapping": None}},
+]
+
+EXTRA_VALUES = [[1], {"a": 1}]
+
+def _random_batch(rng, make_config, index):
+    mappings = [
+        {
+            "source_field": f"f{rng.randint(0, 4)}",
+            "target_field": f"t{rng.randint(0, 4)}",
+            "transformation": rng.choice(RULES + EXTRA_RULES + [None])
+        }
+        for _ in range(rng.randint(0, 6))
+    ]
+    config = make_config(mappings, system_model_id=EQUIVALENCE_MODEL.id, id=f"equivalence-{index}")
+
+    values = VALUES + EXTRA_VALUES
+    # Half of the batches hold the same value in every field, so whole columns share a type
+    uniform = rng.random() < 0.5
+    records = []
+    for _ in range(rng.randint(1, 40)):
+        if rng.random() < 0.05:
+            records.append(5)  # Not a record at all
+            continue
+        base = rng.choice(values)
+        records.append({
+            f"f{field}": base if uniform else rng.choice(values)
+            for field in range(5) if uniform or rng.random() < 0.9
+        })
+    return config, records
+
+def _encoded(results):
+    return json.dumps(results, default=repr)
+
+@pytest.mark.parametrize("seed", range(4))
+def test_columnar_engine_matches_row_engine(seed, make_config):
+    rng = random.Random(seed)
+    for index in range(100):
+        config, records = _random_batch(rng, make_config, index)
+        compiled = compile_mapping(config, EQUIVALENCE_MODEL)
+        row = transform_records(compiled, records, 10, engine="row", memoize=False)
+        columnar = transform_records(compiled, records, 10, engine="columnar", memoize=False)
+        assert _encoded(columnar) == _encoded(row), (config.mappings, records)
+
+def test_columnar_engine_reports_errors_per_record(make_config, fx_model):
+    config = make_config([{"source_field": "ccy", "target_field": "baseCurrency"}])
+    records = [{"ccy": "EUR"}, {"ccy": "EURO"}, "not a record"]
+    results = transform_records(compile_mapping(config, fx_model), records, engine="columnar", memoize=False)
+    assert [result["index"] for result in results] == [0, 1, 2]
+    assert all(result["output"] is None and result["error"] for result in results)
+    assert "baseCurrency is longer than 3 characters" in results[1]["error"]
+
+COLUMN_MODEL = SystemModel(
+    id="columns", name="Columns", version="1", created_at=datetime(2024, 1, 1), updated_at=datetime(2024, 1, 1),
+    fields=[
+        {"name": "s", "data_type": "string", "required": True,
+         "constraints": {"min_length": 2, "max_length": 4, "format": "^[a-z]+$"}},
+        {"name": "d", "data_type": "decimal", "constraints": {"min_value": 0, "max_value": 100}},
+        {"name": "i", "data_type": "integer"},
+        {"name": "e", "data_type": "enum", "constraints": {"values": ["A", "B"]}},
+        {"name": "b", "data_type": "boolean"},
+        {"name": "t", "data_type": "date"},
+        {"name": "r", "data_type": "string", "required": True},
+    ]
+)
+
+# Columns that pass as a whole, and ones that do not, value by value
+COLUMNS = {
+    "s": [["ab", "abcd", "xyz"], ["ab", "a", "abcde"], ["ab", "AB", None], ["ab", 12, "cd"], [None, None, None]],
+    "d": [[0, 50.5, 100], [-1, 5, 101], [1.0, float("nan"), 2], ["5", 5, None], [True, 1, 2]],
+    "i": [[1, 2, 3], [1, "2", "x"], [1, True, None]],
+    "e": [["A", "B", None], ["A", "C", "B"], ["A", ["B"], "B"]],
+    "b": [[True, False, None], [True, "yes", 0]],
+    "t": [["2024-01-01", datetime(2024, 1, 1), None], ["2024-01-01", 20240101, None]],
+}
+
+def _column_cases():
+    for field_name, columns in COLUMNS.items():
+        for position, column in enumerate(columns):
+            yield pytest.param(field_name, column, id=f"{field_name}-{position}")
+
+@pytest.mark.parametrize("field_name, column", list(_column_cases()))
+def test_check_columns_matches_check(field_name, column):
+    validator = SystemModelValidator(COLUMN_MODEL)
+    columns = {field_name: column}
+    rows = [{field_name: value} for value in column]
+    expected = [validator.check(row) or None for row in rows]
+    assert validator.check_columns(columns, len(column)) == expected
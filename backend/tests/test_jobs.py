@@ -0,0 +1,117 @@
+# backend/tests/test_jobs.py
+import json
+import os
+import threading
+import time
+from datetime import datetime
+import pytest
+from app.db.repositories import job_repository
+from app.models.job import TransformJob
+from app.services import job_service
+from app.services.job_service import RESULT_STORES, job_manager
+
+TRADES = [
+    {"tradeId": "T1", "baseCurrency": "EUR", "quoteCurrency": "USD", "amount": 1000000.0, "rate": 1.0842, "valueDate": "15-03-2024", "side": "B"},
+    {"tradeId": "T2", "baseCurrency": "GBP", "quoteCurrency": "USD", "amount": 500000.0, "rate": 1.2701, "valueDate": "15-03-2024", "side": "S"},
+    {"tradeId": "T3", "baseCurrency": "EUR", "quoteCurrency": "JPY", "amount": 250000.0, "rate": 162.3, "valueDate": "15-03-2024", "side": "X"},
+]
+
+UPLOAD = "".join(json.dumps(trade) + "\n" for trade in TRADES).encode()
+
+@pytest.fixture
+def data_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(job_manager, "data_dir", str(tmp_path))
+    monkeypatch.setattr(RESULT_STORES["local"], "directory", str(tmp_path / "results"))
+    return tmp_path
+
+@pytest.fixture
+def config_id(client):
+    mappings = [{"source_field": field, "target_field": field}
+                for field in ("tradeId", "baseCurrency", "quoteCurrency", "amount", "rate", "valueDate")]
+    mappings.append({"source_field": "side", "target_field": "direction",
+                     "transformation": {"type": "enum_map", "params": {"mapping": {"B": "BUY", "S": "SELL"}}}})
+    response = client.post("/api/mappings/", json={
+        "name": "Jobs", "bank_id": "bank-a", "system_model_id": "fx-forward-v1", "source_fields": [], "mappings": mappings
+    })
+    assert response.status_code == 200
+    return response.json()["id"]
+
+def _submit(client, config_id):
+    response = client.post("/api/jobs/", data={"config_id": config_id}, files={"file": ("trades.jsonl", UPLOAD)})
+    assert response.status_code == 202
+    return response.json()
+
+def _wait_for(client, job_id, *statuses):
+    deadline = time.monotonic() + 10
+    while time.monotonic() < deadline:
+        job = client.get(f"/api/jobs/{job_id}").json()
+        if job["status"] in statuses:
+            return job
+        time.sleep(0.01)
+    raise AssertionError(f"job {job_id} is still {job['status']}")
+
+def test_job_progress_and_result(client, data_dir, config_id):
+    job = _submit(client, config_id)
+    assert job["status"] == "queued" and job["filename"] == "trades.jsonl"
+
+    job = _wait_for(client, job["id"], "completed", "failed")
+    assert job["status"] == "completed"
+    assert (job["rows_done"], job["rows_failed"]) == (3, 1)
+    assert job["started_at"] and job["finished_at"] and job["result_size"]
+    # The upload is removed once the job finishes
+    assert not os.listdir(data_dir / "inputs")
+
+    response = client.get(f"/api/jobs/{job['id']}/result")
+    assert response.status_code == 200
+    assert response.headers["content-disposition"] == 'attachment; filename="trades-transformed.ndjson"'
+    results = [json.loads(line) for line in response.text.splitlines()]
+    assert [result["output"]["direction"] for result in results[:2]] == ["BUY", "SELL"]
+    assert results[2]["output"] is None and "direction" in results[2]["error"]
+    assert [listed["id"] for listed in client.get("/api/jobs/").json()] == [job["id"]]
+
+def test_cancel_a_running_job(client, data_dir, config_id, monkeypatch):
+    started, release = threading.Event(), threading.Event()
+    get_compiled_mapping = job_service.get_compiled_mapping
+
+    def blocking_get_compiled_mapping(*args):
+        started.set()
+        release.wait(10)
+        return get_compiled_mapping(*args)
+
+    monkeypatch.setattr(job_service, "get_compiled_mapping", blocking_get_compiled_mapping)
+    job = _submit(client, config_id)
+    assert started.wait(10)
+    # A job cannot be deleted while it runs
+    assert client.delete(f"/api/jobs/{job['id']}").status_code == 409
+
+    response = client.post(f"/api/jobs/{job['id']}/cancel")
+    assert response.status_code == 200 and response.json()["cancel_requested"]
+    release.set()
+
+    job = _wait_for(client, job["id"], "cancelled", "completed", "failed")
+    assert job["status"] == "cancelled"
+    assert client.post(f"/api/jobs/{job['id']}/cancel").status_code == 409
+    assert client.get(f"/api/jobs/{job['id']}/result").status_code == 409
+    assert not os.listdir(data_dir / "inputs") and not os.listdir(data_dir / "results")
+
+def test_delete_a_finished_job_and_its_result(client, data_dir, config_id):
+    job = _wait_for(client, _submit(client, config_id)["id"], "completed")
+    assert os.listdir(data_dir / "results")
+
+    assert client.delete(f"/api/jobs/{job['id']}").status_code == 200
+    assert client.get(f"/api/jobs/{job['id']}").status_code == 404
+    assert client.delete(f"/api/jobs/{job['id']}").status_code == 404
+    assert not os.listdir(data_dir / "results")
+
+def test_jobs_interrupted_by_a_restart_fail_and_lose_their_files(client, data_dir):
+    job = TransformJob(id="interrupted", config_id="c", bank_id="b", filename="trades.jsonl", input_format="ndjson",
+                       output_format="ndjson", status="running", created_at=datetime.now())
+    client.portal.call(job_repository.create, job)
+    for kind, filename in (("inputs", "interrupted"), ("results", "interrupted.ndjson.part")):
+        (data_dir / kind).mkdir(exist_ok=True)
+        (data_dir / kind / filename).write_bytes(UPLOAD)
+
+    client.portal.call(job_manager.recover)
+    recovered = client.get("/api/jobs/interrupted").json()
+    assert recovered["status"] == "failed" and recovered["error"] == "Interrupted by a server restart"
+    assert not os.listdir(data_dir / "inputs") and not os.listdir(data_dir / "results")
@@ -0,0 +1,146 @@
+# backend/tests/test_lookup_tables.py
+import asyncio
+import importlib
+import uuid
+from datetime import datetime, timedelta
+import pytest
+from app.db.errors import ConflictError
+from app.db.repositories.lookup_table_repository import LookupEntryRepository, LookupTableRepository
+from app.services.lookup_service import lookup_index
+
+# The package exports the repository instance under the module's name
+repository_module = importlib.import_module("app.db.repositories.lookup_table_repository")
+
+SIDES = {"id": "sides", "name": "Sides", "entries": {"B": "BUY", "S": "SELL", "$x.y": "odd key"}}
+
+@pytest.fixture
+def repository(storage, monkeypatch):
+    # Writers wait for a lease a couple of times, without sleeping
+    monkeypatch.setattr(repository_module, "CONSISTENT_READ_ATTEMPTS", 2)
+    monkeypatch.setattr(repository_module, "CONSISTENT_READ_DELAY_SECONDS", 0)
+    repository = LookupTableRepository()
+    asyncio.run(repository.ensure_indexes())
+    return repository
+
+def _run(coroutine):
+    return asyncio.run(coroutine)
+
+def test_one_document_per_entry(repository):
+    _run(repository.create(SIDES))
+    documents = _run(repository.entries.collection.find({"table_id": "sides"}, {"_id": 0}).sort("key", 1).to_list(length=None))
+    assert documents == [
+        {"id": LookupEntryRepository.entry_id("sides", key), "table_id": "sides", "key": key, "value": value}
+        for key, value in sorted(SIDES["entries"].items())
+    ]
+
+def test_only_changed_entries_are_written(repository, monkeypatch):
+    created = _run(repository.create(SIDES))
+    writes = []
+    write = repository.entries.write
+
+    async def recording_write(table_id, set_entries, remove_keys=()):
+        writes.append((set_entries, list(remove_keys)))
+        await write(table_id, set_entries, remove_keys)
+
+    monkeypatch.setattr(repository.entries, "write", recording_write)
+    entries = {"B": "BUY", "S": "SOLD", "X": "CROSS"}
+    updated = _run(repository.update("sides", dict(SIDES, entries=entries, revision=created.revision)))
+    assert writes == [({"S": "SOLD", "X": "CROSS"}, ["$x.y"])]
+    assert updated.entries == entries and _run(repository.get_by_id("sides")).entries == entries
+
+def test_every_write_moves_the_revision_on(repository):
+    created = _run(repository.create(SIDES))
+    updated = _run(repository.update("sides", dict(SIDES, revision=created.revision)))
+    patched = _run(repository.update_entries("sides", {"N": "NONE"}, ["B"], expected_revision=updated.revision))
+    assert (created.revision, updated.revision, patched.revision) == (0, 1, 2)
+    assert patched.entry_count == 3
+    assert _run(repository.get_revisions()) == {"sides": 2}
+
+def test_a_stale_revision_conflicts_without_writing(repository):
+    created = _run(repository.create(SIDES))
+    _run(repository.update_entries("sides", {"N": "NONE"}, [], expected_revision=created.revision))
+    with pytest.raises(ConflictError):
+        _run(repository.update("sides", dict(SIDES, entries={}, revision=created.revision)))
+    with pytest.raises(ConflictError):
+        _run(repository.update_entries("sides", {}, ["N"], expected_revision=created.revision))
+    assert _run(repository.get_by_id("sides")).entries == dict(SIDES["entries"], N="NONE")
+    assert _run(repository.update("missing", dict(SIDES, revision=0))) is None
+
+def _hold_lease(repository, until):
+    _run(repository.collection.find_one_and_update({"id": "sides"}, {"$set": {"writing_until": until}}))
+
+def test_writers_wait_for_a_held_lease(repository):
+    _run(repository.create(SIDES))
+    _hold_lease(repository, datetime.now() + timedelta(minutes=1))
+    with pytest.raises(ConflictError):
+        _run(repository.update_entries("sides", {"N": "NONE"}, []))
+    assert "N" not in _run(repository.entries.get_entries("sides"))
+
+def test_an_expired_lease_is_taken_over(repository):
+    _run(repository.create(SIDES))
+    # Left behind by a writer that crashed
+    _hold_lease(repository, datetime.now() - timedelta(seconds=1))
+    patched = _run(repository.update_entries("sides", {"N": "NONE"}, []))
+    assert patched.revision == 1
+    assert "writing_until" not in _run(repository.collection.find_one({"id": "sides"}))
+
+def test_a_writer_that_lost_its_lease_does_not_publish(repository):
+    _run(repository.create(SIDES))
+    header = _run(repository._acquire("sides", None))
+    # The lease expired and another writer took the table over
+    _hold_lease(repository, datetime.now() + timedelta(minutes=1))
+    with pytest.raises(ConflictError):
+        _run(repository._release("sides", header, {}))
+
+def test_readers_wait_for_a_write_in_progress(repository, monkeypatch):
+    monkeypatch.setattr(repository_module, "CONSISTENT_READ_ATTEMPTS", 100)
+    monkeypatch.setattr(repository_module, "CONSISTENT_READ_DELAY_SECONDS", 0.01)
+    _run(repository.create(SIDES))
+    header = _run(repository._acquire("sides", None))
+
+    async def read_while_writing():
+        reader = asyncio.create_task(repository.get_by_id("sides"))
+        await repository.entries.write("sides", {"B": "BOUGHT"})
+        await asyncio.sleep(0.05)
+        # Half of the write is in, but the reader is still waiting for it to be published
+        assert not reader.done()
+        await repository.entries.write("sides", {"S": "SOLD"})
+        await repository._release("sides", header, {})
+        return await reader
+
+    table = _run(read_while_writing())
+    assert (table.revision, table.entries["B"], table.entries["S"]) == (1, "BOUGHT", "SOLD")
+
+@pytest.fixture
+def table_id(client):
+    # Lookup tables are indexed per process, so each test gets its own
+    table_id = f"sides-{uuid.uuid4()}"
+    assert client.post("/api/lookup-tables/", json=dict(SIDES, id=table_id)).status_code == 200
+    return table_id
+
+def test_writes_bump_the_index_generation(client, table_id):
+    generation = lookup_index.generation
+    table = client.get(f"/api/lookup-tables/{table_id}").json()
+    assert client.put(f"/api/lookup-tables/{table_id}", json=dict(table, entries={"B": "SELL"})).status_code == 200
+    assert lookup_index.generation == generation + 1
+    assert client.patch(f"/api/lookup-tables/{table_id}/entries", json={"set": {"S": "BUY"}}).status_code == 200
+    assert lookup_index.generation == generation + 2
+    assert lookup_index.table(table_id).entries == {"B": "SELL", "S": "BUY"}
+    assert client.delete(f"/api/lookup-tables/{table_id}").status_code == 200
+    assert lookup_index.generation == generation + 3
+
+def test_tables_in_use_cannot_be_deleted(client, table_id):
+    response = client.post("/api/mappings/", json={
+        "name": "Sides", "bank_id": "bank-a", "system_model_id": "fx-forward-v1", "source_fields": [],
+        "mappings": [{"source_field": "side", "target_field": "direction",
+                      "transformations": [{"type": "case", "params": {"caseType": "upper"}},
+                                          {"type": "lookup", "params": {"table": table_id}}]}]
+    })
+    assert response.status_code == 200
+    config_id = response.json()["id"]
+
+    response = client.delete(f"/api/lookup-tables/{table_id}")
+    assert response.status_code == 409 and config_id in response.json()["detail"]
+    assert client.delete(f"/api/mappings/{config_id}").status_code == 200
+    assert client.delete(f"/api/lookup-tables/{table_id}").status_code == 200
+    assert client.delete(f"/api/lookup-tables/{table_id}").status_code == 404
@@ -0,0 +1,58 @@
+# backend/tests/test_mapping_revisions.py
+import pytest
+
+CONFIG = {
+    "name": "Bank A FX",
+    "bank_id": "bank-a",
+    "system_model_id": "fx-forward-v1",
+    "source_fields": [],
+    "mappings": [{"source_field": "id", "target_field": "tradeId"}],
+}
+
+@pytest.fixture
+def config(client):
+    response = client.post("/api/mappings/", json=CONFIG)
+    assert response.status_code == 200
+    return response.json()
+
+def test_update_with_the_current_revision(client, config):
+    payload = dict(config, name="Renamed")
+    response = client.put(f"/api/mappings/{config['id']}", json=payload)
+    assert response.status_code == 200
+    assert response.json()["name"] == "Renamed"
+    assert response.json()["revision"] == config["revision"] + 1
+
+def test_update_from_a_stale_revision_conflicts(client, config):
+    first = client.put(f"/api/mappings/{config['id']}", json=dict(config, name="First"))
+    assert first.status_code == 200
+
+    # A second editor still holds the revision the first one updated
+    second = client.put(f"/api/mappings/{config['id']}", json=dict(config, name="Second"))
+    assert second.status_code == 409
+    assert client.get(f"/api/mappings/{config['id']}").json()["name"] == "First"
+
+def test_update_without_a_revision_is_refused(client, config):
+    payload = {key: value for key, value in config.items() if key != "revision"}
+    response = client.put(f"/api/mappings/{config['id']}", json=dict(payload, name="Blind"))
+    assert response.status_code == 428
+    assert client.get(f"/api/mappings/{config['id']}").json()["name"] == CONFIG["name"]
+
+def test_update_of_a_missing_config(client):
+    response = client.put("/api/mappings/does-not-exist", json=dict(CONFIG, revision=0))
+    assert response.status_code == 404
+
+@pytest.fixture
+def lookup_table(client):
+    response = client.post("/api/lookup-tables/", json={"id": "revision-sides", "name": "Sides", "entries": {"B": "BUY"}})
+    assert response.status_code == 200
+    return client.get("/api/lookup-tables/revision-sides").json()
+
+@pytest.mark.parametrize("path", ["/api/system-models/fx-forward-v1", "/api/lookup-tables/revision-sides"])
+def test_other_updates_need_the_current_revision(client, lookup_table, path):
+    current = client.get(path).json()
+    blind = {key: value for key, value in current.items() if key != "revision"}
+    assert client.put(path, json=dict(blind, name="Blind")).status_code == 428
+
+    assert client.put(path, json=dict(current, name="First")).status_code == 200
+    assert client.put(path, json=dict(current, name="Second")).status_code == 409
+    assert client.get(path).json()["name"] == "First"
@@ -0,0 +1,109 @@
+# backend/tests/test_record_readers.py
+import io
+import pytest
+from app.models.system_model import FieldDefinition
+from app.services import record_readers
+from app.services.record_readers import RecordError, detect_input_format, input_formats, open_record_reader
+
+def _read(input_format, data, **options):
+    return list(open_record_reader(input_format, io.BytesIO(data), **options))
+
+def test_every_format_is_registered():
+    assert set(input_formats()) == {"csv", "ndjson", "fix", "fixed_width"}
+
+@pytest.mark.parametrize("filename, expected", [
+    ("trades.csv", "csv"), ("TRADES.TSV", "csv"), ("trades.jsonl", "ndjson"), ("session.log", "fix"),
+    ("positions.dat", "fixed_width"), ("trades.xlsx", None), (None, None),
+])
+def test_detect_input_format(filename, expected):
+    assert detect_input_format(filename) == expected
+
+def test_unknown_format_is_rejected_before_reading():
+    with pytest.raises(ValueError):
+        open_record_reader("xml", io.BytesIO(b""))
+
+def test_csv_strips_headers_and_skips_blank_lines():
+    data = b" tradeId ;amount\r\nT1;100\r\n\r\nT2;200\r\n"
+    assert _read("csv", data, delimiter=";") == [
+        {"tradeId": "T1", "amount": "100"}, {"tradeId": "T2", "amount": "200"}
+    ]
+
+def test_csv_leaves_the_stream_open():
+    stream = io.BytesIO(b"a\n1\n")
+    assert list(open_record_reader("csv", stream)) == [{"a": "1"}]
+    assert not stream.closed
+
+def test_empty_csv_has_no_records():
+    assert _read("csv", b"") == []
+
+def test_ndjson_reports_bad_lines_and_keeps_going():
+    data = b'{"a": 1}\n\nnot json\n[1, 2]\n{"a": 2}'
+    records = _read("ndjson", data)
+    assert records[0] == {"a": 1} and records[3] == {"a": 2}
+    assert isinstance(records[1], RecordError) and "line 3" in records[1].message
+    assert isinstance(records[2], RecordError) and "not a JSON object" in records[2].message
+
+def test_ndjson_lines_across_read_chunks(monkeypatch):
+    monkeypatch.setattr(record_readers, "READ_CHUNK_SIZE", 7)
+    data = b"".join(b'{"n": %d, "text": "%s"}\n' % (n, b"x" * n) for n in range(20))
+    assert _read("ndjson", data) == [{"n": n, "text": "x" * n} for n in range(20)]
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 5, 64])
+def test_lines_match_split_whatever_the_chunk_size(monkeypatch, chunk_size):
+    monkeypatch.setattr(record_readers, "READ_CHUNK_SIZE", chunk_size)
+    for data in [b"", b"\n", b"a", b"a\n", b"\n\nab\n\ncd", b"abc\ndefgh\n\nxyz\n"]:
+        expected = data.split(b"\n")
+        if not expected[-1]:
+            expected.pop()
+        assert list(record_readers._iter_lines(io.BytesIO(data))) == expected
+
+@pytest.mark.parametrize("chunk_size", [3, 4, 64])
+def test_overlong_lines_are_reported_without_being_buffered(monkeypatch, chunk_size):
+    monkeypatch.setattr(record_readers, "READ_CHUNK_SIZE", chunk_size)
+    monkeypatch.setattr(record_readers, "MAX_LINE_BYTES", 10)
+    data = b'{"n": 1}\n' + b"x" * 25 + b'\n{"n": 234}\n{"n": 3}\n' + b"y" * 11
+    records = _read("ndjson", data)
+    assert [getattr(record, "message", record) for record in records] == [
+        {"n": 1}, "Line 2 is longer than 10 bytes", {"n": 234}, {"n": 3}, "Line 5 is longer than 10 bytes"
+    ]
+
+def test_overlong_fix_and_fixed_width_lines_are_reported(monkeypatch):
+    monkeypatch.setattr(record_readers, "MAX_LINE_BYTES", 20)
+    records = _read("fix", b"8=FIX.4.4|35=D|55=EUR/USD|\n8=FIX.4.4|35=8|\n")
+    assert isinstance(records[0], RecordError) and "Line 1 is longer" in records[0].message
+    assert records[1] == {"8": "FIX.4.4", "35": "8"}
+
+    records = _read("fixed_width", b"EUR\n" + b" " * 21 + b"\nGBP", source_fields=_fields({"length": 3}))
+    assert records[0] == {"f0": "EUR"} and records[2] == {"f0": "GBP"}
+    assert isinstance(records[1], RecordError) and "Line 2 is longer" in records[1].message
+
+@pytest.mark.parametrize("separator", [b"\x01", b"|", b"^A"])
+def test_fix_messages_are_keyed_by_tag(separator):
+    message = separator.join([b"8=FIX.4.4", b"35=D", b"55=EUR/USD", b"54=1", b"54=2", b""])
+    data = b"2024-03-15 10:00:00 IN " + message + b"\r\nheartbeat without a message\n"
+    assert _read("fix", data) == [{"8": "FIX.4.4", "35": "D", "55": "EUR/USD", "54": "2"}]
+
+def test_malformed_fix_message_is_reported():
+    records = _read("fix", b"8=FIX.4.4|35=D|garbage|\n8=FIX.4.4|35=8|\n")
+    assert isinstance(records[0], RecordError) and "line 1" in records[0].message
+    assert records[1] == {"8": "FIX.4.4", "35": "8"}
+
+def _fields(*constraints):
+    return [FieldDefinition(name=f"f{index}", data_type="string", constraints=c) for index, c in enumerate(constraints)]
+
+def test_fixed_width_fields_follow_each_other_unless_positioned():
+    source_fields = _fields({"length": 3}, {"length": 5}, {"length": 2, "position": 10})
+    data = b"EUR 100 xxGB\r\n\n   12345  US"
+    assert _read("fixed_width", data, source_fields=source_fields) == [
+        {"f0": "EUR", "f1": "100", "f2": "GB"},
+        {"f0": "", "f1": "12345", "f2": "US"},
+    ]
+
+@pytest.mark.parametrize("constraints", [None, {"length": "x"}, {"length": 0}, {"length": 2, "position": -1}])
+def test_fixed_width_needs_a_valid_layout(constraints):
+    with pytest.raises(ValueError):
+        open_record_reader("fixed_width", io.BytesIO(b""), source_fields=_fields(constraints))
+
+def test_fixed_width_needs_source_fields():
+    with pytest.raises(ValueError):
+        open_record_reader("fixed_width", io.BytesIO(b""))
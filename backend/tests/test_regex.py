@@ -0,0 +1,84 @@
+# backend/tests/test_regex.py
+import time
+import pytest
+from app.services import regex_service
+from app.services.columnar_service import transform_records
+from app.services.regex_service import BoundedRegex, RegexTimeout, max_input_length, regex_budget_exceeded
+from app.services.transform_service import compile_mapping
+from test_columnar import EQUIVALENCE_MODEL
+
+# Without the optional 'regex' package the budget is enforced before searching
+static_budget = pytest.mark.skipif(regex_service._timeout_engine is not None, reason="searches are abandoned on timeout instead")
+
+def _stopped(reason):
+    return sum(value for _, labels, value in regex_budget_exceeded.samples() if labels == (("reason", reason),))
+
+@pytest.mark.parametrize("params", [
+    {"pattern": "("},
+    {"pattern": r"(\d+)", "group": 2},
+    {"pattern": r"(?P<n>\d+)", "group": "m"},
+    {"pattern": r"(?P<n>\d+)", "template": r"\g<m>"},
+    {"pattern": r"(?P<n>\d+)", "timeout_ms": 0},
+    pytest.param({"pattern": r"(a+)+$"}, marks=static_budget),
+])
+def test_invalid_rules_are_refused_on_save(client, params):
+    response = client.post("/api/mappings/", json={
+        "name": "Regex", "bank_id": "bank-a", "system_model_id": "fx-forward-v1", "source_fields": [],
+        "mappings": [{"source_field": "id", "target_field": "tradeId", "transformation": {"type": "regex", "params": params}}]
+    })
+    assert response.status_code == 400
+    assert response.json()["detail"].startswith("Invalid regex: tradeId: ")
+
+def test_named_groups_and_templates():
+    pattern = r"^(?P<ccy>[A-Z]{3})(?P<tenor>\d+[DWMY])$"
+    assert BoundedRegex(pattern, group="tenor").extract("EUR3M") == "3M"
+    assert BoundedRegex(pattern, template=r"\g<ccy>/\g<tenor>").extract("EUR3M") == "EUR/3M"
+    # Values that do not match are kept
+    assert BoundedRegex(pattern, template=r"\g<ccy>/\g<tenor>").extract("EUR") == "EUR"
+
+@pytest.mark.parametrize("pattern, length", [
+    (r"[A-Z]{3}/[A-Z]{3}", 10000),
+    (r"(\d{1,3}\.){3}\d{1,3}", 10000),
+    (r"(?:EUR|USD)+", 999),
+    (r"(\d+)-(\w+)", 99),
+    (r".*.*.*x", 30),
+    (r"(a+)+$", -1),
+    (r"(a|aa)+", -1),
+    (r"(\d{1,3})+", -1),
+])
+def test_input_length_grows_with_the_budget_and_shrinks_with_each_repeat(pattern, length):
+    assert max_input_length(pattern, 50) == length
+
+@static_budget
+def test_nested_repeats_are_never_run():
+    stopped = _stopped("unsafe_pattern")
+    started = time.perf_counter()
+    with pytest.raises(RegexTimeout):
+        BoundedRegex(r"(a+)+$").extract("a" * 40 + "b")
+    assert time.perf_counter() - started < 0.05
+    assert _stopped("unsafe_pattern") == stopped + 1
+
+@static_budget
+def test_values_too_long_for_the_pattern_are_not_searched():
+    extract = BoundedRegex(r"\w+\w+x", group=0).extract
+    assert extract("ab" * 20 + "x") == "ab" * 20 + "x"
+    stopped = _stopped("input_length")
+    with pytest.raises(RegexTimeout):
+        extract("a" * 5000)
+    assert _stopped("input_length") == stopped + 1
+
+@static_budget
+def test_engines_report_values_that_are_not_searched_per_record(make_config):
+    config = make_config([{"source_field": "f", "target_field": "t0",
+                           "transformation": {"type": "regex", "params": {"pattern": r".*.*.*x"}}}],
+                         system_model_id=EQUIVALENCE_MODEL.id)
+    compiled = compile_mapping(config, EQUIVALENCE_MODEL)
+    records = [{"f": "abx"}, {"f": "a" * 100}, {"f": "a" * 100}, {"f": "x"}]
+    stopped = _stopped("input_length")
+    row = transform_records(compiled, records, engine="row", memoize=False)
+    columnar = transform_records(compiled, records, engine="columnar", memoize=False)
+    assert columnar == row
+    # The value is kept and the record still succeeds
+    assert [result["output"]["t0"] for result in row] == ["abx", "a" * 100, "a" * 100, "x"]
+    # Once per record with the row engine, once per distinct value with the columnar one
+    assert _stopped("input_length") == stopped + 3
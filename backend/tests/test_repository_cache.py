@@ -0,0 +1,69 @@
+# backend/tests/test_repository_cache.py
+import asyncio
+import pytest
+from app.db.backends.memory_backend import MemoryBackend
+from app.db.cache import RepositoryCache
+from app.db.database import db
+from app.db.repositories.mapping_repository import MappingRepository
+
+CONFIG = {
+    "name": "Bank A FX",
+    "bank_id": "bank-a",
+    "system_model_id": "fx-forward-v1",
+    "source_fields": [],
+    "mappings": [{"source_field": "id", "target_field": "tradeId"}],
+}
+
+@pytest.fixture
+def memory_db(monkeypatch):
+    monkeypatch.setattr(db, "db", MemoryBackend())
+    return db.db
+
+def test_values_read_before_an_invalidation_are_not_stored():
+    cache = RepositoryCache("test", max_size=2)
+    generation = cache.generation()
+    cache.invalidate("a")
+    cache.set("a", "stale", generation)
+    assert cache.get("a") is None
+    # Reads that start after the invalidation are stored, and other keys are unaffected
+    cache.set("a", "fresh", cache.generation())
+    cache.set("b", "fresh", generation)
+    assert cache.get("a") == cache.get("b") == "fresh"
+
+def test_keys_no_longer_tracked_count_as_just_invalidated():
+    cache = RepositoryCache("test", max_size=1)
+    generation = cache.generation()
+    cache.invalidate("a")
+    cache.invalidate("b")
+    cache.set("a", "stale", generation)
+    assert cache.get("a") is None
+    cache.clear()
+    cache.set("b", "stale", generation)
+    assert cache.get("b") is None
+
+def test_update_during_a_read_does_not_leave_the_old_version_cached(memory_db):
+    repository = MappingRepository()
+    collection = memory_db[repository.collection_name]
+    find_one = collection.find_one
+
+    async def scenario():
+        config = await repository.create(CONFIG)
+        read, release = asyncio.Event(), asyncio.Event()
+
+        async def slow_find_one(*args, **kwargs):
+            document = await find_one(*args, **kwargs)
+            read.set()
+            await release.wait()
+            return document
+
+        collection.find_one = slow_find_one
+        pending = asyncio.create_task(repository.get_by_id(config.id))
+        await read.wait()
+        await repository.update(config.id, dict(CONFIG, name="Renamed", revision=config.revision))
+        release.set()
+        assert (await pending).name == CONFIG["name"]
+
+        del collection.find_one
+        return await repository.get_by_id(config.id)
+
+    assert asyncio.run(scenario()).name == "Renamed"
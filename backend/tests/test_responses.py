@@ -0,0 +1,48 @@
+# backend/tests/test_responses.py
+from datetime import date, datetime
+from decimal import Decimal
+import json
+import pytest
+from app.api import responses
+from app.api.responses import FastJSONResponse, dumps
+
+@pytest.fixture(params=["orjson", "json"])
+def encoder(request, monkeypatch):
+    """Run a test with orjson, when it is installed, and with the standard library fallback"""
+    if request.param == "orjson":
+        if responses.orjson is None:
+            pytest.skip("orjson is not installed")
+    else:
+        monkeypatch.setattr(responses, "orjson", None)
+    return request.param
+
+def test_integers_beyond_64_bits(encoder):
+    trade_id = 123456789012345678901234
+    assert json.loads(dumps({"tradeId": trade_id, "amounts": [1, 2 ** 70]})) == {"tradeId": trade_id, "amounts": [1, 2 ** 70]}
+
+def test_nan_and_infinities_are_null(encoder):
+    content = {"rate": float("nan"), "nested": [{"amount": float("inf")}, -float("inf")], "ok": 1.5}
+    assert json.loads(dumps(content)) == {"rate": None, "nested": [{"amount": None}, None], "ok": 1.5}
+
+def test_nan_next_to_a_big_integer(encoder):
+    # Such content is rejected by orjson and handled by the standard library encoder
+    assert json.loads(dumps({"id": 2 ** 64, "rate": float("nan")})) == {"id": 2 ** 64, "rate": None}
+
+def test_extra_types(encoder):
+    content = {
+        "when": datetime(2024, 3, 15, 10, 30), "day": date(2024, 3, 15), "amount": Decimal("1.25"),
+        "tags": frozenset(["a"]), 1: "non-string key"
+    }
+    assert json.loads(dumps(content)) == {
+        "when": "2024-03-15T10:30:00", "day": "2024-03-15", "amount": 1.25, "tags": ["a"], "1": "non-string key"
+    }
+
+def test_unsupported_types_still_fail(encoder):
+    with pytest.raises(TypeError):
+        dumps({"value": object()})
+
+def test_both_encoders_agree():
+    if responses.orjson is None:
+        pytest.skip("orjson is not installed")
+    content = {"rate": float("nan"), "day": date(2024, 3, 15), "values": [1, 2.5, None, "x"]}
+    assert json.loads(dumps(content)) == json.loads(FastJSONResponse(content).body)
@@ -0,0 +1,22 @@
+# backend/tests/test_schema_inference.py
+import io
+import pytest
+from app.services.schema_inference_service import infer_column, infer_schema
+
+@pytest.mark.parametrize("values, data_type", [
+    (["1", "-2", "+30"], "integer"),
+    (["1.5", "2", "-0.25", ".5", "1e3", "2.5E-3"], "decimal"),
+    (["007", "012", "100"], "string"),
+    (["007.5", "01.25", "00.1"], "string"),
+    (["0.5", "0", "0e1"], "decimal"),
+    (["yes", "no", "Y"], "boolean"),
+    (["2024-03-15", "2024-12-31"], "date"),
+])
+def test_infer_column(values, data_type):
+    assert infer_column(values)["data_type"] == data_type
+
+def test_leading_zero_codes_keep_their_padding():
+    sample = io.BytesIO(b"account,amount\n00123,1.5\n00456,2\n00789,3.25\n")
+    result = infer_schema(sample)
+    fields = {field.name: field.data_type for field in result["fields"]}
+    assert fields == {"account": "string", "amount": "decimal"}
@@ -0,0 +1,133 @@
+# backend/tests/test_storage_backends.py
+import asyncio
+import sqlite3
+import threading
+from datetime import datetime
+import pytest
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
+from app.db.errors import ConflictError
+from app.db.repositories.job_repository import JobRepository
+from app.db.repositories.lookup_table_repository import LookupTableRepository
+from app.db.repositories.mapping_repository import MappingRepository
+from app.models.job import TransformJob
+
+CONFIG = {
+    "name": "Bank A FX",
+    "bank_id": "bank-a",
+    "system_model_id": "fx-forward-v1",
+    "source_fields": [],
+    "mappings": [{"source_field": "id", "target_field": "tradeId"}],
+}
+
+def _run(*repositories):
+    """Run a scenario against fresh repositories with their indexes in place"""
+    def run(scenario):
+        async def main():
+            for repository in repositories:
+                await repository.ensure_indexes()
+            return await scenario(*repositories)
+        return asyncio.run(main())
+    return run
+
+def test_mapping_configs(storage):
+    @_run(MappingRepository())
+    async def configs(repository):
+        first = await repository.create(CONFIG)
+        second = await repository.create(dict(CONFIG, bank_id="bank-b"))
+        # $in, served from the database rather than the cache
+        repository.cache.clear()
+        found = await repository.get_many([second.id, "missing", first.id])
+        # $set and $inc, returning the document after the update
+        updated = await repository.update(first.id, dict(CONFIG, name="Renamed", revision=first.revision))
+        with pytest.raises(ConflictError):
+            await repository.update(first.id, dict(CONFIG, name="Stale", revision=first.revision))
+        # $gt, sort, limit and a summary projection
+        page, cursor = await repository.get_page(1)
+        rest, end = await repository.get_page(1, cursor=cursor)
+        filtered = await repository.get_all(bank_id="bank-b")
+        deleted = await repository.delete(second.id)
+        return first, second, found, updated, (page, cursor, rest, end), filtered, deleted, await repository.get_all()
+
+    first, second, found, updated, pages, filtered, deleted, remaining = configs
+    assert set(found) == {first.id, second.id}
+    assert (updated.name, updated.revision, updated.created_at) == ("Renamed", first.revision + 1, first.created_at)
+    page, cursor, rest, end = pages
+    assert [item.id for item in page + rest] == sorted([first.id, second.id]) and end is None
+    assert not hasattr(page[0], "mappings")
+    assert [config.id for config in filtered] == [second.id]
+    assert deleted and [config.id for config in remaining] == [first.id]
+
+def test_unique_indexes(storage):
+    job = TransformJob(id="job-1", config_id="c", bank_id="b", filename="f.csv", input_format="csv",
+                       output_format="ndjson", created_at=datetime(2024, 1, 1))
+
+    @_run(JobRepository())
+    async def duplicate(repository):
+        await repository.create(job)
+        with pytest.raises(DuplicateKeyError):
+            await repository.create(job)
+        recent = [found.id for found in await repository.get_recent()]
+        with pytest.raises(DuplicateKeyError):
+            await repository.collection.insert_many([{"id": "job-2"}, {"id": "job-2"}])
+        await repository.collection.insert_one({"id": "job-3"})
+        with pytest.raises(DuplicateKeyError):
+            await repository.collection.find_one_and_update({"id": "job-3"}, {"$set": {"id": "job-1"}})
+        return recent, await repository.collection.count_documents({})
+
+    assert duplicate == (["job-1"], 2)
+
+def test_lookup_tables(storage):
+    @_run(LookupTableRepository())
+    async def tables(repository):
+        created = await repository.create({"id": "sides", "name": "Sides", "entries": {"B": "BUY", "S": "SELL", "$x.y": 1}})
+        # $or, $exists and $lt to take the lease; $set, $inc and $unset to release it
+        updated = await repository.update("sides", {"name": "Sides", "entries": {"B": "BUY", "X": "CROSS"}, "revision": created.revision})
+        await repository.update_entries("sides", {"S": "SELL"}, ["X"], expected_revision=updated.revision)
+        header = await repository.collection.find_one({"id": "sides"}, {"_id": 0})
+        summaries = await repository.get_all()
+        return await repository.get_by_id("sides"), header, summaries, await repository.get_revisions(["sides", "missing"])
+
+    table, header, summaries, revisions = tables
+    assert table.entries == {"B": "BUY", "S": "SELL"}
+    assert "writing_until" not in header and header["revision"] == 2 and header["entry_count"] == 2
+    assert [summary.id for summary in summaries] == ["sides"] and not hasattr(summaries[0], "entries")
+    assert revisions == {"sides": 2}
+
+def test_find_one_and_update_and_projection(storage):
+    @_run()
+    async def documents():
+        collection = storage.database["conformance"]
+        await collection.insert_many([{"id": "a", "n": 1, "tag": "x"}, {"id": "b", "n": 5}])
+        before = await collection.find_one_and_update({"id": "a"}, {"$inc": {"n": 1}, "$unset": {"tag": ""}}, projection={"_id": 0})
+        after = await collection.find_one_and_update({"id": "a"}, {"$set": {"m": [1, 2]}}, projection={"_id": 0, "n": 1},
+                                                     return_document=ReturnDocument.AFTER)
+        missing = await collection.find_one_and_update({"id": "c"}, {"$set": {"n": 0}})
+        excluded = await collection.find_one({"id": "a"}, {"_id": 0, "m": 0})
+        untagged = await collection.find({"tag": {"$exists": False}, "$or": [{"n": {"$lt": 3}}, {"id": "b"}]}, {"_id": 0, "id": 1}).to_list(length=None)
+        return before, after, missing, excluded, untagged
+
+    before, after, missing, excluded, untagged = documents
+    assert before == {"id": "a", "n": 1, "tag": "x"}
+    assert after == {"n": 2}
+    assert missing is None
+    assert excluded == {"id": "a", "n": 2}
+    assert untagged == [{"id": "a"}, {"id": "b"}]
+
+def test_sqlite_transaction_that_cannot_begin_releases_the_lock(tmp_path):
+    from app.db.backends.sqlite_backend import SqliteBackend
+    backend = SqliteBackend(str(tmp_path / "locked.db"))
+    asyncio.run(backend.connect())
+    # BEGIN IMMEDIATE fails inside a transaction that is already open
+    backend._connection.execute("BEGIN")
+    with pytest.raises(sqlite3.OperationalError):
+        with backend.transaction():
+            pass
+    backend._connection.execute("ROLLBACK")
+
+    acquired = []
+    thread = threading.Thread(target=lambda: acquired.append(backend._lock.acquire(timeout=1)))
+    thread.start()
+    thread.join()
+    assert acquired == [True]
+    asyncio.run(backend.close())
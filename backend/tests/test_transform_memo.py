@@ -0,0 +1,105 @@
+# backend/tests/test_transform_memo.py
+import uuid
+import pytest
+from app.services import regex_service
+from app.services.columnar_service import _run_engine
+from app.services.memo_service import transform_memo
+from app.services.transform_service import compile_mapping
+
+TRADE = {
+    "tradeId": "T1",
+    "baseCurrency": "Eur",
+    "quoteCurrency": "USD",
+    "amount": 1000000.0,
+    "rate": 1.0842,
+    "valueDate": "15-03-2024",
+    "side": "B",
+}
+
+PASSED_THROUGH = ["tradeId", "quoteCurrency", "amount", "rate", "valueDate"]
+
+@pytest.fixture
+def memo(monkeypatch):
+    """The shared transform memo, enabled and empty for one test"""
+    monkeypatch.setattr(transform_memo, "max_bytes", 16 * 1024 * 1024)
+    transform_memo.clear()
+    yield transform_memo
+    transform_memo.clear()
+
+@pytest.fixture
+def table_id(client):
+    # Lookup tables are indexed per process, so each test gets its own
+    table_id = f"directions-{uuid.uuid4()}"
+    response = client.post("/api/lookup-tables/", json={"id": table_id, "name": "Directions", "entries": {"B": "BUY", "S": "SELL"}})
+    assert response.status_code == 200
+    return table_id
+
+def _create_config(client, table_id, currency_case="upper"):
+    mappings = [{"source_field": field, "target_field": field} for field in PASSED_THROUGH]
+    mappings.append({"source_field": "side", "target_field": "direction",
+                     "transformation": {"type": "lookup", "params": {"table": table_id}}})
+    mappings.append({"source_field": "baseCurrency", "target_field": "baseCurrency",
+                     "transformation": {"type": "case", "params": {"caseType": currency_case}}})
+    response = client.post("/api/mappings/", json={
+        "name": "Memo", "bank_id": "bank-a", "system_model_id": "fx-forward-v1", "source_fields": [], "mappings": mappings
+    })
+    assert response.status_code == 200
+    return response.json()
+
+def _transform(client, config_id, records):
+    response = client.post(f"/api/mappings/{config_id}/transform", json=records)
+    assert response.status_code == 200
+    return [result["output"] or result["error"] for result in response.json()["results"]]
+
+def test_repeated_records_are_served_from_the_memo(client, memo, table_id):
+    config = _create_config(client, table_id)
+    first = _transform(client, config["id"], [TRADE, dict(TRADE, side="S"), TRADE])
+    assert first[0]["direction"] == "BUY" and first[1]["direction"] == "SELL" and first[2] == first[0]
+
+    hits = memo.hits
+    assert _transform(client, config["id"], [TRADE, dict(TRADE, side="S")]) == first[:2]
+    assert memo.hits == hits + 2
+
+def test_config_update_invalidates_memoized_results(client, memo, table_id):
+    config = _create_config(client, table_id)
+    assert _transform(client, config["id"], [TRADE])[0]["baseCurrency"] == "EUR"
+
+    lowered = _create_config(client, table_id, currency_case="lower")
+    update = dict(config, mappings=lowered["mappings"])
+    assert client.put(f"/api/mappings/{config['id']}", json=update).status_code == 200
+    assert _transform(client, config["id"], [TRADE])[0]["baseCurrency"] == "eur"
+
+def test_lookup_table_update_invalidates_memoized_results(client, memo, table_id):
+    config = _create_config(client, table_id)
+    assert _transform(client, config["id"], [TRADE])[0]["direction"] == "BUY"
+
+    table = client.get(f"/api/lookup-tables/{table_id}").json()
+    response = client.put(f"/api/lookup-tables/{table_id}", json=dict(table, entries={"B": "SELL", "S": "BUY"}))
+    assert response.status_code == 200
+    assert _transform(client, config["id"], [TRADE])[0]["direction"] == "SELL"
+
+def test_lookup_entry_change_invalidates_memoized_results(client, memo, table_id):
+    config = _create_config(client, table_id)
+    assert _transform(client, config["id"], [TRADE])[0]["direction"] == "BUY"
+
+    response = client.patch(f"/api/lookup-tables/{table_id}/entries", json={"remove": ["B"]})
+    assert response.status_code == 200
+    # Without an entry the step fails and the source value is kept, which is not an allowed direction
+    assert "direction value 'B' is not one of the allowed values" in _transform(client, config["id"], [TRADE])[0]
+
+def _transform_abandoning(searches):
+    """The engine, as if it abandoned some regex searches on timeout"""
+    def transform(compiled, records, start_index):
+        regex_service._abandoned.count = regex_service.abandoned_searches() + searches
+        # Stops elsewhere, or a reset of the metrics, do not concern this batch
+        regex_service.regex_budget_exceeded.reset()
+        return _run_engine(compiled, records, start_index)
+    return transform
+
+@pytest.mark.parametrize("searches, kept", [(0, True), (1, False)])
+def test_results_of_abandoned_regex_searches_are_not_kept(memo, make_config, fx_model, searches, kept):
+    compiled = compile_mapping(make_config([{"source_field": "ccy", "target_field": "baseCurrency"}]), fx_model)
+    memo.transform_records(compiled, [{"ccy": "EUR"}], 0, _transform_abandoning(searches))
+    hits = memo.hits
+    memo.transform_records(compiled, [{"ccy": "EUR"}], 0, _run_engine)
+    assert memo.hits == hits + kept
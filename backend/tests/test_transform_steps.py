@@ -0,0 +1,78 @@
+# backend/tests/test_transform_steps.py
+from datetime import datetime
+import pytest
+from app.services.transform_service import apply_transformation, compile_mapping
+import baseline_transform
+
+RULES = [
+    {"type": "direct"},
+    {"type": "left", "params": {"count": 3}},
+    {"type": "left", "params": {"count": "x"}},
+    {"type": "right", "params": {"count": 2}},
+    {"type": "right", "params": {"count": 0}},
+    {"type": "substring", "params": {"startPosition": 1, "length": 3}},
+    {"type": "replace", "params": {"find": "a", "replace": "Z", "replaceAll": True}},
+    {"type": "replace", "params": {"find": "a", "replace": "Z"}},
+    {"type": "case", "params": {"caseType": "upper"}},
+    {"type": "case", "params": {"caseType": "Title"}},
+    {"type": "case", "params": {"caseType": "none"}},
+    {"type": "regex", "params": {"pattern": r"(\d+)-(\w+)", "group": 2}},
+    {"type": "regex", "params": {"pattern": r"(?P<n>\d+)", "group": "n"}},
+    {"type": "regex", "params": {"pattern": "(", "group": 0}},
+    {"type": "split", "params": {"delimiter": "/", "index": 1}},
+    {"type": "split", "params": {"delimiter": "/", "index": -1}},
+    {"type": "split", "params": {"delimiter": "/", "index": "1"}},
+    {"type": "split", "params": {"delimiter": "", "index": 0}},
+    {"type": "concat", "params": {"fields": ["a", "b"], "separator": "|"}},
+    {"type": "format_date", "params": {"source_format": "MM/DD/YYYY", "target_format": "YYYY-MM-DD"}},
+    {"type": "format_date", "params": {"source_format": "DD-MM-YY"}},
+    {"type": "numeric_format", "params": {"decimalPlaces": 2}},
+    {"type": "numeric_format", "params": {}},
+    {"type": "boolean_convert", "params": {}},
+    {"type": "boolean_convert", "params": {"trueValues": ["S"], "falseValues": ["N"]}},
+    {"type": "enum_map", "params": {"mapping": {"B": "BUY", "S": "SELL"}}},
+    {"type": "unknown", "params": {}},
+]
+
+VALUES = [
+    "abc/def/ghi", "12-xyz", "03/15/2024", "15-03-24", "B", "S", "yes", "N", "1.2345", "12", "aaa",
+    3.14159, 7, True, None, datetime(2024, 1, 2), "", "0", "1e3", "nan"
+]
+
+def _rule_id(rule):
+    return f"{rule['type']}-{rule.get('params')}"
+
+def _same(value, expected):
+    # Unlike ==, repr finds NaN equal to itself and tells 1 from 1.0 or True
+    return repr(value) == repr(expected)
+
+@pytest.mark.parametrize("rule", RULES, ids=_rule_id)
+def test_apply_transformation_matches_baseline(rule):
+    for value in VALUES:
+        source_data = {"a": "A", "b": "", "x": value}
+        expected = baseline_transform.apply_transformation(value, rule, source_data)
+        assert _same(apply_transformation(value, rule, source_data), expected), value
+
+@pytest.mark.parametrize("rule", RULES, ids=_rule_id)
+def test_compiled_step_matches_baseline(rule, make_config, fx_model):
+    compiled = compile_mapping(make_config([{"source_field": "x", "target_field": "t", "transformation": rule}]), fx_model)
+    for value in VALUES:
+        source_data = {"a": "A", "b": "", "x": value}
+        expected = baseline_transform.apply_transformation(value, rule, source_data)
+        assert _same(compiled.map_fields(source_data), {"t": expected}), value
+
+def test_pipeline_applies_steps_in_order(make_config, fx_model):
+    rules = [
+        {"type": "split", "params": {"delimiter": "/", "index": 1}},
+        {"type": "case", "params": {"caseType": "upper"}},
+        {"type": "left", "params": {"count": 2}},
+    ]
+    compiled = compile_mapping(make_config([{"source_field": "x", "target_field": "t", "transformations": rules}]), fx_model)
+    assert compiled.map_fields({"x": "abc/def/ghi"}) == {"t": "DE"}
+
+def test_missing_source_fields_are_skipped(make_config, fx_model):
+    compiled = compile_mapping(make_config([
+        {"source_field": "x", "target_field": "t"},
+        {"source_field": "y", "target_field": "u"},
+    ]), fx_model)
+    assert compiled.map_fields({"x": 1}) == {"t": 1}
@@ -0,0 +1,86 @@
+# backend/tests/test_validation.py
+from datetime import datetime
+import pytest
+from app.services.validation_service import SystemModelValidator, validate_field_value, raise_for_errors
+
+VALID_TRADE = {
+    "tradeId": "T1",
+    "baseCurrency": "EUR",
+    "quoteCurrency": "USD",
+    "amount": 1000000.0,
+    "rate": 1.0842,
+    "valueDate": "15-03-2024",
+    "direction": "BUY",
+    "currencyPair": "EUR/USD",
+}
+
+def _codes(issues):
+    return [(issue.field, issue.code) for issue in issues]
+
+def test_valid_trade_has_no_issues(fx_model):
+    assert SystemModelValidator(fx_model).check(VALID_TRADE) == []
+
+def test_missing_required_fields(fx_model):
+    trade = dict(VALID_TRADE)
+    del trade["tradeId"], trade["rate"]
+    assert _codes(SystemModelValidator(fx_model).check(trade)) == [
+        ("tradeId", "missing_required"), ("rate", "missing_required")
+    ]
+
+@pytest.mark.parametrize("field, value, code", [
+    ("direction", "HOLD", "not_allowed"),
+    ("direction", ["BUY"], "not_allowed"),
+    ("baseCurrency", "EU", "too_short"),
+    ("baseCurrency", "EURO", "too_long"),
+    ("amount", 0.5, "below_minimum"),
+    ("currencyPair", "EURUSD!", "pattern_mismatch"),
+    ("currencyPair", "eur/usd", "pattern_mismatch"),
+])
+def test_constraint_errors(fx_model, field, value, code):
+    issues = SystemModelValidator(fx_model).check(dict(VALID_TRADE, **{field: value}))
+    assert _codes(issues) == [(field, code)]
+    with pytest.raises(ValueError):
+        raise_for_errors(issues)
+
+def test_every_error_is_reported(fx_model):
+    trade = dict(VALID_TRADE, baseCurrency="EURO", direction="HOLD", amount=0)
+    message = "; ".join(issue.message for issue in SystemModelValidator(fx_model).check(trade))
+    assert "baseCurrency is longer than 3 characters" in message
+    assert "direction value 'HOLD' is not one of the allowed values" in message
+    assert "amount is below the minimum of 1" in message
+
+def test_fields_outside_the_model_are_ignored(fx_model):
+    assert SystemModelValidator(fx_model).check(dict(VALID_TRADE, extra=object())) == []
+
+@pytest.mark.parametrize("data_type, value, code, severity", [
+    ("string", 12, "coerced", "info"),
+    ("integer", "12", "coerced", "info"),
+    ("integer", "twelve", "invalid_type", "warning"),
+    ("decimal", "1.5", "coerced", "info"),
+    ("decimal", [1], "invalid_type", "warning"),
+    ("boolean", "yes", "coerced", "info"),
+    ("date", 20240315, "invalid_type", "warning"),
+])
+def test_type_checks_never_fail_a_record(data_type, value, code, severity):
+    issues = validate_field_value("f", value, data_type)
+    assert [(issue.code, issue.severity) for issue in issues] == [(code, severity)]
+    raise_for_errors(issues)
+
+@pytest.mark.parametrize("data_type, value", [
+    ("string", None), ("string", "x"), ("integer", 3), ("integer", True), ("decimal", 3),
+    ("decimal", 2.5), ("boolean", False), ("date", "2024-03-15"), ("date", datetime(2024, 3, 15)),
+])
+def test_values_of_the_declared_type_pass(data_type, value):
+    assert validate_field_value("f", value, data_type) == []
+
+def test_range_constraints():
+    constraints = {"min_value": "1", "max_value": 10}
+    assert validate_field_value("f", 10, "decimal", constraints) == []
+    assert [issue.code for issue in validate_field_value("f", 10.5, "decimal", constraints)] == ["above_maximum"]
+    # Strings in range are converted, and NaN is never out of range
+    assert validate_field_value("f", "5", "string", constraints) == []
+    assert validate_field_value("f", float("nan"), "decimal", constraints) == []
+
+def test_malformed_constraints_are_ignored():
+    constraints = {"min_length": "", "max_value": "lots", "format": "("}
+    assert validate_field_value("f", "anything", "string", constraints) == []
@@ -114,7 +114,8 @@ const AdminPage = () => {
       name: selectedModel.name,
       description: selectedModel.description || '',
       version: selectedModel.version,
-      fields: [...selectedModel.fields]
+      fields: [...selectedModel.fields],
+      revision: selectedModel.revision
     });
     setShowModelModal(true);
   };
@@ -136,7 +136,8 @@ const MappingPage = () => {
       bank_id: selectedMapping.bank_id,
       system_model_id: selectedMapping.system_model_id,
       source_fields: [...selectedMapping.source_fields],
-      mappings: [...selectedMapping.mappings]
+      mappings: [...selectedMapping.mappings],
+      revision: selectedMapping.revision
     });
     setShowMappingModal(true);
   };